@@ -0,0 +1,90 @@
+"""
+Asset Store - Content-addressed storage for generated brand assets
+Assets are identified by the SHA-256 of their bytes plus a file extension,
+so identical renders share one entry. URLs can be cached forever only when
+the store writes through to disk; memory-only assets are lost on eviction
+and restart, and are not shared between workers
+"""
+import hashlib
+import logging
+import os
+import re
+from typing import Dict, Optional, Tuple
+
+from config import settings
+from logo_cache import LogoCache
+
+logger = logging.getLogger(__name__)
+
+MEDIA_TYPES = {
+    "png": "image/png",
+    "webp": "image/webp",
+    "svg": "image/svg+xml",
+}
+
+ASSET_ID_PATTERN = re.compile(r"^[0-9a-f]{64}\.[a-z0-9]+$")
+
+
+class AssetStore:
+    """Bounded in-memory asset store with optional write-through to disk"""
+
+    def __init__(self, max_bytes: int, directory: Optional[str] = None):
+        self.directory = directory
+        self._memory = LogoCache(max_bytes=max_bytes)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    @property
+    def persistent(self) -> bool:
+        """Whether assets survive eviction and restarts (written through to disk)"""
+        return bool(self.directory)
+
+    def put(self, data: bytes, extension: str = "png") -> str:
+        """Store asset bytes and return their content-addressed id (``<sha256>.<ext>``)"""
+        asset_id = f"{hashlib.sha256(data).hexdigest()}.{extension}"
+        if asset_id not in self._memory:
+            self._memory.put(asset_id, data)
+            if self.directory:
+                path = os.path.join(self.directory, asset_id)
+                if not os.path.exists(path):
+                    # Write to a temp name first so readers never see a partial file
+                    tmp_path = f"{path}.{os.getpid()}.tmp"
+                    with open(tmp_path, "wb") as f:
+                        f.write(data)
+                    os.replace(tmp_path, path)
+        return asset_id
+
+    def get(self, asset_id: str) -> Optional[Tuple[bytes, str]]:
+        """Return (bytes, media type) for an asset id, or None if unknown"""
+        if not ASSET_ID_PATTERN.match(asset_id):
+            return None
+        media_type = MEDIA_TYPES.get(asset_id.rsplit(".", 1)[1])
+        if media_type is None:
+            return None
+
+        data = self._memory.get(asset_id)
+        if data is None and self.directory:
+            path = os.path.join(self.directory, asset_id)
+            if os.path.exists(path):
+                with open(path, "rb") as f:
+                    data = f.read()
+                self._memory.put(asset_id, data)
+        if data is None:
+            return None
+        return data, media_type
+
+    @staticmethod
+    def etag(asset_id: str) -> str:
+        """Strong ETag for an asset (its content hash)"""
+        return f'"{asset_id.split(".", 1)[0]}"'
+
+    def stats(self) -> Dict:
+        """Memory usage and hit counters"""
+        return self._memory.stats()
+
+
+# Global asset store instance
+asset_store = AssetStore(
+    max_bytes=settings.asset_store_max_bytes,
+    directory=settings.asset_store_dir or None,
+)
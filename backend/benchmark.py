@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Rendering Microbenchmarks
+Times the logo renderer's building blocks in-process, without the API.
+
+    python benchmark.py geometry [--iterations 2000]
+    python benchmark.py stress [--threads 8] [--rounds 3]
+    python benchmark.py quality [--size 1000]
+    python benchmark.py export [--size 8192] [--quality print] [--workers 4] [--band-mb 16]
+"""
+import argparse
+import hashlib
+import itertools
+import math
+import os
+import resource
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Tuple
+
+import geometry
+from drawing_surface import RasterSurface, RecordingSurface
+from logo_cache import LogoCache
+from professional_logo_generator import ProfessionalLogoGenerator, RenderOptions
+from render_quality import MAX_EXPORT_RENDER_SIDE, QUALITY_TIERS, quality_tier
+from tiled_export import BandStats, stream_png
+
+Shape = Tuple[Callable[[], list], Callable[[], list], Callable[[RasterSurface, list], None]]
+
+
+# Reference implementations: the per-render trig loops the generator used before geometry.py
+
+def _legacy_waves() -> list:
+    layers = []
+    for frequency, amplitude, offset in ((0.05, 60, 0), (0.08, 40, 30), (0.03, 80, -20)):
+        points = []
+        for i in range(-180, 181, 5):
+            points.append((500 + i * 1.2, 500 + math.sin(i * frequency) * amplitude + offset))
+        layers.append(points)
+    return layers
+
+
+def _legacy_spiral() -> list:
+    angle, radius, points = 0, 5, []
+    while radius < 180:
+        points.append((500 + radius * math.cos(math.radians(angle)), 500 + radius * math.sin(math.radians(angle))))
+        angle += 12
+        radius *= 1.05
+    return [points]
+
+
+def _legacy_hexagons() -> list:
+    shapes = []
+    for radius in (150, 120):
+        points = []
+        for i in range(6):
+            angle = math.radians(i * 60)
+            points.append((500 + radius * math.cos(angle), 500 + radius * math.sin(angle)))
+        shapes.append(points)
+    return shapes
+
+
+def _legacy_badge_stars() -> list:
+    stars = []
+    for angle in range(0, 360, 45):
+        cx = 500 + 230 * math.cos(math.radians(angle))
+        cy = 500 + 230 * math.sin(math.radians(angle))
+        points = []
+        for i in range(10):
+            a = (i * 36) * math.pi / 180
+            radius = 12 if i % 2 == 0 else 12 * 0.4
+            points.append((cx + radius * math.cos(a), cy + radius * math.sin(a)))
+        stars.append(points)
+    return stars
+
+
+def _geometry_waves() -> list:
+    return [
+        geometry.at(geometry.sine_wave(-180, 181, 5, 1.2, frequency, amplitude, offset), 500, 500)
+        for frequency, amplitude, offset in ((0.05, 60, 0), (0.08, 40, 30), (0.03, 80, -20))
+    ]
+
+
+def _geometry_spiral() -> list:
+    return [geometry.at(geometry.spiral(5, 180, 1.05, 12), 500, 500)]
+
+
+def _geometry_hexagons() -> list:
+    return [geometry.at(geometry.regular_polygon(6, radius), 500, 500) for radius in (150, 120)]
+
+
+def _geometry_badge_stars() -> list:
+    return [
+        geometry.at(geometry.star(5, 12, 12 * 0.4), cx, cy)
+        for cx, cy in geometry.at(geometry.regular_polygon(8, 230), 500, 500)
+    ]
+
+
+def _segments(surface: RasterSurface, shapes: list):
+    for points in shapes:
+        for i in range(len(points) - 1):
+            surface.line([points[i], points[i + 1]], fill=(37, 99, 235, 255), width=4)
+
+
+def _polylines(surface: RasterSurface, shapes: list):
+    for points in shapes:
+        surface.line(points, fill=(37, 99, 235, 255), width=4)
+
+
+def _polygons(surface: RasterSurface, shapes: list):
+    for points in shapes:
+        surface.polygon(points, fill=(37, 99, 235, 255))
+
+
+GEOMETRY_SHAPES: Dict[str, Tuple[Shape, Shape]] = {
+    "waves": ((_legacy_waves, _segments), (_geometry_waves, _polylines)),
+    "spiral": ((_legacy_spiral, _segments), (_geometry_spiral, _polylines)),
+    "hexagons": ((_legacy_hexagons, _polygons), (_geometry_hexagons, _polygons)),
+    "badge stars": ((_legacy_badge_stars, _polygons), (_geometry_badge_stars, _polygons)),
+}
+
+
+def _per_call_us(func: Callable[[], object], iterations: int) -> float:
+    func()  # warm caches
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def benchmark_geometry(iterations: int) -> List[Dict]:
+    """Per-shape cost of point generation and drawing, legacy loops vs geometry kernels"""
+    surface = RasterSurface(1000)
+    results = []
+    for name, ((legacy_points, legacy_draw), (new_points, new_draw)) in GEOMETRY_SHAPES.items():
+        legacy_shapes, new_shapes = legacy_points(), new_points()
+        row = {
+            "shape": name,
+            "legacy_points_us": _per_call_us(legacy_points, iterations),
+            "points_us": _per_call_us(new_points, iterations),
+            "legacy_draw_us": _per_call_us(lambda: legacy_draw(surface, legacy_shapes), max(1, iterations // 10)),
+            "draw_us": _per_call_us(lambda: new_draw(surface, new_shapes), max(1, iterations // 10)),
+        }
+        results.append(row)
+        print(
+            f"{name:<12} points {row['legacy_points_us']:8.1f}us -> {row['points_us']:8.1f}us   "
+            f"draw {row['legacy_draw_us']:8.1f}us -> {row['draw_us']:8.1f}us"
+        )
+    return results
+
+
+# Render matrix for the concurrency stress run: every category, both output formats and all variants
+STRESS_COMPANIES = (
+    ("Nimbus Labs", "Software", ["#2563EB", "#0F172A", "#38BDF8"]),
+    ("Harbor Health", "Healthcare clinic", ["#059669", "#064E3B", "#A7F3D0"]),
+    ("Ledgerly", "Fintech payments", ["#7C3AED", "#1E1B4B", "#F59E0B"]),
+    ("Oak & Ember", "Retail", ["#B45309", "#1C1917", "#FDE68A"]),
+)
+STRESS_OPTIONS = (
+    RenderOptions(size=512),
+    RenderOptions(size=512, variant="dark"),
+    RenderOptions(size=512, variant="inverted"),
+    RenderOptions(size=512, output_format="svg"),
+)
+# Below this warm-cache speedup over sequential rendering, threads are not paying for themselves
+MIN_THREAD_SPEEDUP = 1.2
+
+
+def _stress_jobs(generator: ProfessionalLogoGenerator) -> List[tuple]:
+    return [
+        (company, industry, colors, category, variation, "stress", options)
+        for (company, industry, colors), category, variation, options in itertools.product(
+            STRESS_COMPANIES, generator.logo_categories, range(2), STRESS_OPTIONS
+        )
+    ]
+
+
+def _digest(generator: ProfessionalLogoGenerator, job: tuple) -> str:
+    return hashlib.sha256(generator.render_logo(*job).data).hexdigest()
+
+
+def benchmark_stress(threads: int, rounds: int) -> Dict:
+    """
+    Render a fixed matrix sequentially, then again from a thread pool, and check
+    every parallel render is byte-identical to its sequential reference. Each
+    round uses a fresh generator, so threads race to build the same role layers
+    and atlas entries, then renders again on the warmed caches.
+    """
+    reference_generator = ProfessionalLogoGenerator(cache=LogoCache(max_bytes=0))
+    jobs = _stress_jobs(reference_generator)
+    start = time.perf_counter()
+    reference = [_digest(reference_generator, job) for job in jobs]
+    sequential_s = time.perf_counter() - start
+    print(f"sequential   {len(jobs)} renders in {sequential_s:6.2f}s")
+
+    result = {
+        "renders": len(jobs), "cpus": os.cpu_count(), "sequential_s": sequential_s, "mismatches": 0, "rounds": [],
+    }
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        for round_index in range(rounds):
+            generator = ProfessionalLogoGenerator(cache=LogoCache(max_bytes=0))
+            for phase in ("cold", "warm"):
+                # Interleave the jobs so threads collide on the same logos
+                order = sorted(range(len(jobs)), key=lambda i: (i % threads, i))
+                start = time.perf_counter()
+                digests = list(executor.map(lambda i: (i, _digest(generator, jobs[i])), order))
+                elapsed = time.perf_counter() - start
+                speedup = sequential_s / elapsed
+                mismatches = [i for i, digest in digests if digest != reference[i]]
+                result["mismatches"] += len(mismatches)
+                result["rounds"].append({"round": round_index, "phase": phase, "seconds": elapsed,
+                                         "speedup": speedup, "mismatches": len(mismatches)})
+                print(
+                    f"round {round_index} {phase:<5} {len(jobs)} renders in {elapsed:6.2f}s "
+                    f"({speedup:4.2f}x)   mismatches {len(mismatches)}"
+                )
+                for i in mismatches[:5]:
+                    company, _, _, category, variation, _, options = jobs[i]
+                    print(f"  ❌ {company} {category} #{variation} {options.output_format} {options.variant}")
+    result["warm_speedup"] = max((r["speedup"] for r in result["rounds"] if r["phase"] == "warm"), default=0.0)
+    return result
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def benchmark_quality(size: int) -> List[Dict]:
+    """
+    Uncached render + encode latency of every category per quality tier, against
+    the tier's target. Each tier gets a fresh generator, so every request builds
+    its role layer (the first-request path); "recolor" is the same request again
+    with another palette, served from that layer.
+    """
+    results = []
+    for tier in QUALITY_TIERS.values():
+        generator = ProfessionalLogoGenerator(cache=LogoCache(max_bytes=0))
+        generator.warm_icon_atlas()
+        cold, recolor = [], []
+        for (company, industry, colors), category in itertools.product(STRESS_COMPANIES, generator.logo_categories):
+            options = RenderOptions(size=size, quality=tier.name)
+            for timings, palette in ((cold, colors), (recolor, colors[::-1])):
+                start = time.perf_counter()
+                generator.render_logo(company, industry, palette, category, 0, "quality", options)
+                timings.append((time.perf_counter() - start) * 1000)
+        row = {
+            "tier": tier.name,
+            "p50_ms": _percentile(cold, 0.5),
+            "p95_ms": _percentile(cold, 0.95),
+            "recolor_p95_ms": _percentile(recolor, 0.95),
+            "target_ms": tier.target_ms,
+        }
+        row["ok"] = row["p95_ms"] <= tier.target_ms
+        results.append(row)
+        print(
+            f"{tier.name:<9} {tier.output_size(size)}px x{tier.factor(tier.output_size(size))}   "
+            f"p50 {row['p50_ms']:7.1f}ms   p95 {row['p95_ms']:7.1f}ms   recolor p95 {row['recolor_p95_ms']:7.1f}ms   "
+            f"target {tier.target_ms:6.0f}ms {'✅' if row['ok'] else '❌'}"
+        )
+    return results
+
+
+def benchmark_export(size: int, quality: str, workers: int, band_bytes: int) -> Dict:
+    """Banded high-res export of one logo: time and memory per band, peak memory against a full canvas"""
+    generator = ProfessionalLogoGenerator(cache=LogoCache(max_bytes=0))
+    company, industry, colors = STRESS_COMPANIES[0]
+    recording = generator._draw_logo(
+        RecordingSurface, company, industry, generator._create_professional_palette(colors, industry),
+        "emblem", 0, "export",
+    )
+    factor = quality_tier(quality).factor(size, MAX_EXPORT_RENDER_SIDE)
+    bands: List[BandStats] = []
+    summaries = []
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    png_bytes = sum(
+        len(chunk) for chunk in stream_png(
+            recording, size, recording.content_viewport(), factor, workers, band_bytes,
+            on_band=bands.append, on_done=summaries.append,
+        )
+    )
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    summary = summaries[0]
+
+    for band in bands[:3] + bands[len(bands) // 2:len(bands) // 2 + 1] + bands[-1:]:
+        print(
+            f"band {band.index:4d} rows {band.top:5d}+{band.rows:<4d} canvas {band.canvas_bytes / 2**20:6.1f}MB   "
+            f"render {band.render_ms:7.1f}ms   deflate {band.encode_ms:6.1f}ms   {band.output_bytes / 1024:7.1f}KB"
+        )
+    full_canvas = (size * factor) ** 2 * 4
+    print(
+        f"{summary.bands} bands of {summary.rows_per_band} rows, {png_bytes / 2**20:.1f}MB PNG in "
+        f"{summary.total_ms / 1000:.2f}s   render p95 {_percentile([b.render_ms for b in bands], 0.95):.1f}ms/band"
+    )
+    print(
+        f"peak band canvases {summary.peak_canvas_bytes / 2**20:.1f}MB vs {full_canvas / 2**20:.0f}MB full canvas   "
+        f"max RSS grew {(rss_after - rss_before) / 1024:.0f}MB"
+    )
+    return summary._asdict()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    geometry_parser = subcommands.add_parser("geometry", help="legacy trig loops vs memoized geometry kernels")
+    geometry_parser.add_argument("--iterations", type=int, default=2000)
+    stress_parser = subcommands.add_parser("stress", help="parallel renders must match sequential output")
+    stress_parser.add_argument("--threads", type=int, default=8)
+    stress_parser.add_argument("--rounds", type=int, default=3)
+    quality_parser = subcommands.add_parser("quality", help="per-tier render latency against its target")
+    quality_parser.add_argument("--size", type=int, default=1000)
+    export_parser = subcommands.add_parser("export", help="banded high-res export time and memory")
+    export_parser.add_argument("--size", type=int, default=8192)
+    export_parser.add_argument("--quality", default="print", choices=list(QUALITY_TIERS))
+    export_parser.add_argument("--workers", type=int, default=4)
+    export_parser.add_argument("--band-mb", type=int, default=16)
+    args = parser.parse_args()
+
+    if args.command == "geometry":
+        print(f"📐 Geometry kernels ({args.iterations} iterations, 1000px canvas)")
+        benchmark_geometry(args.iterations)
+    elif args.command == "stress":
+        print(f"🧵 Concurrency stress ({args.threads} threads, {args.rounds} rounds)")
+        result = benchmark_stress(args.threads, args.rounds)
+        if result["mismatches"]:
+            raise SystemExit(f"❌ {result['mismatches']} parallel renders differed from the sequential reference")
+        print("✅ Parallel output identical to sequential output")
+        if result["warm_speedup"] < MIN_THREAD_SPEEDUP:
+            print(
+                f"⚠️ {args.threads} threads on {result['cpus']} CPUs were at best {result['warm_speedup']:.2f}x "
+                f"sequential: drawing holds the GIL, so keep RENDER_POOL_MODE=process"
+            )
+    elif args.command == "quality":
+        print(f"🎚️ Render quality tiers ({args.size}px requests, uncached)")
+        results = benchmark_quality(args.size)
+        missed = [row["tier"] for row in results if not row["ok"]]
+        if missed:
+            raise SystemExit(f"❌ Latency target missed by: {', '.join(missed)}")
+    elif args.command == "export":
+        print(f"🖨️ Banded export ({args.size}px, {args.quality}, {args.workers} workers, {args.band_mb}MB bands)")
+        benchmark_export(args.size, args.quality, args.workers, args.band_mb * 2**20)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Brand Prompts - Prompts for LLM stages that call the provider client directly
+Stages that stream or fuse their output talk to llm_client rather than
+LLMBrandingService, so their prompts are built here from the shared company
+profile dict, along with the parsing of the fused JSON response.
+"""
+import json
+import re
+from typing import Any, Dict, Sequence, Tuple
+
+from pydantic import ValidationError
+
+from schemas import ColorPalette, TaglineVariation, TypographyRecommendation
+
+# Bump whenever a prompt here changes; results are cached per prompt source, so fused and
+# streamed results are never served to split mode (or the other way round)
+PROMPT_VERSION = "1"
+FUSED_SOURCE = f"fused:{PROMPT_VERSION}"
+GUIDELINES_SOURCE = f"stream:{PROMPT_VERSION}"
+
+# Sections the fused prompt can cover, in the raw shapes LLMBrandingService returns
+FUSED_SECTIONS = ("taglines", "color_palette", "typography")
+
+PALETTE_ROLES = ("primary", "secondary", "accent", "neutral")
+
+HEX_COLOR = re.compile(r"^#[0-9A-Fa-f]{6}$")
+
+BRAND_STRATEGIST = (
+    "You are a senior brand strategist who writes clear, practical brand identity documentation "
+    "for technology companies."
+)
+
+
+def company_brief(company_data: Dict) -> str:
+    """Company profile as a short labelled block for prompts"""
+    company_type = company_data.get("company_type", "")
+    lines = [
+        f"Company: {company_data.get('name', '')}",
+        f"Type: {getattr(company_type, 'value', company_type)}",
+        f"Industry: {company_data.get('industry', '')}",
+        f"Description: {company_data.get('description', '')}",
+        f"Target audience: {company_data.get('target_audience', '')}",
+        f"Brand values: {', '.join(company_data.get('brand_values') or [])}",
+        f"Tone: {company_data.get('tone') or 'professional'}",
+    ]
+    if company_data.get("additional_context"):
+        lines.append(f"Additional context: {company_data['additional_context']}")
+    return "\n".join(lines)
+
+
+def brand_guidelines_prompt(company_data: Dict) -> Tuple[str, str]:
+    """(system, prompt) for the brand guidelines document"""
+    prompt = (
+        f"{company_brief(company_data)}\n\n"
+        "Write the brand guidelines document for this company in Markdown with these sections:\n"
+        "1. Brand Overview - mission, positioning and personality\n"
+        "2. Logo Usage - clear space, minimum sizes and misuse to avoid\n"
+        "3. Color Usage - how the palette is applied across product and marketing\n"
+        "4. Typography - heading and body hierarchy\n"
+        "5. Voice and Tone - how the brand writes, with do and don't examples\n"
+        "6. Imagery - photography and illustration style\n"
+        "Keep it concise and specific to this company."
+    )
+    return BRAND_STRATEGIST, prompt
+
+
+def _fused_section_shape(section: str, num_taglines: int) -> str:
+    if section == "taglines":
+        return (
+            f'"taglines": [{num_taglines} objects like '
+            '{"text": "...", "tone": "professional|playful|bold|inspiring", "explanation": "..."}]'
+        )
+    if section == "color_palette":
+        roles = ", ".join(f'"{role}": {{"hex": "#RRGGBB", "psychology": "..."}}' for role in PALETTE_ROLES)
+        return f'"color_palette": {{{roles}, "usage_guidelines": "..."}}'
+    return (
+        '"typography": {"heading_font": "...", "body_font": "...", "accent_font": "...", '
+        '"heading_rationale": "...", "pairings": [{"heading": "...", "body": "...", "use": "..."}]}'
+    )
+
+
+def fused_sections_prompt(company_data: Dict, sections: Sequence[str], num_taglines: int) -> Tuple[str, str]:
+    """(system, prompt) asking for several sections as one strict JSON document"""
+    shapes = ",\n  ".join(_fused_section_shape(section, num_taglines) for section in sections)
+    prompt = (
+        f"{company_brief(company_data)}\n\n"
+        "Create the following brand identity sections for this company. Respond with exactly one "
+        "JSON object and nothing else, using these keys:\n"
+        f"{{\n  {shapes}\n}}\n"
+        "Colors must be 6-digit hex codes and fonts must be real, widely available typefaces."
+    )
+    return BRAND_STRATEGIST + " You always answer with valid JSON.", prompt
+
+
+def _valid_taglines(data: Any, num_taglines: int) -> list:
+    taglines = [item for item in data if isinstance(item, dict) and item.get("text")][:num_taglines]
+    if len(taglines) < num_taglines:
+        raise ValueError(f"{len(taglines)} of {num_taglines} taglines")
+    for idx, tagline in enumerate(taglines, 1):
+        TaglineVariation(
+            id=f"tagline_{idx}", text=tagline["text"], tone=tagline.get("tone", "professional"),
+            explanation=tagline.get("explanation", ""),
+        )
+    return taglines
+
+
+def _valid_color_palette(data: Any) -> dict:
+    for role in PALETTE_ROLES:
+        if not HEX_COLOR.match(str((data.get(role) or {}).get("hex", ""))):
+            raise ValueError(f"no hex color for {role}")
+    ColorPalette(
+        **{role: data[role]["hex"] for role in PALETTE_ROLES},
+        psychology={role: data[role].get("psychology", "") for role in PALETTE_ROLES},
+        usage_guidelines=data.get("usage_guidelines", ""),
+    )
+    return data
+
+
+def _valid_typography(data: Any) -> dict:
+    TypographyRecommendation(
+        heading_font=data["heading_font"], body_font=data["body_font"], accent_font=data.get("accent_font"),
+        rationale=data.get("heading_rationale", ""), pairings=data.get("pairings", []),
+    )
+    return data
+
+
+def parse_fused_sections(text: str, sections: Sequence[str], num_taglines: int) -> Dict[str, Any]:
+    """
+    Sections of a fused response that validate against the response schemas, by name.
+    Missing or invalid sections are left out so only they need generating again
+    """
+    # Tolerate code fences or prose around the object
+    start, end = text.find("{"), text.rfind("}")
+    try:
+        document = json.loads(text[start:end + 1]) if start != -1 else None
+    except ValueError:
+        document = None
+    if not isinstance(document, dict):
+        return {}
+
+    valid = {}
+    for section in sections:
+        data = document.get(section)
+        try:
+            if section == "taglines":
+                valid[section] = _valid_taglines(data, num_taglines)
+            elif section == "color_palette":
+                valid[section] = _valid_color_palette(data)
+            else:
+                valid[section] = _valid_typography(data)
+        except (TypeError, AttributeError, KeyError, ValueError, ValidationError):
+            continue
+    return valid
@@ -5,6 +5,8 @@ from typing import List
 import os
 from dotenv import load_dotenv
 
+from image_encoder import ENCODER_PROFILES
+
 # Load .env file
 load_dotenv()
 
@@ -32,10 +34,51 @@ class Settings:
         self.llm_model = os.getenv("LLM_MODEL", "mistral")
         self.llm_max_tokens = int(os.getenv("LLM_MAX_TOKENS", "1024"))
         self.llm_temperature = float(os.getenv("LLM_TEMPERATURE", "0.7"))
+        self.llm_cache_max_bytes = int(os.getenv("LLM_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))  # stored in DATABASE_URL (SQLite only); 0 disables
+        self.llm_cache_ttl_seconds = float(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))  # 0 disables expiry
+        self.llm_connect_timeout = float(os.getenv("LLM_CONNECT_TIMEOUT", "5"))
+        self.llm_read_timeout = float(os.getenv("LLM_READ_TIMEOUT", "120"))  # per read; long generations stream slowly
+        self.llm_max_connections = int(os.getenv("LLM_MAX_CONNECTIONS", "16"))  # pooled keep-alive connections per provider
+        self.llm_max_in_flight = int(os.getenv("LLM_MAX_IN_FLIGHT", "4"))  # concurrent requests per provider; others queue
+        self.llm_batch_window_ms = float(os.getenv("LLM_BATCH_WINDOW_MS", "0"))  # hold fused calls this long to send them together; 0 (default) sends each at once
+        self.llm_batch_max_size = int(os.getenv("LLM_BATCH_MAX_SIZE", "4"))  # send early at this many calls; capped at LLM_MAX_IN_FLIGHT
         
         # Ollama Configuration (for local LLM)
         self.ollama_base_url = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
 
+        # Logo rendering (RENDER_POOL_SIZE=0 renders in-process)
+        self.render_pool_size = int(os.getenv("RENDER_POOL_SIZE", str(min(4, os.cpu_count() or 1))))
+        self.render_pool_mode = os.getenv("RENDER_POOL_MODE", "process")  # process, thread (no faster than sequential, see benchmark.py stress)
+        self.render_queue_depth = int(os.getenv("RENDER_QUEUE_DEPTH", "64"))
+        self.render_job_timeout = float(os.getenv("RENDER_JOB_TIMEOUT", "30"))
+        self.image_encoder_profile = os.getenv("IMAGE_ENCODER_PROFILE", "fast")  # fast, balanced, small, webp
+        if self.image_encoder_profile not in ENCODER_PROFILES:
+            raise ValueError(
+                f"IMAGE_ENCODER_PROFILE must be one of {', '.join(ENCODER_PROFILES)}, "
+                f"got '{self.image_encoder_profile}'"
+            )
+        self.logo_cache_max_bytes = int(os.getenv("LOGO_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+        self.logo_cache_ttl_seconds = float(os.getenv("LOGO_CACHE_TTL_SECONDS", "0"))  # 0 disables expiry
+        self.logo_cache_stripes = int(os.getenv("LOGO_CACHE_STRIPES", "8"))  # independently locked shards
+        self.logo_cache_max_entry_bytes = int(os.getenv("LOGO_CACHE_MAX_ENTRY_BYTES", str(8 * 1024 * 1024)))  # largest cached value; fewer stripes if a share is smaller
+        self.icon_atlas_max_entries = int(os.getenv("ICON_ATLAS_MAX_ENTRIES", "512"))
+        self.role_layer_cache_max_bytes = int(os.getenv("ROLE_LAYER_CACHE_MAX_BYTES", str(48 * 1024 * 1024)))  # per process; 0 disables recoloring
+        self.logo_templates_path = os.getenv("LOGO_TEMPLATES_PATH", "")  # JSON template file; empty uses the bundled logo_templates.json
+        self.export_max_size = int(os.getenv("EXPORT_MAX_SIZE", "8192"))  # largest high-res export side in pixels
+        self.export_workers = int(os.getenv("EXPORT_WORKERS", str(min(4, os.cpu_count() or 1))))  # band render threads per export
+        self.export_band_bytes = int(os.getenv("EXPORT_BAND_BYTES", str(16 * 1024 * 1024)))  # supersampled canvas budget per band
+        self.export_max_concurrent = int(os.getenv("EXPORT_MAX_CONCURRENT", "2"))  # exports streaming at once per process; more get 503
+
+        # Generated asset storage (ASSET_STORE_DIR empty keeps assets in memory only, so asset URLs
+        # expire on eviction or restart and are not shared between workers; point it at a shared disk)
+        self.asset_store_max_bytes = int(os.getenv("ASSET_STORE_MAX_BYTES", str(128 * 1024 * 1024)))
+        self.asset_store_dir = os.getenv("ASSET_STORE_DIR", "")
+
+        # Font search paths (os.pathsep separated); empty uses the system font dirs. The bundled
+        # fonts/ dir is always searched last as a fallback
+        font_paths_env = os.getenv("FONT_SEARCH_PATHS", "")
+        self.font_search_paths = [path for path in font_paths_env.split(os.pathsep) if path]
+
         # Security
         self.secret_key = os.getenv("SECRET_KEY", "dev-secret-key-change-in-production")
         self.algorithm = os.getenv("ALGORITHM", "HS256")
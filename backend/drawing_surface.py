@@ -0,0 +1,544 @@
+"""
+Drawing Surface - Resolution-independent drawing for logo helpers
+Logo helpers draw in a fixed design space (DESIGN_SIZE units per side)
+through a surface; the raster surface maps that space onto a Pillow canvas,
+the SVG surface emits the same primitives as vector markup and the recording
+surface keeps them as a display list that can be replayed at any size.
+Effects (shadows, gradients, translucency) go through composite(), which
+blends a recorded shape's coverage instead of replacing pixels.
+"""
+import math
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+from xml.sax.saxutils import escape
+
+from PIL import Image, ImageDraw
+
+import compositing
+from compositing import BLUR_EXTENT, Fill, LinearGradient, RadialGradient
+from font_registry import font_registry
+from image_encoder import FORMAT_INFO, VECTOR_PROFILE, EncodedImage, encode_image
+
+# Logical canvas size every drawing helper works in
+DESIGN_SIZE = 1000
+
+# Design units added around each recorded call when culling it against a clip box
+CLIP_MARGIN = 4
+
+# Font stack used for SVG text (the registry face may not exist on the viewer's machine)
+SVG_FONT_FAMILY = "Arial, 'DejaVu Sans', Helvetica, sans-serif"
+
+
+class Viewport(NamedTuple):
+    """Square region of the design space mapped onto the whole output canvas"""
+    x: float = 0
+    y: float = 0
+    side: float = DESIGN_SIZE
+
+
+class DrawingSurface(ABC):
+    """
+    Interface the logo helpers draw through, in design-space coordinates.
+    Mirrors the subset of ImageDraw used by the generator.
+    """
+
+    def __init__(self, size: int, viewport: Viewport = Viewport()):
+        self.size = size
+        self.viewport = viewport
+        self.scale = size / viewport.side
+
+    @abstractmethod
+    def rectangle(self, xy, fill=None, outline=None, width=1):
+        ...
+
+    @abstractmethod
+    def ellipse(self, xy, fill=None, outline=None, width=1):
+        ...
+
+    @abstractmethod
+    def polygon(self, xy, fill=None, outline=None, width=1):
+        ...
+
+    @abstractmethod
+    def line(self, xy, fill=None, width=0):
+        ...
+
+    @abstractmethod
+    def text(self, xy, text, fill=None, font=None):
+        ...
+
+    @abstractmethod
+    def composite(
+        self, shape: "RecordingSurface", fill: Fill, opacity: float = 1.0, blur: float = 0,
+        offset: Tuple[float, float] = (0, 0)
+    ):
+        """
+        Blend everything drawn on shape over the canvas, painted with fill (a color
+        or gradient) at opacity, optionally blurred by blur and moved by offset.
+        The colors shape was drawn with are ignored; only its coverage is used.
+        """
+
+    @staticmethod
+    def _box(xy: Sequence) -> List[float]:
+        # Accepts [x0, y0, x1, y1] or [(x0, y0), (x1, y1)]
+        if len(xy) == 2:
+            (x0, y0), (x1, y1) = xy
+            return [x0, y0, x1, y1]
+        return list(xy)
+
+    @staticmethod
+    def _points(xy: Sequence) -> List[tuple]:
+        if xy and not isinstance(xy[0], (tuple, list)):
+            # Flat [x0, y0, x1, y1, ...] sequence
+            return list(zip(xy[0::2], xy[1::2]))
+        return [tuple(point) for point in xy]
+
+
+class EncodableSurface(DrawingSurface):
+    """Surface whose drawing is a finished image (raster or vector)"""
+
+    @abstractmethod
+    def encode(self, profile: str) -> EncodedImage:
+        """Finish drawing and return the encoded output"""
+
+
+class RasterCanvas(DrawingSurface):
+    """
+    Pillow-backed drawing that scales design-space coordinates to pixels.
+    The canvas may be a window of the size x size output whose top-left pixel is
+    origin; drawing is then pixel-identical to the same region of a full render.
+    """
+
+    # Output pixel at the canvas's top-left corner
+    origin: Tuple[int, int] = (0, 0)
+
+    def __init__(
+        self, size: int, viewport: Viewport = Viewport(), origin: Tuple[int, int] = (0, 0),
+        canvas: Optional[Tuple[int, int]] = None, text_masks: Optional[Dict] = None
+    ):
+        super().__init__(size, viewport)
+        self.origin = origin
+        # Rendered text per (font, text, position), shareable by the windows of one output
+        self.text_masks = {} if text_masks is None else text_masks
+        self.image = Image.new('RGBA', canvas or (size, size), (255, 255, 255, 0))
+        self._draw = ImageDraw.Draw(self.image)
+
+    def rectangle(self, xy, fill=None, outline=None, width=1):
+        self._draw.rectangle(self._scale_box(xy), fill=fill, outline=outline, width=self._width(width))
+
+    def ellipse(self, xy, fill=None, outline=None, width=1):
+        self._draw.ellipse(self._scale_box(xy), fill=fill, outline=outline, width=self._width(width))
+
+    def polygon(self, xy, fill=None, outline=None, width=1):
+        self._draw.polygon(self._scale_points(xy), fill=fill, outline=outline, width=self._width(width))
+
+    def line(self, xy, fill=None, width=0):
+        self._draw.line(self._scale_points(xy), fill=fill, width=self._width(width))
+
+    def text(self, xy, text, fill=None, font=None):
+        font = font_registry.scaled(font, self.scale) if font else None
+        # Full canvases take the mask path too, so every window rasterizes text identically
+        mask, (left, top) = self._text_mask(xy, text, font)
+        self._paste_mask(fill, (left - self.origin[0], top - self.origin[1]), mask)
+
+    def composite(self, shape, fill, opacity=1.0, blur=0, offset=(0, 0)):
+        coverage = self._coverage(shape, blur, offset)
+        if coverage is None:
+            return
+        mask, origin = coverage
+        if isinstance(fill, (LinearGradient, RadialGradient)):
+            # Gradients move with the shape, so a shadow keeps its fill
+            dx, dy = offset
+            fill = fill.transformed(lambda p: self._project((p[0] + dx, p[1] + dy)), self.scale)
+        for color, layer in compositing.fill_layers(mask, origin, fill, opacity):
+            self._paste_mask(color, origin, layer)
+
+    def _paste_mask(self, color, origin: Tuple[int, int], mask: Image.Image):
+        # Pasting an opaque color through a mask blends it over the canvas
+        self.image.paste(color, origin, mask)
+
+    def _text_mask(self, xy, text, font) -> Tuple[Image.Image, Tuple[int, int]]:
+        """
+        Coverage of a text run and its top-left pixel in the full output.
+        Pillow splits a position into int() and a signed fraction, so the same run
+        drawn at a negative and a positive position rasterizes differently; masks are
+        always drawn at non-negative coordinates, so every window of an output (and
+        the full canvas) pastes the same pixels.
+        """
+        s, (vx, vy) = self.scale, self.viewport[:2]
+        x, y = (xy[0] - vx) * s, (xy[1] - vy) * s
+        key = (font, text, x, y)
+        cached = self.text_masks.get(key)
+        if cached is None:
+            left, top, right, bottom = font.getbbox(text) if font else (0, 0, 0, 0)
+            box_x = math.floor(x) + min(left, 0) - 2
+            box_y = math.floor(y) + min(top, 0) - 2
+            mask = Image.new("L", (math.ceil(x) + max(right, 0) + 3 - box_x, math.ceil(y) + max(bottom, 0) + 3 - box_y))
+            ImageDraw.Draw(mask).text((x - box_x, y - box_y), text, fill=255, font=font)
+            cached = self.text_masks[key] = (mask, (box_x, box_y))
+        return cached
+
+    def _coverage(self, shape: "RecordingSurface", blur: float, offset) -> Optional[Tuple[Image.Image, tuple]]:
+        """Coverage mask of a recorded shape and its canvas position, clipped to the canvas"""
+        bounds = shape.bounds()
+        if bounds is None:
+            return None
+        pad = BLUR_EXTENT * blur
+        dx, dy = offset
+        x0, y0, x1, y1 = bounds
+        left, top = self._project((x0 - pad + dx, y0 - pad + dy))
+        right, bottom = self._project((x1 + pad + dx, y1 + pad + dy))
+        # Clip to the full output, as a single-piece render does, and to the canvas plus
+        # the blur's reach, so a windowed canvas blurs exactly like the full one
+        (ox, oy), (width, height) = self.origin, self.image.size
+        reach = math.ceil(pad * self.scale) + 2
+        left, top = max(-ox, -reach, math.floor(left) - 1), max(-oy, -reach, math.floor(top) - 1)
+        right = min(self.size - ox, width + reach, math.ceil(right) + 2)
+        bottom = min(self.size - oy, height + reach, math.ceil(bottom) + 2)
+        if right <= left or bottom <= top:
+            return None
+
+        # Rasterize only the shape's box, shifted by the offset
+        mask_surface = _MaskSurface(
+            self.size, Viewport(self.viewport.x - dx, self.viewport.y - dy, self.viewport.side),
+            (ox + left, oy + top), (right - left, bottom - top), self.text_masks,
+        )
+        shape.replay(mask_surface)
+        mask = compositing.blur(mask_surface.image, blur * self.scale)
+
+        visible = (max(0, left), max(0, top), min(width, right), min(height, bottom))
+        if visible[2] <= visible[0] or visible[3] <= visible[1]:
+            return None
+        if visible != (left, top, right, bottom):
+            mask = mask.crop((visible[0] - left, visible[1] - top, visible[2] - left, visible[3] - top))
+        return mask, visible[:2]
+
+    def _scale_box(self, xy: Sequence) -> List[float]:
+        x0, y0, x1, y1 = self._box(xy)
+        (x0, y0), (x1, y1) = self._scale_points([(x0, y0), (x1, y1)])
+        return [x0, y0, x1, y1]
+
+    def _scale_points(self, xy: Sequence) -> List[tuple]:
+        s, ox, oy = self.scale, self.viewport.x, self.viewport.y
+        if self.origin == (0, 0):
+            return [((x - ox) * s, (y - oy) * s) for x, y in self._points(xy)]
+        # Pillow truncates coordinates to whole pixels; doing that before the origin shift keeps
+        # a window pixel-identical to the full canvas
+        px, py = self.origin
+        return [(int((x - ox) * s) - px, int((y - oy) * s) - py) for x, y in self._points(xy)]
+
+    def _project(self, point) -> Tuple[float, float]:
+        """Exact (unsnapped) canvas position of a design-space point"""
+        return (
+            (point[0] - self.viewport.x) * self.scale - self.origin[0],
+            (point[1] - self.viewport.y) * self.scale - self.origin[1],
+        )
+
+    def _width(self, width: float) -> int:
+        if not width:
+            return 0
+        return max(1, round(width * self.scale))
+
+
+class RasterSurface(RasterCanvas, EncodableSurface):
+    """Raster canvas encoded as a PNG or WebP image"""
+
+    def encode(self, profile: str) -> EncodedImage:
+        return encode_image(self.image, profile)
+
+
+class _MaskSurface(RasterCanvas):
+    """Raster surface that draws coverage (255 wherever anything is painted) into an "L" image"""
+
+    def __init__(
+        self, size: int, viewport: Viewport = Viewport(), origin: Tuple[int, int] = (0, 0),
+        canvas: Optional[Tuple[int, int]] = None, text_masks: Optional[Dict] = None
+    ):
+        DrawingSurface.__init__(self, size, viewport)
+        self.origin = origin
+        self.text_masks = {} if text_masks is None else text_masks
+        self.image = Image.new("L", canvas or (size, size), 0)
+        self._draw = ImageDraw.Draw(self.image)
+
+    def rectangle(self, xy, fill=None, outline=None, width=1):
+        super().rectangle(xy, fill=_cover(fill), outline=_cover(outline), width=width)
+
+    def ellipse(self, xy, fill=None, outline=None, width=1):
+        super().ellipse(xy, fill=_cover(fill), outline=_cover(outline), width=width)
+
+    def polygon(self, xy, fill=None, outline=None, width=1):
+        super().polygon(xy, fill=_cover(fill), outline=_cover(outline), width=width)
+
+    def line(self, xy, fill=None, width=0):
+        super().line(xy, fill=255, width=width)
+
+    def text(self, xy, text, fill=None, font=None):
+        super().text(xy, text, fill=255, font=font)
+
+
+def _cover(color) -> Optional[int]:
+    return None if color is None else 255
+
+
+class SvgSurface(EncodableSurface):
+    """Surface that records primitives as SVG elements in design units"""
+
+    def __init__(self, size: int, viewport: Viewport = Viewport()):
+        super().__init__(size, viewport)
+        self._elements: List[str] = []
+        self._definitions = 0
+
+    def rectangle(self, xy, fill=None, outline=None, width=1):
+        x0, y0, x1, y1 = self._box(xy)
+        # Pillow boxes are inclusive and outlines are drawn inside the box
+        inset = width / 2 if outline is not None and width else 0
+        self._elements.append(
+            f'<rect x="{_num(x0 + inset)}" y="{_num(y0 + inset)}" '
+            f'width="{_num(x1 - x0 + 1 - 2 * inset)}" height="{_num(y1 - y0 + 1 - 2 * inset)}"'
+            f'{self._paint(fill, outline, width)}/>'
+        )
+
+    def ellipse(self, xy, fill=None, outline=None, width=1):
+        x0, y0, x1, y1 = self._box(xy)
+        inset = width / 2 if outline is not None and width else 0
+        self._elements.append(
+            f'<ellipse cx="{_num((x0 + x1) / 2)}" cy="{_num((y0 + y1) / 2)}" '
+            f'rx="{_num((x1 - x0) / 2 - inset)}" ry="{_num((y1 - y0) / 2 - inset)}"'
+            f'{self._paint(fill, outline, width)}/>'
+        )
+
+    def polygon(self, xy, fill=None, outline=None, width=1):
+        self._elements.append(
+            f'<polygon points="{_points_attr(self._points(xy))}"{self._paint(fill, outline, width)}/>'
+        )
+
+    def line(self, xy, fill=None, width=0):
+        self._elements.append(
+            f'<polyline points="{_points_attr(self._points(xy))}" fill="none"'
+            f'{_color_attrs("stroke", fill)} stroke-width="{_num(max(width, 1))}" '
+            f'stroke-linejoin="round"/>'
+        )
+
+    def text(self, xy, text, fill=None, font=None):
+        x, y = xy
+        size = getattr(font, "size", 10)
+        # Pillow anchors text at the ascender line; SVG anchors at the baseline
+        ascent = font.getmetrics()[0] if font else size
+        self._elements.append(
+            f'<text x="{_num(x)}" y="{_num(y + ascent)}" font-family="{SVG_FONT_FAMILY}" '
+            f'font-size="{size}"{_color_attrs("fill", fill)}>{escape(text)}</text>'
+        )
+
+    def composite(self, shape, fill, opacity=1.0, blur=0, offset=(0, 0)):
+        if isinstance(fill, (LinearGradient, RadialGradient)):
+            paint = f"url(#{self._define_gradient(fill)})"
+        else:
+            paint = tuple(fill[:3])
+            opacity *= (fill[3] if len(fill) > 3 else 255) / 255
+
+        # Replay the shape with its colors replaced by the composite's paint
+        body = SvgSurface(self.size, self.viewport)
+        for method, args, kwargs in shape.operations:
+            kwargs = dict(kwargs)
+            for key in ("fill", "outline"):
+                if kwargs.get(key) is not None:
+                    kwargs[key] = paint
+            getattr(body, method)(*args, **kwargs)
+
+        attrs = ""
+        if blur:
+            attrs += f' filter="url(#{self._define_blur(blur)})"'
+        if tuple(offset) != (0, 0):
+            attrs += f' transform="translate({_num(offset[0])} {_num(offset[1])})"'
+        if opacity < 1:
+            attrs += f' opacity="{_num(opacity)}"'
+        self._elements.append(f"<g{attrs}>" + "".join(body._elements) + "</g>")
+
+    def to_svg(self) -> str:
+        """Complete SVG document"""
+        x, y, side = self.viewport
+        return (
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{self.size}" height="{self.size}" '
+            f'viewBox="{_num(x)} {_num(y)} {_num(side)} {_num(side)}">'
+            + "".join(self._elements)
+            + "</svg>"
+        )
+
+    def encode(self, profile: str) -> EncodedImage:
+        start = time.perf_counter()
+        data = self.to_svg().encode()
+        media_type, extension = FORMAT_INFO["SVG"]
+        return EncodedImage(data, media_type, extension, VECTOR_PROFILE, (time.perf_counter() - start) * 1000)
+
+    def _define(self, element: str) -> str:
+        """Add a <defs> entry built from an id-less template and return its new id"""
+        self._definitions += 1
+        definition_id = f"fx{self._definitions}"
+        self._elements.append(f"<defs>{element.format(id=definition_id)}</defs>")
+        return definition_id
+
+    def _define_gradient(self, gradient) -> str:
+        if isinstance(gradient, LinearGradient):
+            (x1, y1), (x2, y2) = gradient.start, gradient.end
+            return self._define(
+                f'<linearGradient id="{{id}}" gradientUnits="userSpaceOnUse" x1="{_num(x1)}" y1="{_num(y1)}" '
+                f'x2="{_num(x2)}" y2="{_num(y2)}">{_stop(0, gradient.start_color)}{_stop(1, gradient.end_color)}'
+                f'</linearGradient>'
+            )
+        cx, cy = gradient.center
+        inner = gradient.inner_radius / gradient.outer_radius if gradient.outer_radius else 0
+        return self._define(
+            f'<radialGradient id="{{id}}" gradientUnits="userSpaceOnUse" cx="{_num(cx)}" cy="{_num(cy)}" '
+            f'r="{_num(gradient.outer_radius)}">{_stop(inner, gradient.inner_color)}{_stop(1, gradient.outer_color)}'
+            f'</radialGradient>'
+        )
+
+    def _define_blur(self, radius: float) -> str:
+        return self._define(
+            f'<filter id="{{id}}" x="-50%" y="-50%" width="200%" height="200%">'
+            f'<feGaussianBlur stdDeviation="{_num(radius)}"/></filter>'
+        )
+
+    @staticmethod
+    def _paint(fill, outline, width) -> str:
+        attrs = _color_attrs("fill", fill) if fill is not None else ' fill="none"'
+        if outline is not None and width:
+            attrs += _color_attrs("stroke", outline) + f' stroke-width="{_num(width)}"'
+        return attrs
+
+
+class RecordingSurface(DrawingSurface):
+    """Surface that keeps draw calls as a display list for replay onto other surfaces"""
+
+    def __init__(self):
+        super().__init__(DESIGN_SIZE)
+        self.operations: List[Tuple[str, tuple, dict]] = []
+        self._boxes: List[Optional[tuple]] = []
+
+    def rectangle(self, *args, **kwargs):
+        self.operations.append(("rectangle", args, kwargs))
+
+    def ellipse(self, *args, **kwargs):
+        self.operations.append(("ellipse", args, kwargs))
+
+    def polygon(self, *args, **kwargs):
+        self.operations.append(("polygon", args, kwargs))
+
+    def line(self, *args, **kwargs):
+        self.operations.append(("line", args, kwargs))
+
+    def text(self, *args, **kwargs):
+        self.operations.append(("text", args, kwargs))
+
+    def composite(self, *args, **kwargs):
+        self.operations.append(("composite", args, kwargs))
+
+    def replay(
+        self, target: DrawingSurface, clip: Optional[Tuple[float, float, float, float]] = None
+    ) -> DrawingSurface:
+        """Draw every recorded call onto the target surface, skipping calls entirely outside clip (a design-space box)"""
+        if clip is None:
+            for method, args, kwargs in self.operations:
+                getattr(target, method)(*args, **kwargs)
+            return target
+
+        for (method, args, kwargs), box in zip(self.operations, self._clip_boxes()):
+            if box and (box[2] < clip[0] or box[0] > clip[2] or box[3] < clip[1] or box[1] > clip[3]):
+                continue
+            getattr(target, method)(*args, **kwargs)
+        return target
+
+    def bounds(self) -> Optional[Tuple[float, float, float, float]]:
+        """Design-space bounding box of everything drawn, or None if nothing was"""
+        boxes = [self._operation_box(method, args, kwargs) for method, args, kwargs in self.operations]
+        boxes = [box for box in boxes if box]
+        if not boxes:
+            return None
+        return (
+            min(box[0] for box in boxes), min(box[1] for box in boxes),
+            max(box[2] for box in boxes), max(box[3] for box in boxes),
+        )
+
+    def content_viewport(self, margin: float = 0.04) -> Viewport:
+        """Square viewport centred on the drawn content, padded by margin of its side"""
+        bounds = self.bounds()
+        if bounds is None:
+            return Viewport()
+        x0, y0, x1, y1 = bounds
+        side = max(x1 - x0, y1 - y0) * (1 + 2 * margin)
+        return Viewport((x0 + x1 - side) / 2, (y0 + y1 - side) / 2, side)
+
+    def _clip_boxes(self) -> List[Optional[tuple]]:
+        """Per-call boxes for clipped replay, padded for stroke widths and font hinting at other scales"""
+        for method, args, kwargs in self.operations[len(self._boxes):]:
+            box = self._operation_box(method, args, kwargs)
+            if box:
+                pad = CLIP_MARGIN + (kwargs.get("width") or 0)
+                box = (box[0] - pad, box[1] - pad, box[2] + pad, box[3] + pad)
+            self._boxes.append(box)
+        return self._boxes
+
+    def _operation_box(self, method: str, args: tuple, kwargs: dict):
+        if method == "composite":
+            return self._composite_box(*args, **kwargs)
+        xy = args[0] if args else kwargs.get("xy")
+        if method == "text":
+            text = args[1] if len(args) > 1 else kwargs.get("text", "")
+            font = kwargs.get("font")
+            if font is None:
+                return None
+            left, top, right, bottom = font.getbbox(text)
+            return xy[0] + left, xy[1] + top, xy[0] + right, xy[1] + bottom
+        if method in ("rectangle", "ellipse"):
+            x0, y0, x1, y1 = self._box(xy)
+            return min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1)
+        points = self._points(xy)
+        pad = (kwargs.get("width") or 0) / 2 if method == "line" else 0
+        xs = [x for x, _ in points]
+        ys = [y for _, y in points]
+        return min(xs) - pad, min(ys) - pad, max(xs) + pad, max(ys) + pad
+
+    @staticmethod
+    def _composite_box(shape: "RecordingSurface", fill=None, opacity=1.0, blur=0, offset=(0, 0)):
+        bounds = shape.bounds()
+        if bounds is None:
+            return None
+        pad = BLUR_EXTENT * blur
+        x0, y0, x1, y1 = bounds
+        return x0 - pad + offset[0], y0 - pad + offset[1], x1 + pad + offset[0], y1 + pad + offset[1]
+
+
+def _num(value: float) -> str:
+    """Compact number formatting for SVG attributes"""
+    return f"{value:.2f}".rstrip("0").rstrip(".")
+
+
+def _points_attr(points: List[tuple]) -> str:
+    return " ".join(f"{_num(x)},{_num(y)}" for x, y in points)
+
+
+def _stop(offset: float, color) -> str:
+    r, g, b = color[:3]
+    alpha = color[3] if len(color) > 3 else 255
+    return f'<stop offset="{_num(offset)}" stop-color="#{r:02x}{g:02x}{b:02x}" stop-opacity="{_num(alpha / 255)}"/>'
+
+
+def _color_attrs(attr: str, color) -> str:
+    """SVG paint attributes for an RGB(A) tuple or CSS color string"""
+    if color is None:
+        return f' {attr}="none"'
+    if isinstance(color, str):
+        return f' {attr}="{color}"'
+    r, g, b = color[:3]
+    attrs = f' {attr}="#{r:02x}{g:02x}{b:02x}"'
+    if len(color) > 3 and color[3] < 255:
+        attrs += f' {attr}-opacity="{_num(color[3] / 255)}"'
+    return attrs
+
+
+def new_surface(output_format: str, size: int, viewport: Viewport = Viewport()) -> EncodableSurface:
+    """Create a drawing surface for the requested output format"""
+    if output_format == "svg":
+        return SvgSurface(size, viewport)
+    return RasterSurface(size, viewport)
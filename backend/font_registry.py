@@ -0,0 +1,135 @@
+"""
+Font Registry - Discovers available font faces once and memoizes loaded fonts
+Avoids re-reading and re-parsing font files from disk on every text draw
+"""
+import logging
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from PIL import ImageFont
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Bundled fallback face (DejaVu Sans, see fonts/LICENSE), searched after the configured paths
+BUNDLED_FONTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fonts")
+
+DEFAULT_SEARCH_PATHS = [
+    "/usr/share/fonts",
+    "/usr/local/share/fonts",
+    os.path.expanduser("~/.fonts"),
+    "/Library/Fonts",
+    "/System/Library/Fonts",
+    "C:\\Windows\\Fonts",
+]
+
+# Preferred faces in priority order (matched case-insensitively on file name stem)
+PREFERRED_FACES = [
+    "arial",
+    "calibri",
+    "tahoma",
+    "dejavusans",
+    "liberationsans-regular",
+    "notosans-regular",
+    "freesans",
+]
+
+FONT_EXTENSIONS = (".ttf", ".otf", ".ttc")
+
+
+class FontRegistry:
+    """Finds font faces once and caches (face, size) font objects"""
+
+    def __init__(self, search_paths: List[str], preferred_faces: List[str]):
+        self.search_paths = search_paths
+        self.preferred_faces = preferred_faces
+        self._faces: Optional[Dict[str, str]] = None
+        self._default_face: Optional[str] = None
+        self._fonts: Dict[Tuple[Optional[str], int], ImageFont.ImageFont] = {}
+        self._font_keys: Dict[ImageFont.ImageFont, Tuple[Optional[str], int]] = {}
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.loads = 0
+
+    def discover(self):
+        """Index font files on the search paths and pick the default face"""
+        with self._lock:
+            if self._faces is not None:
+                return
+            faces = {}
+            for root_dir in self.search_paths:
+                if not os.path.isdir(root_dir):
+                    continue
+                for dirpath, _, filenames in os.walk(root_dir):
+                    for filename in filenames:
+                        stem, ext = os.path.splitext(filename)
+                        if ext.lower() in FONT_EXTENSIONS:
+                            # First match wins, so earlier search paths take priority
+                            faces.setdefault(stem.lower(), os.path.join(dirpath, filename))
+            self._faces = faces
+            self._default_face = next(
+                (faces[name] for name in self.preferred_faces if name in faces), None
+            )
+        logger.info(
+            f"🔤 Font registry found {len(faces)} faces, default: {self._default_face or 'Pillow built-in'}"
+        )
+
+    @property
+    def faces(self) -> Dict[str, str]:
+        """Discovered faces keyed by lowercase name"""
+        self.discover()
+        return dict(self._faces)
+
+    def get(self, size: int, face: Optional[str] = None) -> ImageFont.ImageFont:
+        """Return a memoized font for the face (default face if None) at the given size"""
+        self.discover()
+        path = self._faces.get(face.lower(), self._default_face) if face else self._default_face
+        return self._get_path(path, size)
+
+    def scaled(self, font: ImageFont.ImageFont, scale: float) -> ImageFont.ImageFont:
+        """Same face as a registry font, at its size multiplied by scale"""
+        key = self._font_keys.get(font)
+        if key is None or scale == 1:
+            return font
+        path, size = key
+        return self._get_path(path, max(1, round(size * scale)))
+
+    def _get_path(self, path: Optional[str], size: int) -> ImageFont.ImageFont:
+        key = (path, size)
+        with self._lock:
+            self.requests += 1
+            font = self._fonts.get(key)
+            if font is None:
+                font = self._load(path, size)
+                self._fonts[key] = font
+                self._font_keys[font] = key
+                self.loads += 1
+        return font
+
+    def _load(self, path: Optional[str], size: int) -> ImageFont.ImageFont:
+        """Load a font from disk, falling back to Pillow's built-in face"""
+        if path:
+            try:
+                return ImageFont.truetype(path, size)
+            except OSError as e:
+                logger.warning(f"Could not load font {path}: {e}")
+        return ImageFont.load_default(size)
+
+    def stats(self) -> Dict:
+        """Font lookup and load counters"""
+        return {
+            "default_face": self._default_face,
+            "faces": len(self._faces or {}),
+            "cached_fonts": len(self._fonts),
+            "requests": self.requests,
+            "loads": self.loads,
+        }
+
+
+# Global font registry instance; the bundled face is last so installed copies take priority
+font_registry = FontRegistry(
+    search_paths=[*(settings.font_search_paths or DEFAULT_SEARCH_PATHS), BUNDLED_FONTS_DIR],
+    preferred_faces=PREFERRED_FACES,
+)
@@ -0,0 +1,89 @@
+"""
+Geometry - Memoized point sets for the generator's recurring shapes
+Polygons, stars, waves and spirals are generated with NumPy around the origin
+once per (shape, radius, params) and cached as plain tuples; drawing one is
+then a single translate instead of a per-render trig loop.
+"""
+from functools import lru_cache
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+Points = Tuple[Tuple[float, float], ...]
+
+# Distinct shapes are few (a handful of radii per helper), so this never fills
+CACHE_SIZE = 256
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def regular_polygon(sides: int, radius: float, start_degrees: float = 0) -> Points:
+    """Vertices of a regular polygon, the first at start_degrees"""
+    angles = np.radians(start_degrees + np.arange(sides) * (360 / sides))
+    return _points(np.column_stack((radius * np.cos(angles), radius * np.sin(angles))))
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def star(tips: int, outer_radius: float, inner_radius: float) -> Points:
+    """Star (or gear) outline alternating outer and inner vertices, starting on an outer one at 0 degrees"""
+    angles = np.radians(np.arange(tips * 2) * (180 / tips))
+    radii = np.where(np.arange(tips * 2) % 2 == 0, outer_radius, inner_radius)
+    return _points(np.column_stack((radii * np.cos(angles), radii * np.sin(angles))))
+
+
+def with_hole(outline: Points, hole: Points) -> Points:
+    """
+    One polygon for an outline with a hole cut out of it: the outline, a zero-width
+    bridge to the hole, and the hole traced the opposite way. Pillow and SVG (under
+    either fill rule) both leave the hole unpainted, so it shows what lies beneath.
+    """
+    return outline + outline[:1] + hole[:1] + hole[:0:-1] + hole[:1]
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def sine_wave(
+    start: int, stop: int, step: int, x_scale: float, frequency: float, amplitude: float, y_offset: float = 0
+) -> Points:
+    """Points (i * x_scale, sin(i * frequency) * amplitude + y_offset) for i in range(start, stop, step)"""
+    i = np.arange(start, stop, step, dtype=np.float64)
+    return _points(np.column_stack((i * x_scale, np.sin(i * frequency) * amplitude + y_offset)))
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def spiral(start_radius: float, max_radius: float, growth: float, step_degrees: float) -> Points:
+    """Logarithmic spiral: the radius grows by growth each step_degrees until it reaches max_radius"""
+    count = int(np.ceil(np.log(max_radius / start_radius) / np.log(growth)))
+    steps = np.arange(count + 1)
+    radii = start_radius * growth ** steps
+    steps, radii = steps[radii < max_radius], radii[radii < max_radius]
+    angles = np.radians(steps * step_degrees)
+    return _points(np.column_stack((radii * np.cos(angles), radii * np.sin(angles))))
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def transformed(points: tuple, scale: float = 1.0, rotation_degrees: float = 0) -> Points:
+    """Fixed outline (a tuple of (x, y) pairs) scaled and rotated about the origin"""
+    angle = np.radians(rotation_degrees)
+    rotation = np.array([[np.cos(angle), np.sin(angle)], [-np.sin(angle), np.cos(angle)]])
+    return _points(np.asarray(points, dtype=np.float64) * scale @ rotation)
+
+
+def at(points: Points, x: float, y: float) -> List[Tuple[float, float]]:
+    """Cached shape moved to (x, y), as the point list the drawing surfaces take"""
+    # Shapes have tens of points, where a comprehension beats a NumPy round trip
+    return [(px + x, py + y) for px, py in points]
+
+
+def runs(keys: Sequence) -> List[tuple]:
+    """(key, first, last) index ranges of consecutive equal keys, for drawing segments as polylines"""
+    ranges = []
+    first = 0
+    for i in range(1, len(keys) + 1):
+        if i == len(keys) or keys[i] != keys[first]:
+            ranges.append((keys[first], first, i - 1))
+            first = i
+    return ranges
+
+
+def _points(array: np.ndarray) -> Points:
+    # Immutable, so cached shapes can be shared between renders and threads
+    return tuple(map(tuple, array.tolist()))
@@ -0,0 +1,145 @@
+"""
+Icon Atlas - Pre-rendered industry icons tinted with fast palette lookups
+Each icon is rasterized once per output scale into a role label map (see
+role_layer). Drawing an icon is then a palette lookup plus one paste instead
+of replaying every primitive, and any palette can be applied to the same map.
+"""
+import logging
+import math
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, List, NamedTuple, Optional, Tuple
+
+from PIL import Image
+
+from drawing_surface import DrawingSurface, RasterSurface, RecordingSurface, Viewport
+from role_layer import (
+    PROBE_PALETTE, ColorLabel, LabelOverflowError, LabelSurface, MaskOverlay, palette_bytes, paste_overlays,
+)
+
+logger = logging.getLogger(__name__)
+
+# Above this scale (8000px canvases) a tinted icon outweighs drawing it, so exports draw icons directly
+MAX_ATLAS_SCALE = 8.0
+
+
+class IconEntry(NamedTuple):
+    """One icon rasterized at one scale"""
+    labels: Image.Image           # "L" label map; 0 is untouched
+    mask: Image.Image             # "1" mask of where the icon painted labels
+    offset: Tuple[int, int]       # label map origin relative to the icon anchor, in pixels
+    palette: List[ColorLabel]     # palette[label - 1]
+    overlays: List[MaskOverlay]   # text and effects blended over the labels
+
+
+class IconAtlas:
+    """Bounded cache of rasterized icons keyed by (icon key, output scale)"""
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[Hashable, float], Optional[IconEntry]]" = OrderedDict()
+        # Tinted RGBA images per (entry, lookup table); requests reuse a handful of palettes
+        self._tinted: "OrderedDict[Tuple, Image.Image]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.builds = 0
+        self.direct_draws = 0
+
+    def draw(
+        self, surface: DrawingSurface, key: Hashable, x: float, y: float, colors: Dict,
+        draw_icon: Callable[[DrawingSurface, float, float, Dict], None]
+    ):
+        """Draw an icon anchored at (x, y) from the atlas, or directly on non-raster surfaces"""
+        # Vector and recording surfaces keep the primitives. Role layers take the atlas
+        # pixels too, so a recolored layer matches a direct render
+        atlased = type(surface) in (RasterSurface, LabelSurface) and surface.scale <= MAX_ATLAS_SCALE
+        entry = self.get(key, surface.scale, draw_icon) if atlased else None
+        if entry is None:
+            with self._lock:
+                self.direct_draws += 1
+            draw_icon(surface, x, y, colors)
+            return
+
+        anchor_x = round((x - surface.viewport.x) * surface.scale) - surface.origin[0]
+        anchor_y = round((y - surface.viewport.y) * surface.scale) - surface.origin[1]
+        origin = (anchor_x + entry.offset[0], anchor_y + entry.offset[1])
+        lut = palette_bytes(entry.palette, colors)
+        if type(surface) is LabelSurface:
+            colors = [tuple(lut[label * 4:label * 4 + 4]) for label in range(1, len(entry.palette) + 1)]
+            surface.paste_labels(entry.labels, colors, origin, entry.mask, entry.overlays)
+            return
+        # ImageDraw replaces pixels rather than blending, so paste (not alpha-composite) to match
+        surface.image.paste(self._tint(key, surface.scale, entry, lut), origin, entry.mask)
+        paste_overlays(surface.image, entry.overlays, lut, origin)
+
+    def get(
+        self, key: Hashable, scale: float, draw_icon: Callable[[DrawingSurface, float, float, Dict], None]
+    ) -> Optional[IconEntry]:
+        """Atlas entry for an icon at a scale, building it on first use (None if it cannot be atlased)"""
+        cache_key = (key, round(scale, 6))
+        with self._lock:
+            if cache_key in self._entries:
+                self._entries.move_to_end(cache_key)
+                self.hits += 1
+                return self._entries[cache_key]
+
+        entry = self._build(key, scale, draw_icon)
+        with self._lock:
+            self._entries[cache_key] = entry
+            self.builds += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def stats(self) -> Dict:
+        """Atlas size and usage counters"""
+        return {
+            "entries": len(self._entries),
+            "tinted": len(self._tinted),
+            "hits": self.hits,
+            "builds": self.builds,
+            "direct_draws": self.direct_draws,
+        }
+
+    def _build(
+        self, key: Hashable, scale: float, draw_icon: Callable[[DrawingSurface, float, float, Dict], None]
+    ) -> Optional[IconEntry]:
+        # Find the icon's extent around its anchor, then rasterize just that region
+        recording = RecordingSurface()
+        draw_icon(recording, 0, 0, PROBE_PALETTE)
+        bounds = recording.bounds()
+        if bounds is None:
+            return None
+        x0, y0, x1, y1 = bounds
+        left = math.floor(x0 * scale) - 2
+        top = math.floor(y0 * scale) - 2
+        side = max(math.ceil(x1 * scale) - left, math.ceil(y1 * scale) - top) + 2
+
+        surface = LabelSurface(side, Viewport(left / scale, top / scale, side / scale))
+        try:
+            recording.replay(surface)
+        except LabelOverflowError as e:
+            logger.warning(f"Icon {key} drawn directly: {e}")
+            return None
+
+        # A bilevel mask pastes several times faster than an "L" one
+        mask = surface.image.point(lambda label: 255 if label else 0).convert("1")
+        return IconEntry(surface.image, mask, (left, top), surface.palette, surface.overlays)
+
+    def _tint(self, key: Hashable, scale: float, entry: IconEntry, lut: bytes) -> Image.Image:
+        """Label map resolved against a lookup table, memoized per table"""
+        tint_key = (key, round(scale, 6), lut)
+        with self._lock:
+            tinted = self._tinted.get(tint_key)
+            if tinted is not None:
+                self._tinted.move_to_end(tint_key)
+                return tinted
+
+        tinted = entry.labels.copy()
+        tinted.putpalette(lut, "RGBA")
+        tinted = tinted.convert("RGBA")
+        with self._lock:
+            self._tinted[tint_key] = tinted
+            while len(self._tinted) > self.max_entries:
+                self._tinted.popitem(last=False)
+        return tinted
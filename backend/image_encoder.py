@@ -0,0 +1,129 @@
+"""
+Image Encoder - Selectable encoding profiles for rendered logos
+Profiles trade encode time against output size. Raster profiles trim to the
+content plus a margin, so the encoded image is usually smaller than the
+canvas; pass trim=False to keep the full canvas:
+- fast: trimmed PNG at zlib level 1, for live previews
+- balanced: trimmed PNG at the default zlib level
+- small: trimmed, palette-quantized PNG, for downloads of flat-color logos
+- webp: trimmed lossless WebP
+Vector (SVG) output needs no raster encode and is recorded under the "svg" profile
+"""
+import logging
+import threading
+import time
+from io import BytesIO
+from typing import Dict, NamedTuple, Optional
+
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+ENCODER_PROFILES = {
+    "fast": {"format": "PNG", "trim": True, "params": {"compress_level": 1}},
+    "balanced": {"format": "PNG", "trim": True, "params": {"compress_level": 6}},
+    "small": {"format": "PNG", "trim": True, "palette": True, "params": {"optimize": True}},
+    "webp": {"format": "WEBP", "trim": True, "params": {"lossless": True, "method": 4}},
+}
+
+FORMAT_INFO = {
+    "PNG": ("image/png", "png"),
+    "WEBP": ("image/webp", "webp"),
+    "SVG": ("image/svg+xml", "svg"),
+}
+
+# Profile name recorded for vector output
+VECTOR_PROFILE = "svg"
+
+# Transparent margin kept around trimmed content, relative to the larger canvas side
+TRIM_MARGIN = 0.04
+
+
+class EncodedImage(NamedTuple):
+    """Encoded image bytes with the metrics of the encode that produced them"""
+    data: bytes
+    media_type: str
+    extension: str
+    profile: str
+    encode_ms: float
+
+    @property
+    def size_bytes(self) -> int:
+        return len(self.data)
+
+    @classmethod
+    def from_cache(cls, data: bytes, profile: str) -> "EncodedImage":
+        """Rebuild a cached encode (no encode time was spent)"""
+        image_format = "SVG" if profile == VECTOR_PROFILE else ENCODER_PROFILES[profile]["format"]
+        media_type, extension = FORMAT_INFO[image_format]
+        return cls(data, media_type, extension, profile, 0.0)
+
+
+def trim_to_content(img: Image.Image, margin: float = TRIM_MARGIN) -> Image.Image:
+    """Crop an RGBA image to its alpha bounding box plus a small margin"""
+    bbox = img.getchannel("A").getbbox()
+    if not bbox:
+        return img
+    pad = int(max(img.size) * margin)
+    left, top, right, bottom = bbox
+    return img.crop((
+        max(0, left - pad), max(0, top - pad),
+        min(img.width, right + pad), min(img.height, bottom + pad),
+    ))
+
+
+def encode_image(img: Image.Image, profile: str = "balanced", trim: Optional[bool] = None) -> EncodedImage:
+    """Encode an RGBA image with the given profile (trim overrides the profile's trimming)"""
+    if profile not in ENCODER_PROFILES:
+        raise ValueError(f"Unknown encoder profile '{profile}'")
+    options = ENCODER_PROFILES[profile]
+    start = time.perf_counter()
+
+    if options.get("trim") if trim is None else trim:
+        img = trim_to_content(img)
+    if options.get("palette"):
+        # Flat-color logos survive 256-color quantization; octree keeps the alpha channel
+        img = img.quantize(colors=256, method=Image.Quantize.FASTOCTREE)
+
+    buffered = BytesIO()
+    img.save(buffered, format=options["format"], **options["params"])
+    encode_ms = (time.perf_counter() - start) * 1000
+
+    media_type, extension = FORMAT_INFO[options["format"]]
+    return EncodedImage(buffered.getvalue(), media_type, extension, profile, encode_ms)
+
+
+class EncoderStats:
+    """Per-profile encode counters (count, total time, total bytes)"""
+
+    def __init__(self):
+        self._stats: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, encoded: EncodedImage):
+        """Record one fresh encode (cache hits carry no encode time and are skipped)"""
+        if encoded.encode_ms <= 0:
+            return
+        with self._lock:
+            entry = self._stats.setdefault(encoded.profile, {"count": 0, "total_ms": 0.0, "total_bytes": 0})
+            entry["count"] += 1
+            entry["total_ms"] += encoded.encode_ms
+            entry["total_bytes"] += encoded.size_bytes
+        logger.debug(
+            f"Encoded {encoded.extension} ({encoded.profile}): {encoded.size_bytes} bytes in {encoded.encode_ms:.1f}ms"
+        )
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Average encode time and size per profile"""
+        return {
+            profile: {
+                "count": entry["count"],
+                "avg_ms": round(entry["total_ms"] / entry["count"], 2),
+                "avg_bytes": int(entry["total_bytes"] / entry["count"]),
+            }
+            for profile, entry in self._stats.items()
+        }
+
+
+# Global encoder statistics
+encoder_stats = EncoderStats()
@@ -0,0 +1,131 @@
+"""
+LLM Batcher - Optional cross-request grouping of fused LLM calls
+Fused-prompt calls from concurrent generations can be held for a short window
+(LLM_BATCH_WINDOW_MS) or until LLM_BATCH_MAX_SIZE calls are waiting, then sent
+at the same moment as separate concurrent requests. No provider here has a
+batch endpoint, so this only helps a self-hosted server that batches requests
+arriving together (continuous batching), and every call pays up to the window
+in extra latency. It is off by default (window 0 sends each call at once).
+"""
+import asyncio
+import logging
+import time
+from typing import Dict, List, NamedTuple, Optional
+
+from config import settings
+from llm_client import Completion, LLMProviderClient, llm_client
+
+logger = logging.getLogger(__name__)
+
+
+class _PendingCall(NamedTuple):
+    kwargs: Dict
+    future: asyncio.Future
+    queued: float
+
+
+class LLMBatcher:
+    """Collects LLM calls over a short window and submits each batch at once"""
+
+    def __init__(self, client: LLMProviderClient, window_ms: float, max_batch: int):
+        self.client = client
+        self.window_ms = window_ms
+        self.max_batch = max_batch
+        self._pending: List[_PendingCall] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._dispatches = set()
+        self.batches = 0
+        self.calls = 0
+        self.largest_batch = 0
+        self.wait_s = 0.0
+        self.max_wait_s = 0.0
+        self.batch_sizes: Dict[int, int] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.window_ms > 0 and self.max_batch > 1
+
+    async def generate(
+        self, prompt: str, system: Optional[str] = None, max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None, json_mode: bool = False
+    ) -> Completion:
+        """LLMProviderClient.generate, submitted with whatever other calls arrive in the same window"""
+        kwargs = dict(prompt=prompt, system=system, max_tokens=max_tokens, temperature=temperature, json_mode=json_mode)
+        if not self.enabled:
+            return await self.client.generate(**kwargs)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append(_PendingCall(kwargs, future, time.perf_counter()))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window_ms / 1000, self._flush)
+        return await future
+
+    async def close(self):
+        """Submit anything still waiting and wait for in-flight batches"""
+        self._flush()
+        if self._dispatches:
+            await asyncio.gather(*self._dispatches, return_exceptions=True)
+
+    def stats(self) -> Dict:
+        """Batch counts and sizes, and time calls spent waiting for their window to close"""
+        return {
+            "enabled": self.enabled,
+            "window_ms": self.window_ms,
+            "max_batch": self.max_batch,
+            "batches": self.batches,
+            "calls": self.calls,
+            "avg_batch_size": round(self.calls / self.batches, 2) if self.batches else 0.0,
+            "largest_batch": self.largest_batch,
+            "avg_wait_ms": round(self.wait_s / self.calls * 1000, 2) if self.calls else 0.0,
+            "max_wait_ms": round(self.max_wait_s * 1000, 2),
+            "batch_sizes": dict(sorted(self.batch_sizes.items())),
+        }
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        # Callers that gave up while waiting are dropped before submission
+        batch = [call for call in self._pending if not call.future.done()]
+        self._pending = []
+        if not batch:
+            return
+
+        now = time.perf_counter()
+        waits = [now - call.queued for call in batch]
+        self.batches += 1
+        self.calls += len(batch)
+        self.largest_batch = max(self.largest_batch, len(batch))
+        self.wait_s += sum(waits)
+        self.max_wait_s = max(self.max_wait_s, max(waits))
+        self.batch_sizes[len(batch)] = self.batch_sizes.get(len(batch), 0) + 1
+        logger.debug(f"Submitting LLM batch of {len(batch)} after {max(waits) * 1000:.1f}ms")
+
+        dispatch = asyncio.ensure_future(self._dispatch(batch))
+        self._dispatches.add(dispatch)
+        dispatch.add_done_callback(self._dispatches.discard)
+
+    async def _dispatch(self, batch: List[_PendingCall]):
+        # Separate requests started together, so a batching server can schedule them in one step
+        results = await asyncio.gather(
+            *(self.client.generate(**call.kwargs) for call in batch), return_exceptions=True
+        )
+        for call, result in zip(batch, results):
+            if call.future.done():
+                continue
+            if isinstance(result, BaseException):
+                call.future.set_exception(result)
+            else:
+                call.future.set_result(result)
+
+
+# Global LLM batcher (LLM_BATCH_WINDOW_MS=0 sends every call straight to the client). Calls past
+# the client's in-flight limit would only queue there, so a batch never exceeds it
+llm_batcher = LLMBatcher(
+    client=llm_client,
+    window_ms=settings.llm_batch_window_ms,
+    max_batch=min(settings.llm_batch_max_size, settings.llm_max_in_flight),
+)
@@ -0,0 +1,186 @@
+"""
+LLM Cache - Persistent LLM stage results keyed by a canonical company profile
+Results live in the SQLite database DATABASE_URL points at, so reruns and
+regenerate flows skip the slow LLM stages across restarts. Profiles that only
+differ in whitespace, case or list order share an entry, and entries are
+bounded by age (LLM_CACHE_TTL_SECONDS) and total size (LLM_CACHE_MAX_BYTES).
+"""
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever LLMBrandingService prompts change so results from older prompts are never served
+PROMPT_VERSION = "1"
+
+# Prompt source of split-mode results (LLMBrandingService); prompts built elsewhere pass their own
+SERVICE_SOURCE = f"service:{PROMPT_VERSION}"
+
+# Request fields that do not change what the LLM is asked
+NON_PROFILE_KEYS = {"num_variations"}
+
+
+def canonical_profile(value: Any) -> Any:
+    """Profile normalized for keying: trimmed, lowercased, lists sorted, empty fields dropped"""
+    value = getattr(value, "value", value)  # enums such as CompanyType
+    if isinstance(value, str):
+        return " ".join(value.split()).lower()
+    if isinstance(value, dict):
+        items = {
+            key: canonical_profile(item) for key, item in value.items() if key not in NON_PROFILE_KEYS
+        }
+        return {key: item for key, item in items.items() if item not in (None, "", [], {})}
+    if isinstance(value, (list, tuple, set)):
+        items = [canonical_profile(item) for item in value]
+        return sorted((item for item in items if item not in (None, "")), key=json.dumps)
+    return value
+
+
+def sqlite_path(database_url: str) -> Optional[str]:
+    """File path of a sqlite:/// URL, ":memory:" for in-memory URLs, None for other databases"""
+    if not database_url.startswith("sqlite:"):
+        return None
+    # sqlite:///relative.db, sqlite:////absolute.db; sqlite:// is in-memory
+    path = database_url[len("sqlite:///"):] if database_url.startswith("sqlite:///") else ""
+    return path or ":memory:"
+
+
+class LLMResultCache:
+    """SQLite-backed LRU of LLM stage results with a TTL and a byte budget"""
+
+    def __init__(self, path: Optional[str], max_bytes: int, ttl_seconds: float = 0):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.path is not None and self.max_bytes > 0
+
+    def key(self, stage: str, company_data: Dict, source: str = SERVICE_SOURCE) -> str:
+        """Cache key for one stage of one profile under the prompt source (prompt and version) and model"""
+        parts = {
+            "stage": stage,
+            "source": source,
+            "provider": settings.llm_provider,
+            "model": settings.llm_model,
+            "temperature": settings.llm_temperature,
+            "profile": canonical_profile(company_data),
+        }
+        return hashlib.sha256(json.dumps(parts, sort_keys=True).encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Cached result, or None on a miss or expired entry (blocking; call from a thread)"""
+        if not self.enabled:
+            return None
+        now = time.time()
+        with self._lock:
+            connection = self._connect()
+            row = connection.execute("SELECT value, created FROM llm_results WHERE key = ?", (key,)).fetchone()
+            if row is not None and self.ttl_seconds and now - row[1] > self.ttl_seconds:
+                connection.execute("DELETE FROM llm_results WHERE key = ?", (key,))
+                connection.commit()
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            connection.execute("UPDATE llm_results SET accessed = ? WHERE key = ?", (now, key))
+            connection.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, stage: str, value: Any):
+        """Store a JSON-serializable result, evicting least recently used entries over the budget"""
+        if not self.enabled:
+            return
+        data = json.dumps(value)
+        if len(data) > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock:
+            connection = self._connect()
+            connection.execute(
+                "INSERT OR REPLACE INTO llm_results (key, stage, value, size, created, accessed) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, stage, data, len(data), now, now),
+            )
+            # Keep the most recently used entries that fit the budget
+            evicted = connection.execute(
+                "DELETE FROM llm_results WHERE key IN ("
+                " SELECT key FROM (SELECT key, SUM(size) OVER (ORDER BY accessed DESC, key) AS total"
+                " FROM llm_results) WHERE total > ?)",
+                (self.max_bytes,),
+            ).rowcount
+            connection.commit()
+            self.evictions += evicted
+
+    def clear(self):
+        """Drop every entry (counters are kept)"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._connect().execute("DELETE FROM llm_results")
+            self._connection.commit()
+
+    def close(self):
+        """Close the database connection; the next call reopens it"""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def stats(self) -> Dict:
+        """Entry count, stored bytes and hit/miss counters"""
+        if not self.enabled:
+            return {"enabled": False}
+        with self._lock:
+            entries, size = self._connect().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_results"
+            ).fetchone()
+        total = self.hits + self.misses
+        return {
+            "enabled": True,
+            "entries": entries,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+    def _connect(self) -> sqlite3.Connection:
+        # Opened on first use so importing the module never touches the database
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            if self.path != ":memory:":
+                self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS llm_results ("
+                " key TEXT PRIMARY KEY, stage TEXT NOT NULL, value TEXT NOT NULL, size INTEGER NOT NULL,"
+                " created REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            self._connection.execute("CREATE INDEX IF NOT EXISTS llm_results_accessed ON llm_results (accessed)")
+            self._connection.commit()
+            logger.info(f"🗄️ LLM result cache opened at {self.path}")
+        return self._connection
+
+
+# Global LLM result cache instance (disabled unless DATABASE_URL is a SQLite URL)
+llm_cache = LLMResultCache(
+    path=sqlite_path(settings.database_url),
+    max_bytes=settings.llm_cache_max_bytes,
+    ttl_seconds=settings.llm_cache_ttl_seconds,
+)
@@ -0,0 +1,377 @@
+"""
+LLM Client - Pooled async HTTP client for the Ollama, Together and Cohere providers
+One httpx.AsyncClient per provider keeps connections alive across stages and
+requests, and a per-provider semaphore bounds in-flight calls so a burst of
+generations queues here instead of overloading the model server. `stream`
+yields tokens as the provider produces them.
+"""
+import asyncio
+import json
+import logging
+import time
+from typing import AsyncIterator, Callable, Dict, NamedTuple, Optional, Tuple
+
+import httpx
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ProviderError(RuntimeError):
+    """Raised when a provider call fails or returns an unexpected response"""
+
+
+class ProviderSpec(NamedTuple):
+    """Where and how to call one provider"""
+    base_url: str
+    path: str
+    api_key: str
+    body: Callable[[str, Optional[str], str, int, float, bool], Dict]  # (prompt, system, model, max_tokens, temperature, json_mode)
+    text: Callable[[Dict], str]                                         # completion text from the JSON response
+    usage: Callable[[Dict], Tuple[int, int]]                            # (prompt, completion) tokens from the JSON response
+    chunk: Callable[[str], Tuple[Optional[str], bool]]                  # (token text if any, stream finished) from one streamed line
+
+
+class Completion(NamedTuple):
+    """One completion and what it cost"""
+    text: str
+    prompt_tokens: int
+    completion_tokens: int
+    request_ms: float     # from acquiring the in-flight slot to the parsed response
+
+
+def _ollama_body(prompt, system, model, max_tokens, temperature, json_mode) -> Dict:
+    body = {
+        "model": model, "prompt": prompt, "stream": False,
+        "options": {"temperature": temperature, "num_predict": max_tokens},
+    }
+    if system:
+        body["system"] = system
+    if json_mode:
+        body["format"] = "json"
+    return body
+
+
+def _chat_messages(prompt, system) -> list:
+    return ([{"role": "system", "content": system}] if system else []) + [{"role": "user", "content": prompt}]
+
+
+def _together_body(prompt, system, model, max_tokens, temperature, json_mode) -> Dict:
+    body = {
+        "model": model, "messages": _chat_messages(prompt, system),
+        "max_tokens": max_tokens, "temperature": temperature,
+    }
+    if json_mode:
+        body["response_format"] = {"type": "json_object"}
+    return body
+
+
+def _cohere_body(prompt, system, model, max_tokens, temperature, json_mode) -> Dict:
+    body = {"model": model, "message": prompt, "max_tokens": max_tokens, "temperature": temperature}
+    if system:
+        body["preamble"] = system
+    if json_mode:
+        body["response_format"] = {"type": "json_object"}
+    return body
+
+
+def _ollama_usage(data: Dict) -> Tuple[int, int]:
+    return data.get("prompt_eval_count", 0), data.get("eval_count", 0)
+
+
+def _together_usage(data: Dict) -> Tuple[int, int]:
+    usage = data.get("usage") or {}
+    return usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0)
+
+
+def _cohere_usage(data: Dict) -> Tuple[int, int]:
+    units = (data.get("meta") or {}).get("billed_units") or {}
+    return units.get("input_tokens", 0), units.get("output_tokens", 0)
+
+
+def _ollama_chunk(line: str) -> Tuple[Optional[str], bool]:
+    # NDJSON: {"response": "...", "done": false}, or {"error": "..."} if generation fails
+    data = json.loads(line)
+    if data.get("error"):
+        raise ProviderError(f"ollama stream error: {data['error']}")
+    return data.get("response") or None, bool(data.get("done"))
+
+
+def _together_chunk(line: str) -> Tuple[Optional[str], bool]:
+    # Server-sent events: data: {"choices": [{"delta": {"content": "..."}}]}, then data: [DONE]
+    if not line.startswith("data:"):
+        return None, False
+    data = line[len("data:"):].strip()
+    if data == "[DONE]":
+        return None, True
+    event = json.loads(data)
+    if event.get("error"):
+        raise ProviderError(f"together stream error: {event['error']}")
+    choices = event.get("choices") or [{}]
+    return (choices[0].get("delta") or {}).get("content") or None, False
+
+
+def _cohere_chunk(line: str) -> Tuple[Optional[str], bool]:
+    # NDJSON events; text-generation events carry tokens and stream-end closes the stream
+    event = json.loads(line)
+    if event.get("event_type") == "stream-end":
+        if str(event.get("finish_reason", "")).startswith("ERROR"):
+            raise ProviderError(f"cohere stream error: {event['finish_reason']}")
+        return None, True
+    if event.get("event_type") != "text-generation":
+        return None, False
+    return event.get("text") or None, False
+
+
+PROVIDERS: Dict[str, ProviderSpec] = {
+    "ollama": ProviderSpec(
+        settings.ollama_base_url, "/api/generate", "", _ollama_body, lambda data: data["response"],
+        _ollama_usage, _ollama_chunk,
+    ),
+    "together": ProviderSpec(
+        "https://api.together.xyz", "/v1/chat/completions", settings.together_api_key, _together_body,
+        lambda data: data["choices"][0]["message"]["content"], _together_usage, _together_chunk,
+    ),
+    "cohere": ProviderSpec(
+        "https://api.cohere.com", "/v1/chat", settings.cohere_api_key, _cohere_body, lambda data: data["text"],
+        _cohere_usage, _cohere_chunk,
+    ),
+}
+
+
+STAT_KEYS = (
+    "requests", "in_flight", "errors", "queue_s", "request_s", "streams", "first_token_s",
+    "prompt_tokens", "completion_tokens",
+)
+
+
+class LLMProviderClient:
+    """Process-wide async client with one keep-alive connection pool per provider"""
+
+    def __init__(
+        self, provider: str, model: str, max_tokens: int, temperature: float, connect_timeout: float,
+        read_timeout: float, max_connections: int, max_in_flight: int
+    ):
+        self.provider = provider
+        self.model = model
+        self.max_tokens = max_tokens
+        self.temperature = temperature
+        self.timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        self.limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        self.max_in_flight = max_in_flight
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._slots: Dict[str, asyncio.Semaphore] = {}
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    async def start(self):
+        """Open the configured provider's connection pool"""
+        self._client(self.provider)
+        logger.info(
+            f"🔌 LLM client ready for {self.provider} ({self.max_in_flight} in flight, "
+            f"{self.limits.max_connections} pooled connections)"
+        )
+
+    async def close(self):
+        """Close every connection pool"""
+        clients, self._clients, self._slots = self._clients, {}, {}
+        for client in clients.values():
+            await client.aclose()
+        if clients:
+            logger.info("🔌 LLM client closed")
+
+    async def complete(
+        self, prompt: str, system: Optional[str] = None, max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None, provider: Optional[str] = None, model: Optional[str] = None
+    ) -> str:
+        """Completion text for a prompt, waiting for a free in-flight slot on the provider"""
+        completion = await self.generate(prompt, system, max_tokens, temperature, provider, model)
+        return completion.text
+
+    async def generate(
+        self, prompt: str, system: Optional[str] = None, max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None, provider: Optional[str] = None, model: Optional[str] = None,
+        json_mode: bool = False
+    ) -> Completion:
+        """
+        Completion with its token counts and timing. json_mode asks the provider to
+        constrain the output to a single JSON document
+        """
+        provider = provider or self.provider
+        spec = self._spec(provider)
+        body = spec.body(
+            prompt, system, model or self.model, max_tokens or self.max_tokens,
+            self.temperature if temperature is None else temperature, json_mode,
+        )
+        client = self._client(provider)
+        stats = self._stats[provider]
+
+        queued = time.perf_counter()
+        async with self._slots[provider]:
+            started = time.perf_counter()
+            stats["queue_s"] += started - queued
+            stats["in_flight"] += 1
+            try:
+                response = await client.post(spec.path, json=body)
+                response.raise_for_status()
+                data = response.json()
+                text = spec.text(data)
+                prompt_tokens, completion_tokens = spec.usage(data)
+            except (httpx.HTTPError, KeyError, IndexError, ValueError) as e:
+                stats["errors"] += 1
+                raise ProviderError(f"{provider} request failed: {e}") from e
+            finally:
+                stats["in_flight"] -= 1
+                stats["requests"] += 1
+                stats["request_s"] += time.perf_counter() - started
+            stats["prompt_tokens"] += prompt_tokens
+            stats["completion_tokens"] += completion_tokens
+        return Completion(text, prompt_tokens, completion_tokens, (time.perf_counter() - started) * 1000)
+
+    async def stream(
+        self, prompt: str, system: Optional[str] = None, max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None, provider: Optional[str] = None, model: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Completion text for a prompt as the provider generates it, one token chunk at a time.
+        The in-flight slot is held until the stream ends or the caller stops iterating.
+        Raises ProviderError if the provider reports an error or the stream ends before
+        its final event, so a partial completion is never mistaken for a whole one.
+        """
+        provider = provider or self.provider
+        spec = self._spec(provider)
+        body = spec.body(
+            prompt, system, model or self.model, max_tokens or self.max_tokens,
+            self.temperature if temperature is None else temperature, False,
+        )
+        body["stream"] = True
+        client = self._client(provider)
+        stats = self._stats[provider]
+
+        queued = time.perf_counter()
+        async with self._slots[provider]:
+            started = time.perf_counter()
+            stats["queue_s"] += started - queued
+            stats["in_flight"] += 1
+            first_token = None
+            done = False
+            try:
+                async with client.stream("POST", spec.path, json=body) as response:
+                    response.raise_for_status()
+                    async for line in response.aiter_lines():
+                        text, done = spec.chunk(line) if line.strip() else (None, False)
+                        if text:
+                            if first_token is None:
+                                first_token = time.perf_counter()
+                                stats["streams"] += 1
+                                stats["first_token_s"] += first_token - started
+                            yield text
+                        if done:
+                            break
+                if not done:
+                    raise ProviderError(f"{provider} stream ended before completion")
+            except ProviderError:
+                stats["errors"] += 1
+                raise
+            except (httpx.HTTPError, KeyError, IndexError, ValueError) as e:
+                stats["errors"] += 1
+                raise ProviderError(f"{provider} stream failed: {e}") from e
+            finally:
+                stats["in_flight"] -= 1
+                stats["requests"] += 1
+                stats["request_s"] += time.perf_counter() - started
+
+    def stats(self) -> Dict:
+        """Per-provider request counts, errors, token totals and average queue and request time"""
+        return {
+            provider: {
+                "requests": int(stats["requests"]),
+                "in_flight": int(stats["in_flight"]),
+                "errors": int(stats["errors"]),
+                "prompt_tokens": int(stats["prompt_tokens"]),
+                "completion_tokens": int(stats["completion_tokens"]),
+                "avg_queue_ms": round(stats["queue_s"] / stats["requests"] * 1000, 1) if stats["requests"] else 0.0,
+                "avg_request_ms": round(stats["request_s"] / stats["requests"] * 1000, 1) if stats["requests"] else 0.0,
+                "streams": int(stats["streams"]),
+                "avg_first_token_ms": (
+                    round(stats["first_token_s"] / stats["streams"] * 1000, 1) if stats["streams"] else 0.0
+                ),
+            }
+            for provider, stats in self._stats.items()
+        }
+
+    def _spec(self, provider: str) -> ProviderSpec:
+        if provider not in PROVIDERS:
+            raise ProviderError(f"Unsupported LLM provider '{provider}' (choose from {', '.join(PROVIDERS)})")
+        return PROVIDERS[provider]
+
+    def _client(self, provider: str) -> httpx.AsyncClient:
+        """Connection pool for a provider, opened on first use"""
+        client = self._clients.get(provider)
+        if client is None:
+            spec = PROVIDERS[provider]
+            headers = {"Authorization": f"Bearer {spec.api_key}"} if spec.api_key else {}
+            client = self._clients[provider] = httpx.AsyncClient(
+                base_url=spec.base_url, headers=headers, timeout=self.timeout, limits=self.limits,
+            )
+            self._slots[provider] = asyncio.Semaphore(self.max_in_flight)
+            self._stats.setdefault(provider, dict.fromkeys(STAT_KEYS, 0.0))
+        return client
+
+
+class LLMModeStats:
+    """
+    LLM stage calls per generation mode (split, fused, stream): count, stages covered,
+    time and tokens. Split stages go through LLMBrandingService, which reports no token
+    counts, so their token averages stay None
+    """
+
+    def __init__(self):
+        self._stats: Dict[str, Dict] = {}
+
+    def record(self, mode: str, stages: int, seconds: float, completion: Optional[Completion] = None):
+        """Record one LLM call that produced results for a number of stages"""
+        entry = self._stats.setdefault(
+            mode, {"calls": 0, "stages": 0, "total_s": 0.0, "token_calls": 0, "prompt_tokens": 0, "completion_tokens": 0}
+        )
+        entry["calls"] += 1
+        entry["stages"] += stages
+        entry["total_s"] += seconds
+        if completion is not None:
+            entry["token_calls"] += 1
+            entry["prompt_tokens"] += completion.prompt_tokens
+            entry["completion_tokens"] += completion.completion_tokens
+
+    def summary(self) -> Dict[str, Dict]:
+        """Average time per call and per stage, and average tokens per call where reported"""
+        return {
+            mode: {
+                "calls": entry["calls"],
+                "stages": entry["stages"],
+                "avg_call_ms": round(entry["total_s"] / entry["calls"] * 1000, 1),
+                "avg_stage_ms": round(entry["total_s"] / max(1, entry["stages"]) * 1000, 1),
+                "avg_prompt_tokens": (
+                    round(entry["prompt_tokens"] / entry["token_calls"], 1) if entry["token_calls"] else None
+                ),
+                "avg_completion_tokens": (
+                    round(entry["completion_tokens"] / entry["token_calls"], 1) if entry["token_calls"] else None
+                ),
+            }
+            for mode, entry in self._stats.items()
+        }
+
+
+# Global LLM provider client, opened and closed by the app lifespan
+llm_client = LLMProviderClient(
+    provider=settings.llm_provider,
+    model=settings.llm_model,
+    max_tokens=settings.llm_max_tokens,
+    temperature=settings.llm_temperature,
+    connect_timeout=settings.llm_connect_timeout,
+    read_timeout=settings.llm_read_timeout,
+    max_connections=settings.llm_max_connections,
+    max_in_flight=settings.llm_max_in_flight,
+)
+
+# Global per-mode LLM stage statistics
+llm_mode_stats = LLMModeStats()
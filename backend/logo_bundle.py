@@ -0,0 +1,108 @@
+"""
+Logo Bundle - Multi-size brand asset packaging
+Defines the standard bundle targets (favicons, app icons, avatar, print master),
+builds multi-resolution .ico files and streams bundles out as a zip archive
+"""
+import json
+import zipfile
+from io import BytesIO
+from typing import Dict, Iterable, Iterator, List, NamedTuple
+
+from PIL import Image
+
+# Bundle target name -> square output size in pixels
+BUNDLE_SIZES: Dict[str, int] = {
+    "favicon-16": 16,
+    "favicon-32": 32,
+    "favicon-48": 48,
+    "apple-touch-icon": 180,
+    "social-avatar": 400,
+    "app-icon-512": 512,
+    "print-master": 2048,
+}
+
+# Resolutions packed into favicon.ico when the bundle renders them
+ICO_SIZES = (16, 32, 48)
+
+# Already-compressed formats are stored as-is instead of being deflated again
+STORED_EXTENSIONS = {"png", "webp", "ico"}
+
+
+class BundleFile(NamedTuple):
+    """One file of a logo bundle with the time spent producing it"""
+    path: str
+    data: bytes
+    size: int           # output side in pixels (0 for resolution-independent files)
+    render_ms: float
+    encode_ms: float
+
+
+def build_ico(images: Dict[int, Image.Image]) -> bytes:
+    """Pack natively rendered square images into one multi-resolution .ico"""
+    sizes = sorted(images)
+    buffered = BytesIO()
+    # The largest image is the base; the others are embedded as-is instead of being downscaled
+    images[sizes[-1]].save(
+        buffered,
+        format="ICO",
+        sizes=[(size, size) for size in sizes],
+        append_images=[images[size] for size in sizes[:-1]],
+    )
+    return buffered.getvalue()
+
+
+def bundle_manifest(files: List[BundleFile]) -> Dict:
+    """Per-file sizes and timings, written into the archive as manifest.json"""
+    return {
+        "files": [
+            {
+                "path": file.path,
+                "size": file.size,
+                "bytes": len(file.data),
+                "render_ms": round(file.render_ms, 2),
+                "encode_ms": round(file.encode_ms, 2),
+            }
+            for file in files
+        ],
+        "total_render_ms": round(sum(file.render_ms for file in files), 2),
+        "total_encode_ms": round(sum(file.encode_ms for file in files), 2),
+    }
+
+
+class _ChunkWriter:
+    """Write-only, unseekable sink that hands zip output back in chunks"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def pop(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def stream_zip(files: Iterable[BundleFile]) -> Iterator[bytes]:
+    """
+    Zip bundle files as they are produced, yielding archive bytes after each one.
+    Nothing is written to disk; manifest.json with the timings is added last.
+    """
+    sink = _ChunkWriter()
+    written = []
+    with zipfile.ZipFile(sink, "w") as archive:
+        for file in files:
+            extension = file.path.rsplit(".", 1)[-1]
+            compress_type = zipfile.ZIP_STORED if extension in STORED_EXTENSIONS else zipfile.ZIP_DEFLATED
+            archive.writestr(file.path, file.data, compress_type=compress_type)
+            written.append(file)
+            yield sink.pop()
+        archive.writestr(
+            "manifest.json", json.dumps(bundle_manifest(written), indent=2), compress_type=zipfile.ZIP_DEFLATED
+        )
+    yield sink.pop()
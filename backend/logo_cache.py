@@ -0,0 +1,154 @@
+"""
+Logo Cache - Bounded, byte-accounted LRU cache for rendered logos
+Stores raw encoded image bytes; callers base64-encode only when serializing.
+Other values can be stored by passing their size explicitly.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+def make_cache_key(renderer_version: str, *parts) -> str:
+    """Build a cache key; the renderer version invalidates entries across deploys"""
+    raw = "|".join(str(part) for part in (renderer_version, *parts))
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+class LogoCache:
+    """LRU cache bounded by total stored bytes, with optional TTL expiry"""
+
+    def __init__(self, max_bytes: int, ttl_seconds: float = 0):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (value, stored_at, size)
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.rejected = 0
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._entries and not self._expired(self._entries[key][1])
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return cached bytes and mark them recently used, or None on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            data, stored_at, _ = entry
+            if self._expired(stored_at):
+                self._remove(key)
+                self.evictions += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return data
+
+    def put(self, key: str, data: bytes, size: Optional[int] = None):
+        """Store bytes (or any value of the given size), evicting least recently used entries to stay within budget"""
+        if size is None:
+            size = len(data)
+        with self._lock:
+            if size > self.max_bytes:
+                self.rejected += 1
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (data, time.monotonic(), size)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def clear(self):
+        """Drop every entry (counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self) -> Dict:
+        """Hit/miss/eviction counters and current memory use"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "rejected": self.rejected,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def _expired(self, stored_at: float) -> bool:
+        return self.ttl_seconds > 0 and time.monotonic() - stored_at > self.ttl_seconds
+
+    def _remove(self, key: str):
+        _, _, size = self._entries.pop(key)
+        self.current_bytes -= size
+
+
+class StripedLogoCache:
+    """
+    LogoCache split into independently locked stripes picked by key hash, so
+    concurrent renders on different keys never wait on each other's lock.
+    Each stripe gets an equal share of the byte budget, so there are only as
+    many stripes as can each hold an entry of max_entry_bytes.
+    """
+
+    def __init__(self, max_bytes: int, ttl_seconds: float = 0, stripes: int = 8, max_entry_bytes: int = 0):
+        self.max_bytes = max_bytes
+        if max_entry_bytes > 0:
+            stripes = min(stripes, max_bytes // max_entry_bytes)
+        stripes = max(1, stripes)
+        self._stripes = [LogoCache(max_bytes // stripes, ttl_seconds) for _ in range(stripes)]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._stripe(key)
+
+    def __len__(self) -> int:
+        return sum(len(stripe) for stripe in self._stripes)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return a cached value and mark it recently used, or None on a miss"""
+        return self._stripe(key).get(key)
+
+    def put(self, key: str, data: Any, size: Optional[int] = None):
+        """Store a value in its key's stripe, evicting within that stripe only (larger than a stripe is rejected)"""
+        self._stripe(key).put(key, data, size)
+
+    def clear(self):
+        """Drop every entry (counters are kept)"""
+        for stripe in self._stripes:
+            stripe.clear()
+
+    def stats(self) -> Dict:
+        """Counters summed across stripes"""
+        totals = [stripe.stats() for stripe in self._stripes]
+        hits = sum(stats["hits"] for stats in totals)
+        misses = sum(stats["misses"] for stats in totals)
+        return {
+            "entries": sum(stats["entries"] for stats in totals),
+            "bytes": sum(stats["bytes"] for stats in totals),
+            "max_bytes": self.max_bytes,
+            "stripes": len(self._stripes),
+            "hits": hits,
+            "misses": misses,
+            "evictions": sum(stats["evictions"] for stats in totals),
+            "rejected": sum(stats["rejected"] for stats in totals),
+            "hit_rate": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+        }
+
+    def _stripe(self, key: str) -> LogoCache:
+        return self._stripes[hash(key) % len(self._stripes)]
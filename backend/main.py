@@ -2,31 +2,57 @@
 FastAPI Backend for Brand Identity Generator MVP
 Handles LLM-based branding asset generation for tech companies
 """
+import asyncio
+import base64
+import json
 import logging
 import time
 import uuid
 from datetime import datetime
 from contextlib import asynccontextmanager
+from typing import Callable, Optional
 
-from fastapi import FastAPI, HTTPException, Depends, status
+from fastapi import FastAPI, HTTPException, Depends, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 
+from asset_store import asset_store
 from config import settings
 from schemas import (
     CompanyProfileCreate,
     CompanyProfile,
     BrandingRequest,
     BrandingResponse,
+    LogoBundleRequest,
+    LogoExportRequest,
+    LogoRecolorRequest,
     LogoVariation,
     TaglineVariation,
     ColorPalette,
     TypographyRecommendation,
 )
 from llm_service import LLMBrandingService
+from llm_cache import llm_cache
+from llm_batcher import llm_batcher
+from llm_client import ProviderError, llm_client, llm_mode_stats
+from brand_prompts import (
+    FUSED_SECTIONS,
+    FUSED_SOURCE,
+    GUIDELINES_SOURCE,
+    brand_guidelines_prompt,
+    fused_sections_prompt,
+    parse_fused_sections,
+)
 from logo_generator import logo_generator
 from ultra_logo_generator import ultra_logo_generator
-from professional_logo_generator import professional_logo_generator
+from font_registry import font_registry
+from image_encoder import EncodedImage, encoder_stats
+from logo_bundle import BUNDLE_SIZES, stream_zip
+from professional_logo_generator import RenderOptions, professional_logo_generator
+from render_pool import render_pool, RenderQueueFullError
+from template_registry import template_registry
+from tiled_export import ExportLimiter
+from text_layout import text_layout
 from industry_logo_generator import industry_logo_generator
 
 # Configure logging
@@ -47,17 +73,25 @@ async def lifespan(app: FastAPI):
     
     # Startup
     logger.info("🚀 Starting Brand Identity Generator Backend")
+    await llm_client.start()
     try:
         llm_service = LLMBrandingService(settings)
         logger.info("✅ LLM service initialized successfully")
     except Exception as e:
         logger.error(f"❌ Failed to initialize LLM service: {e}")
         raise
+    font_registry.discover()
+    professional_logo_generator.warm_icon_atlas()
+    render_pool.start()
     
     yield
     
     # Shutdown
     logger.info("🛑 Shutting down Brand Identity Generator Backend")
+    render_pool.shutdown()
+    await llm_batcher.close()
+    await llm_client.close()
+    llm_cache.close()
 
 
 # Create FastAPI app
@@ -90,6 +124,19 @@ async def health_check():
         "timestamp": datetime.utcnow().isoformat(),
         "environment": settings.environment,
         "llm_model": settings.llm_model,
+        "llm_cache": llm_cache.stats(),
+        "llm_client": llm_client.stats(),
+        "llm_batcher": llm_batcher.stats(),
+        "llm_modes": llm_mode_stats.summary(),
+        "logo_cache": professional_logo_generator.cache.stats(),
+        "role_layers": professional_logo_generator.layers.stats(),
+        "icon_atlas": professional_logo_generator.icons.stats(),
+        "logo_templates": template_registry.stats(),
+        "fonts": font_registry.stats(),
+        "text_layout": text_layout.stats(),
+        "asset_store": asset_store.stats(),
+        "exports": export_limiter.stats(),
+        "encoders": encoder_stats.summary(),
     }
 
 
@@ -105,7 +152,11 @@ async def root():
         "endpoints": {
             "health": "/health",
             "generate_branding": "/api/v1/generate-branding",
+            "generate_branding_stream": "/api/v1/generate-branding/stream",
+            "logo_bundle": "/api/v1/generate-branding/logo-bundle",
+            "recolor_logo": "/api/v1/logos/recolor",
             "company_profiles": "/api/v1/company-profiles",
+            "assets": "/api/v1/assets/{asset_id}",
         },
     }
 
@@ -124,13 +175,420 @@ async def generate_branding_options():
     )
 
 
+# ==================== Generation Stages ====================
+
+# Palette and typography used when a stage is skipped or fails
+DEFAULT_COLOR_PALETTE = {
+    "primary": "#2563EB",
+    "secondary": "#10B981",
+    "accent": "#F59E0B",
+    "neutral": "#F3F4F6",
+}
+
+LOGO_STYLE_DESCRIPTIONS = [
+    "Professional Wordmark - Typography-focused design emphasizing brand name",
+    "Custom Lettermark - Monogram-based design with distinctive lettering",
+    "Pictorial Symbol - Icon-based design with industry-relevant imagery",
+    "Abstract Mark - Artistic geometric design with unique visual elements",
+    "Combination Logo - Balanced integration of text and symbolic elements",
+    "Professional Emblem - Badge-style design with authoritative presence"
+]
+
+LOGO_STYLE_NAMES = ['Wordmark', 'Lettermark', 'Pictorial', 'Abstract', 'Combination', 'Emblem']
+
+
+async def _call_llm(func, *args):
+    """
+    Call an LLM service method without blocking the event loop.
+    Coroutine methods are awaited directly; blocking ones run in a worker thread.
+    """
+    if asyncio.iscoroutinefunction(func):
+        return await func(*args)
+    return await asyncio.to_thread(func, *args)
+
+
+async def _call_llm_cached(stage: str, func, company_data: dict, count: Optional[int] = None):
+    """
+    _call_llm through the persistent LLM result cache. A cached list with more
+    entries than requested is sliced, so only asking for more calls the LLM again
+    """
+    key = llm_cache.key(stage, company_data)
+    cached = await asyncio.to_thread(llm_cache.get, key)
+    if cached is not None and (count is None or len(cached) >= count):
+        return cached if count is None else cached[:count]
+
+    start = time.perf_counter()
+    result = await _call_llm(func, company_data, *(() if count is None else (count,)))
+    llm_mode_stats.record("split", 1, time.perf_counter() - start)
+    await asyncio.to_thread(llm_cache.put, key, stage, result)
+    return result
+
+
+async def _run_stage(generation_id: str, name: str, coro):
+    """Await one generation stage, isolating its failure from the other stages"""
+    stage_start = time.time()
+    try:
+        result = await coro
+    except Exception as e:
+        logger.error(f"[{generation_id}] ❌ Stage '{name}' failed: {e}", exc_info=True)
+        raise
+    logger.info(f"[{generation_id}] Stage '{name}' finished in {time.time() - stage_start:.2f}s")
+    return result
+
+
+def _prepare_company_data(request: BrandingRequest) -> dict:
+    """Build the company profile dict shared by every generation stage"""
+    if request.company_profile:
+        company_data = request.company_profile.model_dump()
+    else:
+        company_data = {
+            "name": f"Company {request.company_id}",
+            "company_type": "saas",
+            "industry": "Technology",
+            "description": "Tech company",
+            "target_audience": "Enterprise",
+            "brand_values": ["Innovation", "Quality"],
+        }
+
+    # God Mode prompt feeds every downstream LLM stage, so apply it before they start
+    gm = request.god_mode
+    if gm and gm.prompt:
+        company_data["additional_context"] = f"{company_data.get('additional_context') or ''} GOD_MODE: {gm.prompt}".strip()
+
+    return company_data
+
+
+def _asset_url(image: EncodedImage, base_url: str, inline: bool) -> str:
+    """Store an encoded image and return its URL, or a data URL when inline"""
+    if inline:
+        return f"data:{image.media_type};base64,{base64.b64encode(image.data).decode()}"
+    asset_id = asset_store.put(image.data, image.extension)
+    return f"{base_url}api/v1/assets/{asset_id}"
+
+
+def _logo_context(generation_id: str, request: BrandingRequest, company_data: dict) -> dict:
+    """Company name, industry, per-variation color schemes and seed for logo rendering"""
+    # Get industry and company type from company data
+    industry = company_data.get("industry", "Technology")
+    company_type = company_data.get("company_type", "saas")
+    company_name = company_data.get("name", "Company")
+    gm = request.god_mode
+
+    # Combine industry and company_type, allow override and keyword bias (symbols/negative)
+    company_type = getattr(company_type, "value", company_type)
+    template_query = f"{gm.industry_override if gm and gm.industry_override else industry} {company_type}"
+    industry_context = template_query
+    if gm and (gm.symbols or gm.negative):
+        bias = []
+        if gm.symbols:
+            bias.append("symbols:" + ",".join(gm.symbols))
+        if gm.negative:
+            bias.append("avoid:" + ",".join(gm.negative))
+        industry_context = industry_context + " " + " ".join(bias)
+
+    logger.info(f"[{generation_id}] Using PROFESSIONAL diverse logo generator for: {industry_context}")
+
+    # Create DIFFERENT color schemes for each variation
+    color_variations = [
+        ["#2563EB", "#10B981", "#F59E0B"],  # Blue-Green-Orange
+        ["#8B5CF6", "#EC4899", "#06B6D4"],  # Purple-Pink-Cyan
+        ["#EF4444", "#F59E0B", "#10B981"],  # Red-Orange-Green
+    ]
+
+    # Apply color overrides if provided
+    if gm and gm.color_overrides and len(gm.color_overrides) >= 3:
+        ov = gm.color_overrides[:3]
+        color_variations = [ov, ov, ov]
+
+    # Seed every render from the request so identical requests give identical, cacheable logos
+    seed = gm.seed if gm and gm.seed else professional_logo_generator.derive_seed(
+        json.dumps(company_data, sort_keys=True, default=str)
+    )
+
+    return {
+        "company_name": company_name,
+        "industry": industry,
+        # What the renderer matches against industry templates
+        "template_query": template_query,
+        "color_variations": color_variations,
+        # Use first color from each palette
+        "colors": [color_variations[0][0], color_variations[1][0], color_variations[2][0]],
+        "seed": seed,
+    }
+
+
+async def _generate_logos(
+    generation_id: str,
+    request: BrandingRequest,
+    company_data: dict,
+    base_url: str,
+    on_logo: Optional[Callable[[LogoVariation], None]] = None,
+) -> list:
+    """Logo stage: LLM logo prompts plus professional logo rendering"""
+    logger.info(f"[{generation_id}] Generating industry-aware logos with VARIATIONS")
+    await _call_llm_cached("logo_prompts", llm_service.generate_logo_prompts, company_data, request.num_variations)
+
+    context = _logo_context(generation_id, request, company_data)
+    company_name = context["company_name"]
+    industry = context["industry"]
+    color_variations = context["color_variations"]
+
+    def build_logo(index: int, logo_image: EncodedImage) -> LogoVariation:
+        idx = index + 1
+
+        # Get appropriate description for this logo type
+        logo_desc = LOGO_STYLE_DESCRIPTIONS[(idx - 1) % len(LOGO_STYLE_DESCRIPTIONS)]
+
+        # Use different color scheme for each
+        variation_colors = color_variations[(idx - 1) % len(color_variations)]
+
+        return LogoVariation(
+            id=f"logo_{idx}",
+            description=logo_desc,
+            color_scheme=variation_colors,
+            style=f"Professional {LOGO_STYLE_NAMES[(idx - 1) % len(LOGO_STYLE_NAMES)]}",
+            prompt_used=f"Professional {logo_desc} for {company_name} in {industry}",
+            image_url=_asset_url(logo_image, base_url, request.inline_images)
+        )
+
+    logos = [None] * request.num_variations
+
+    def on_rendered(index: int, logo_image: EncodedImage):
+        logos[index] = build_logo(index, logo_image)
+        if on_logo:
+            on_logo(logos[index])
+
+    # Generate truly diverse professional logos, fanned out across the render pool
+    await render_pool.render_logos(
+        company_name,
+        context["template_query"],
+        context["colors"],
+        request.num_variations,
+        context["seed"],
+        on_rendered,
+        RenderOptions(
+            size=request.image_size,
+            profile=request.image_profile or settings.image_encoder_profile,
+            output_format=request.image_format,
+            variant=request.image_variant,
+            quality=request.image_quality,
+            trim=request.image_trim,
+        ),
+    )
+    return logos
+
+
+async def _generate_fused_sections(generation_id: str, request: BrandingRequest, company_data: dict) -> dict:
+    """
+    Raw tagline, palette and typography data from one JSON prompt, so the profile is
+    sent and prefilled once. Cached sections are not asked for again; sections the
+    response lacks or gets wrong are left out for their stages to generate separately
+    """
+    count = request.num_variations
+    sections = {}
+    for stage in FUSED_SECTIONS:
+        cached = await asyncio.to_thread(llm_cache.get, llm_cache.key(stage, company_data, FUSED_SOURCE))
+        if cached is not None and (stage != "taglines" or len(cached) >= count):
+            sections[stage] = cached[:count] if stage == "taglines" else cached
+    missing = [stage for stage in FUSED_SECTIONS if stage not in sections]
+    if not missing:
+        return sections
+
+    logger.info(f"[{generation_id}] Generating {', '.join(missing)} in one fused prompt")
+    system, prompt = fused_sections_prompt(company_data, missing, count)
+    try:
+        completion = await llm_batcher.generate(prompt, system, json_mode=True)
+    except ProviderError as e:
+        logger.warning(f"[{generation_id}] Fused prompt failed, generating sections separately: {e}")
+        return sections
+
+    generated = parse_fused_sections(completion.text, missing, count)
+    llm_mode_stats.record("fused", len(generated), completion.request_ms / 1000, completion)
+    logger.info(
+        f"[{generation_id}] Fused prompt produced {len(generated)}/{len(missing)} valid sections in "
+        f"{completion.request_ms:.0f}ms ({completion.prompt_tokens} prompt + "
+        f"{completion.completion_tokens} completion tokens)"
+    )
+    for stage, data in generated.items():
+        await asyncio.to_thread(llm_cache.put, llm_cache.key(stage, company_data, FUSED_SOURCE), stage, data)
+    return {**sections, **generated}
+
+
+async def _stage_data(
+    generation_id: str, stage: str, func, company_data: dict, count: Optional[int] = None,
+    fused: Optional[asyncio.Future] = None
+):
+    """Raw stage result from the fused prompt when it produced the section, else from its own LLM call"""
+    if fused is not None:
+        sections = await fused
+        if stage in sections:
+            return sections[stage]
+        logger.info(f"[{generation_id}] Fused prompt missed '{stage}', re-running the stage")
+    return await _call_llm_cached(stage, func, company_data, count)
+
+
+async def _generate_taglines(
+    generation_id: str, request: BrandingRequest, company_data: dict, fused: Optional[asyncio.Future] = None
+) -> list:
+    """Tagline stage"""
+    logger.info(f"[{generation_id}] Generating taglines")
+    tagline_data = await _stage_data(
+        generation_id, "taglines", llm_service.generate_taglines, company_data, request.num_variations, fused
+    )
+
+    return [
+        TaglineVariation(
+            id=f"tagline_{idx}",
+            text=tagline.get("text", f"Tagline {idx}"),
+            tone=tagline.get("tone", "professional"),
+            explanation=tagline.get("explanation", ""),
+        )
+        for idx, tagline in enumerate(tagline_data, 1)
+    ]
+
+
+async def _generate_color_palette(
+    generation_id: str, company_data: dict, fused: Optional[asyncio.Future] = None
+) -> ColorPalette:
+    """Color palette stage"""
+    logger.info(f"[{generation_id}] Generating color palette")
+    palette_data = await _stage_data(
+        generation_id, "color_palette", llm_service.generate_color_palette, company_data, fused=fused
+    )
+
+    primary = palette_data.get("primary", {})
+    secondary = palette_data.get("secondary", {})
+    accent = palette_data.get("accent", {})
+    neutral = palette_data.get("neutral", {})
+
+    return ColorPalette(
+        primary=primary.get("hex", DEFAULT_COLOR_PALETTE["primary"]),
+        secondary=secondary.get("hex", DEFAULT_COLOR_PALETTE["secondary"]),
+        accent=accent.get("hex", DEFAULT_COLOR_PALETTE["accent"]),
+        neutral=neutral.get("hex", DEFAULT_COLOR_PALETTE["neutral"]),
+        psychology={
+            "primary": primary.get("psychology", "Trust"),
+            "secondary": secondary.get("psychology", "Growth"),
+            "accent": accent.get("psychology", "Energy"),
+            "neutral": neutral.get("psychology", "Clarity"),
+        },
+        usage_guidelines=palette_data.get("usage_guidelines", ""),
+    )
+
+
+async def _generate_typography(
+    generation_id: str, company_data: dict, fused: Optional[asyncio.Future] = None
+) -> TypographyRecommendation:
+    """Typography stage"""
+    logger.info(f"[{generation_id}] Generating typography")
+    typo_data = await _stage_data(
+        generation_id, "typography", llm_service.generate_typography, company_data, fused=fused
+    )
+
+    return TypographyRecommendation(
+        heading_font=typo_data.get("heading_font", "Inter Bold"),
+        body_font=typo_data.get("body_font", "Inter Regular"),
+        accent_font=typo_data.get("accent_font"),
+        rationale=typo_data.get("heading_rationale", ""),
+        pairings=typo_data.get("pairings", []),
+    )
+
+
+async def _generate_brand_guidelines(generation_id: str, company_data: dict) -> str:
+    """Brand guidelines stage"""
+    logger.info(f"[{generation_id}] Generating brand guidelines")
+    return await _call_llm_cached("brand_guidelines", llm_service.generate_brand_guidelines, company_data)
+
+
+async def _stream_brand_guidelines(generation_id: str, company_data: dict):
+    """
+    Brand guidelines as an async iterator of text chunks, forwarded from the provider's
+    token stream. A cached document is yielded whole, and a provider that fails before
+    its first token falls back to the one-piece LLMBrandingService call. Only a
+    complete, non-empty document is cached
+    """
+    logger.info(f"[{generation_id}] Streaming brand guidelines")
+    key = llm_cache.key("brand_guidelines", company_data, GUIDELINES_SOURCE)
+    cached = await asyncio.to_thread(llm_cache.get, key)
+    if cached is not None:
+        yield cached
+        return
+
+    system, prompt = brand_guidelines_prompt(company_data)
+    chunks = []
+    start = time.perf_counter()
+    try:
+        async for chunk in llm_client.stream(prompt, system):
+            chunks.append(chunk)
+            yield chunk
+        if not chunks:
+            raise ProviderError("stream finished without any text")
+    except ProviderError as e:
+        # Text already sent cannot be taken back, so a stream cut short fails the stage uncached
+        if chunks:
+            raise
+        logger.warning(f"[{generation_id}] Guideline streaming unavailable, generating in one piece: {e}")
+        # The one-piece document comes from the split-mode prompt, so it is cached as split mode's
+        yield await _call_llm_cached("brand_guidelines", llm_service.generate_brand_guidelines, company_data)
+        return
+    llm_mode_stats.record("stream", 1, time.perf_counter() - start)
+    document = "".join(chunks)
+    if document.strip():
+        await asyncio.to_thread(llm_cache.put, key, "brand_guidelines", document)
+
+
+async def _collect_brand_guidelines(generation_id: str, company_data: dict, on_chunk: Callable[[str], None]) -> str:
+    """Brand guidelines stage that hands every streamed chunk to on_chunk as it arrives"""
+    chunks = []
+    async for chunk in _stream_brand_guidelines(generation_id, company_data):
+        on_chunk(chunk)
+        chunks.append(chunk)
+    return "".join(chunks)
+
+
+def _plan_stages(
+    generation_id: str,
+    request: BrandingRequest,
+    company_data: dict,
+    base_url: str,
+    on_logo: Optional[Callable[[LogoVariation], None]] = None,
+    on_guidelines_chunk: Optional[Callable[[str], None]] = None,
+) -> dict:
+    """
+    Map stage name to coroutine for every stage selected by the request focus.
+    With on_guidelines_chunk, brand guidelines stream from the provider token by token.
+    In fused LLM mode the tagline, palette and typography stages share one prompt
+    """
+    fused = None
+    if request.llm_mode == "fused" and request.focus == "all":
+        fused = asyncio.ensure_future(_generate_fused_sections(generation_id, request, company_data))
+
+    stages = {}
+    if request.focus in ["logo", "all"]:
+        stages["logos"] = _generate_logos(generation_id, request, company_data, base_url, on_logo)
+    if request.focus in ["tagline", "all"]:
+        stages["taglines"] = _generate_taglines(generation_id, request, company_data, fused)
+    if request.focus in ["palette", "all"]:
+        stages["color_palette"] = _generate_color_palette(generation_id, company_data, fused)
+    if request.focus in ["typography", "all"]:
+        stages["typography"] = _generate_typography(generation_id, company_data, fused)
+    if request.focus == "all":
+        if on_guidelines_chunk:
+            stages["brand_guidelines"] = _collect_brand_guidelines(generation_id, company_data, on_guidelines_chunk)
+        else:
+            stages["brand_guidelines"] = _generate_brand_guidelines(generation_id, company_data)
+    return stages
+
+
+# ==================== Branding Routes ====================
+
 @app.post(
     "/api/v1/generate-branding",
     response_model=BrandingResponse,
     tags=["Branding Generation"],
     summary="Generate complete brand identity",
 )
-async def generate_branding(request: BrandingRequest):
+async def generate_branding(request: BrandingRequest, http_request: Request):
     """
     Generate comprehensive brand identity assets for a company.
     
@@ -141,7 +599,13 @@ async def generate_branding(request: BrandingRequest):
     - Typography recommendations
     - Brand guidelines document
     
-    Returns complete branding package in ~30-60 seconds.
+    Logos are returned as base64 data URLs. With inline_images false they
+    are asset URLs (see /api/v1/assets) instead; those outlive the process
+    only when ASSET_STORE_DIR is set.
+    
+    Independent stages run concurrently, so the total time is roughly
+    that of the slowest stage. A failed stage falls back to its defaults
+    instead of failing the whole request.
     """
     if not llm_service:
         raise HTTPException(
@@ -155,188 +619,55 @@ async def generate_branding(request: BrandingRequest):
         
         logger.info(f"[{generation_id}] Starting branding generation for company {request.company_id}")
         
-        # Prepare company profile
-        if request.company_profile:
-            company_data = request.company_profile.model_dump()
-        else:
-            company_data = {
-                "name": f"Company {request.company_id}",
-                "company_type": "saas",
-                "industry": "Technology",
-                "description": "Tech company",
-                "target_audience": "Enterprise",
-                "brand_values": ["Innovation", "Quality"],
-            }
-        
-        # Generate branding assets based on focus
-        logos = []
-        taglines = []
-        color_palette = None
-        typography = None
-        brand_guidelines = ""
-        
-        if request.focus in ["logo", "all"]:
-            logger.info(f"[{generation_id}] Generating industry-aware logos with VARIATIONS")
-            logo_prompts = llm_service.generate_logo_prompts(
-                company_data, request.num_variations
-            )
-            
-            # Get industry and company type from company data
-            industry = company_data.get("industry", "Technology")
-            company_type = company_data.get("company_type", "saas")
-            company_name = company_data.get("name", "Company")
-
-            # God Mode overrides
-            gm = getattr(request, 'god_mode', None)
-            if gm and gm.prompt:
-                # Add god mode prompt into additional_context for downstream LLM-based pieces
-                company_data["additional_context"] = f"{company_data.get('additional_context','')} GOD_MODE: {gm.prompt}".strip()
-
-            # Combine industry and company_type, allow override and keyword bias (symbols/negative)
-            industry_context = f"{gm.industry_override if gm and gm.industry_override else industry} {company_type}"
-            if gm and (gm.symbols or gm.negative):
-                bias = []
-                if gm.symbols:
-                    bias.append("symbols:" + ",".join(gm.symbols))
-                if gm.negative:
-                    bias.append("avoid:" + ",".join(gm.negative))
-                industry_context = industry_context + " " + " ".join(bias)
-            
-            logger.info(f"[{generation_id}] Using PROFESSIONAL diverse logo generator for: {industry_context}")
-            
-            # Create DIFFERENT color schemes for each variation
-            color_variations = [
-                ["#2563EB", "#10B981", "#F59E0B"],  # Blue-Green-Orange
-                ["#8B5CF6", "#EC4899", "#06B6D4"],  # Purple-Pink-Cyan
-                ["#EF4444", "#F59E0B", "#10B981"],  # Red-Orange-Green
-            ]
-
-            # Apply color overrides if provided
-            if gm and gm.color_overrides and len(gm.color_overrides) >= 3:
-                ov = gm.color_overrides[:3]
-                color_variations = [ov, ov, ov]
-            
-            # Generate truly diverse professional logos
-            professional_logos = professional_logo_generator.generate_diverse_professional_logos(
-                company_name,
-                industry,
-                [color_variations[0][0], color_variations[1][0], color_variations[2][0]],  # Use first color from each palette
-                request.num_variations
-            )
-            
-            # Create logo variations with proper descriptions
-            style_descriptions = [
-                "Professional Wordmark - Typography-focused design emphasizing brand name",
-                "Custom Lettermark - Monogram-based design with distinctive lettering", 
-                "Pictorial Symbol - Icon-based design with industry-relevant imagery",
-                "Abstract Mark - Artistic geometric design with unique visual elements",
-                "Combination Logo - Balanced integration of text and symbolic elements",
-                "Professional Emblem - Badge-style design with authoritative presence"
-            ]
-            
-            for idx, logo_image in enumerate(professional_logos, 1):
-                # Get appropriate description for this logo type
-                logo_desc = style_descriptions[(idx - 1) % len(style_descriptions)]
-                
-                # Use different color scheme for each
-                variation_colors = color_variations[(idx - 1) % len(color_variations)]
-                
-                logos.append(
-                    LogoVariation(
-                        id=f"logo_{idx}",
-                        description=logo_desc,
-                        color_scheme=variation_colors,
-                        style=f"Professional {['Wordmark', 'Lettermark', 'Pictorial', 'Abstract', 'Combination', 'Emblem'][idx-1]}",
-                        prompt_used=f"Professional {logo_desc} for {company_name} in {industry}",
-                        image_url=f"data:image/png;base64,{logo_image}"
-                    )
-                )
-        
-        if request.focus in ["tagline", "all"]:
-            logger.info(f"[{generation_id}] Generating taglines")
-            tagline_data = llm_service.generate_taglines(
-                company_data, request.num_variations
-            )
-            
-            for idx, tagline in enumerate(tagline_data, 1):
-                taglines.append(
-                    TaglineVariation(
-                        id=f"tagline_{idx}",
-                        text=tagline.get("text", f"Tagline {idx}"),
-                        tone=tagline.get("tone", "professional"),
-                        explanation=tagline.get("explanation", ""),
-                    )
-                )
+        company_data = _prepare_company_data(request)
         
-        if request.focus in ["palette", "all"]:
-            logger.info(f"[{generation_id}] Generating color palette")
-            palette_data = llm_service.generate_color_palette(company_data)
-            
-            primary = palette_data.get("primary", {})
-            secondary = palette_data.get("secondary", {})
-            accent = palette_data.get("accent", {})
-            neutral = palette_data.get("neutral", {})
-            
-            color_palette = ColorPalette(
-                primary=primary.get("hex", "#2563EB"),
-                secondary=secondary.get("hex", "#10B981"),
-                accent=accent.get("hex", "#F59E0B"),
-                neutral=neutral.get("hex", "#F3F4F6"),
-                psychology={
-                    "primary": primary.get("psychology", "Trust"),
-                    "secondary": secondary.get("psychology", "Growth"),
-                    "accent": accent.get("psychology", "Energy"),
-                    "neutral": neutral.get("psychology", "Clarity"),
-                },
-                usage_guidelines=palette_data.get("usage_guidelines", ""),
-            )
-        
-        if request.focus in ["typography", "all"]:
-            logger.info(f"[{generation_id}] Generating typography")
-            typo_data = llm_service.generate_typography(company_data)
-            
-            typography = TypographyRecommendation(
-                heading_font=typo_data.get("heading_font", "Inter Bold"),
-                body_font=typo_data.get("body_font", "Inter Regular"),
-                accent_font=typo_data.get("accent_font"),
-                rationale=typo_data.get("heading_rationale", ""),
-                pairings=typo_data.get("pairings", []),
-            )
+        # Run every selected stage concurrently with per-stage error isolation
+        stages = _plan_stages(generation_id, request, company_data, str(http_request.base_url))
+        outcomes = await asyncio.gather(
+            *(_run_stage(generation_id, name, coro) for name, coro in stages.items()),
+            return_exceptions=True,
+        )
+        results = dict(zip(stages.keys(), outcomes))
         
-        if request.focus == "all":
-            logger.info(f"[{generation_id}] Generating brand guidelines")
-            brand_guidelines = llm_service.generate_brand_guidelines(company_data)
+        failed = [name for name, outcome in results.items() if isinstance(outcome, Exception)]
+        if failed and len(failed) == len(results):
+            raise results[failed[0]]
+        results = {name: outcome for name, outcome in results.items() if name not in failed}
         
         generation_time = time.time() - start_time
         
         logger.info(
             f"[{generation_id}] ✅ Branding generation completed in {generation_time:.2f}s"
+            + (f" (failed stages: {', '.join(failed)})" if failed else "")
         )
         
         return BrandingResponse(
             id=generation_id,
             company_id=request.company_id,
-            logos=logos,
-            taglines=taglines,
-            color_palette=color_palette or ColorPalette(
-                primary="#2563EB",
-                secondary="#10B981",
-                accent="#F59E0B",
-                neutral="#F3F4F6",
+            logos=results.get("logos", []),
+            taglines=results.get("taglines", []),
+            color_palette=results.get("color_palette") or ColorPalette(
+                **DEFAULT_COLOR_PALETTE,
                 psychology={},
                 usage_guidelines="",
             ),
-            typography=typography or TypographyRecommendation(
+            typography=results.get("typography") or TypographyRecommendation(
                 heading_font="Inter Bold",
                 body_font="Inter Regular",
                 rationale="",
                 pairings=[],
             ),
-            brand_guidelines=brand_guidelines,
+            brand_guidelines=results.get("brand_guidelines") or "",
             generated_at=datetime.utcnow(),
             generation_time_seconds=generation_time,
         )
     
+    except RenderQueueFullError as e:
+        logger.warning(f"Rejecting branding generation: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Logo renderer is busy, please retry shortly",
+        )
     except Exception as e:
         logger.error(f"Error generating branding: {str(e)}", exc_info=True)
         raise HTTPException(
@@ -345,6 +676,314 @@ async def generate_branding(request: BrandingRequest):
         )
 
 
+def _encode_stream_event(event: str, data, sse: bool) -> str:
+    """Serialize one stream event as an SSE frame or an NDJSON line"""
+    if hasattr(data, "model_dump"):
+        data = data.model_dump(mode="json")
+    if sse:
+        return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+    return json.dumps({"event": event, "data": data}) + "\n"
+
+
+async def _stream_branding(
+    generation_id: str, request: BrandingRequest, company_data: dict, base_url: str, sse: bool
+):
+    """Run the generation stages concurrently and yield each asset as soon as it is ready"""
+    start_time = time.time()
+    events: asyncio.Queue = asyncio.Queue()
+
+    stages = _plan_stages(
+        generation_id, request, company_data, base_url,
+        on_logo=lambda logo: events.put_nowait(("logo", logo)),
+        on_guidelines_chunk=lambda text: events.put_nowait(("guidelines_chunk", {"text": text})),
+    )
+
+    async def run(name: str, coro) -> bool:
+        try:
+            result = await _run_stage(generation_id, name, coro)
+        except Exception as e:
+            events.put_nowait(("error", {"stage": name, "detail": str(e)}))
+            return False
+        # Logos and guideline chunks are emitted as they are produced
+        if name == "taglines":
+            for tagline in result:
+                events.put_nowait(("tagline", tagline))
+        elif name in ("color_palette", "typography"):
+            events.put_nowait((name, result))
+        return True
+
+    async def run_all():
+        try:
+            return await asyncio.gather(*(run(name, coro) for name, coro in stages.items()))
+        finally:
+            events.put_nowait(None)
+
+    runner = asyncio.create_task(run_all())
+    try:
+        while True:
+            item = await events.get()
+            if item is None:
+                break
+            yield _encode_stream_event(*item, sse)
+
+        succeeded = runner.result()
+        generation_time = time.time() - start_time
+        logger.info(f"[{generation_id}] ✅ Streamed branding generation completed in {generation_time:.2f}s")
+        yield _encode_stream_event("complete", {
+            "id": generation_id,
+            "company_id": request.company_id,
+            "generated_at": datetime.utcnow().isoformat(),
+            "generation_time_seconds": generation_time,
+            "failed_stages": [name for name, ok in zip(stages, succeeded) if not ok],
+        }, sse)
+    finally:
+        # Client went away or generation finished: stop any stage still running
+        runner.cancel()
+
+
+@app.post(
+    "/api/v1/generate-branding/stream",
+    tags=["Branding Generation"],
+    summary="Stream brand identity generation",
+)
+async def generate_branding_stream(request: BrandingRequest, http_request: Request):
+    """
+    Streaming variant of generate-branding.
+    
+    Emits every asset as soon as its stage produces it instead of waiting
+    for the whole package. The body is NDJSON (one ``{"event", "data"}``
+    object per line), or Server-Sent Events when the client sends
+    ``Accept: text/event-stream``.
+    
+    Events: logo, tagline, color_palette, typography, guidelines_chunk
+    (brand guideline text forwarded as the model generates it), error
+    (a failed stage) and a final complete event with total timing.
+    """
+    if not llm_service:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="LLM service not initialized",
+        )
+
+    generation_id = str(uuid.uuid4())
+    logger.info(f"[{generation_id}] Starting streamed branding generation for company {request.company_id}")
+
+    sse = "text/event-stream" in http_request.headers.get("accept", "")
+    return StreamingResponse(
+        _stream_branding(
+            generation_id, request, _prepare_company_data(request), str(http_request.base_url), sse
+        ),
+        media_type="text/event-stream" if sse else "application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.post(
+    "/api/v1/generate-branding/logo-bundle",
+    tags=["Branding Generation"],
+    summary="Download every logo at every bundle size",
+)
+async def generate_logo_bundle(request: LogoBundleRequest):
+    """
+    Render each logo variation as a multi-size bundle and stream it as a zip.
+    
+    Every logo is laid out once and rasterized at each target size
+    (favicons, app icons, social avatar, print master), plus an SVG and a
+    multi-resolution favicon.ico. Files are zipped as they render, and a
+    manifest.json with per-file render and encode timings closes the archive.
+    """
+    unknown = [target for target in request.targets or [] if target not in BUNDLE_SIZES]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown bundle targets: {', '.join(unknown)} (choose from {', '.join(BUNDLE_SIZES)})",
+        )
+    sizes = {name: size for name, size in BUNDLE_SIZES.items() if not request.targets or name in request.targets}
+
+    generation_id = str(uuid.uuid4())
+    logger.info(f"[{generation_id}] Starting logo bundle generation for company {request.company_id}")
+    context = _logo_context(generation_id, request, _prepare_company_data(request))
+
+    # A sync iterator: Starlette renders and zips each file in a worker thread as the client reads
+    files = professional_logo_generator.generate_logo_bundles(
+        context["company_name"],
+        context["template_query"],
+        context["colors"],
+        request.num_variations,
+        context["seed"],
+        sizes,
+        request.image_profile or settings.image_encoder_profile,
+        request.image_quality,
+    )
+    return StreamingResponse(
+        stream_zip(files),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="logo-bundle-{request.company_id}.zip"'},
+    )
+
+
+# Exports streaming at once (EXPORT_MAX_CONCURRENT); the slot is freed when the stream ends
+export_limiter = ExportLimiter(settings.export_max_concurrent)
+
+
+@app.post(
+    "/api/v1/logos/export",
+    tags=["Branding Generation"],
+    summary="Export a logo as a high-resolution PNG",
+)
+async def export_logo(request: LogoExportRequest):
+    """
+    Stream one logo of a generate-branding request as a print-resolution PNG.
+    
+    Send the original request fields plus logo_index and export_size. The logo
+    is rendered in horizontal bands across the export workers at the
+    image_quality tier's supersampling (use "print" for 4x) and each band is
+    compressed into the PNG as it finishes, so memory stays bounded at any size.
+    """
+    if request.logo_index > request.num_variations:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"logo_index must be between 1 and num_variations ({request.num_variations})",
+        )
+    if request.export_size > settings.export_max_size:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"export_size must be at most {settings.export_max_size}",
+        )
+
+    generation_id = str(uuid.uuid4())
+    context = _logo_context(generation_id, request, _prepare_company_data(request))
+    index = request.logo_index - 1
+    category = professional_logo_generator.plan_categories(request.num_variations, context["seed"])[index]
+    logger.info(
+        f"[{generation_id}] Exporting logo_{request.logo_index} ({category}) at {request.export_size}px, "
+        f"{request.image_quality} quality"
+    )
+
+    # Each export holds workers + 1 band canvases, so the number streaming at once is capped
+    if not export_limiter.try_acquire():
+        logger.warning(f"[{generation_id}] Rejecting export: {settings.export_max_concurrent} already streaming")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Logo exporter is busy, please retry shortly",
+        )
+
+    # A sync iterator: Starlette renders and sends each band from a worker thread as the client reads
+    chunks = professional_logo_generator.export_logo(
+        context["company_name"],
+        context["template_query"],
+        context["colors"],
+        category,
+        index,
+        context["seed"],
+        request.export_size,
+        request.image_quality,
+        request.image_variant,
+    )
+    return StreamingResponse(
+        await export_limiter.stream(chunks),
+        media_type="image/png",
+        headers={
+            "Content-Disposition": f'attachment; filename="logo-{request.company_id}-{request.export_size}px.png"'
+        },
+    )
+
+
+@app.post(
+    "/api/v1/logos/recolor",
+    response_model=LogoVariation,
+    tags=["Branding Generation"],
+    summary="Recolor a generated logo",
+)
+async def recolor_logo(request: LogoRecolorRequest, http_request: Request):
+    """
+    Re-render one logo of a generate-branding request with new colors or a
+    dark/inverted variant.
+    
+    Send the original request fields plus logo_index and colors. At draft
+    quality the logo geometry is cached as a palette-independent role layer,
+    so after the first call each new palette is a lookup-table recolor and an
+    encode; supersampled tiers redraw, which measures faster at their sizes.
+    """
+    if request.logo_index > request.num_variations:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"logo_index must be between 1 and num_variations ({request.num_variations})",
+        )
+
+    generation_id = str(uuid.uuid4())
+    context = _logo_context(generation_id, request, _prepare_company_data(request))
+    colors = (request.colors or [])[:3] + context["colors"][len(request.colors or []):]
+    index = request.logo_index - 1
+    category = professional_logo_generator.plan_categories(request.num_variations, context["seed"])[index]
+
+    start = time.perf_counter()
+    logo_image = await asyncio.to_thread(
+        professional_logo_generator.render_logo,
+        context["company_name"],
+        context["template_query"],
+        colors,
+        category,
+        index,
+        context["seed"],
+        RenderOptions(
+            size=request.image_size,
+            profile=request.image_profile or settings.image_encoder_profile,
+            output_format=request.image_format,
+            variant=request.image_variant,
+            quality=request.image_quality,
+            trim=request.image_trim,
+        ),
+    )
+    logger.info(
+        f"[{generation_id}] Recolored logo_{request.logo_index} ({category}, {request.image_variant}) "
+        f"in {(time.perf_counter() - start) * 1000:.1f}ms"
+    )
+
+    return LogoVariation(
+        id=f"logo_{request.logo_index}",
+        description=LOGO_STYLE_DESCRIPTIONS[index % len(LOGO_STYLE_DESCRIPTIONS)],
+        color_scheme=colors,
+        style=f"Professional {LOGO_STYLE_NAMES[index % len(LOGO_STYLE_NAMES)]}",
+        prompt_used=f"Recolor of {category} logo for {context['company_name']}",
+        image_url=_asset_url(logo_image, str(http_request.base_url), request.inline_images),
+    )
+
+
+@app.get(
+    "/api/v1/assets/{asset_id}",
+    tags=["Assets"],
+    summary="Get a generated asset",
+)
+async def get_asset(asset_id: str, request: Request):
+    """
+    Serve generated asset bytes by content-addressed id (``<sha256>.<ext>``).
+    Assets never change, so responses carry a strong ETag. They are cacheable
+    forever only when the store is on disk; in-memory assets can be evicted,
+    so clients revalidate them instead.
+    """
+    etag = asset_store.etag(asset_id)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "public, max-age=31536000, immutable" if asset_store.persistent else "no-cache",
+    }
+    # The ETag is the content hash, so a matching client copy is current even if the store evicted it
+    if_none_match = [tag.strip() for tag in request.headers.get("if-none-match", "").split(",")]
+    if etag in if_none_match:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    asset = asset_store.get(asset_id)
+    if asset is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Asset {asset_id} not found",
+        )
+    if "*" in if_none_match:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    data, media_type = asset
+    return Response(content=data, media_type=media_type, headers=headers)
+
+
 @app.get(
     "/api/v1/company-types",
     tags=["Reference Data"],
@@ -5,34 +5,82 @@ Each logo uses different approaches: wordmarks, lettermarks, pictorials, abstrac
 """
 import logging
 import base64
-from io import BytesIO
-from PIL import Image, ImageDraw, ImageFont, ImageFilter, ImageOps
+from PIL import ImageFont
 import random
-import math
 import hashlib
-from typing import Dict, List, Tuple, Optional
+import time
+from typing import Callable, Dict, Iterator, List, NamedTuple, Tuple, Optional, Union
+
+from compositing import LinearGradient, RadialGradient
+from config import settings
+from drawing_surface import (
+    DESIGN_SIZE, DrawingSurface, RasterSurface, RecordingSurface, SvgSurface, new_surface,
+)
+from font_registry import font_registry
+import geometry
+from icon_atlas import IconAtlas
+from image_encoder import VECTOR_PROFILE, EncodedImage, encode_image, encoder_stats
+from logo_bundle import BUNDLE_SIZES, ICO_SIZES, BundleFile, build_ico
+from logo_cache import LogoCache, StripedLogoCache, make_cache_key
+from render_quality import DEFAULT_QUALITY, MAX_EXPORT_RENDER_SIDE, downsample, quality_tier
+from tiled_export import BandStats, ExportSummary, stream_png
+from role_layer import PROBE_PALETTE, LabelOverflowError, LabelSurface, RoleLayer, variant_palette
+from template_registry import IndustryTemplate, template_registry
+from text_layout import text_layout
 
 logger = logging.getLogger(__name__)
 
+# Bump whenever drawing or encoding changes so cached renders from older deploys are never served
+RENDERER_VERSION = "4.10"
+
+
+class RenderOptions(NamedTuple):
+    """Output settings for a single render"""
+    size: int = DESIGN_SIZE        # output canvas side in pixels
+    profile: str = "balanced"      # image encoder profile (raster output)
+    output_format: str = "raster"  # raster or svg
+    variant: str = "light"         # palette variant: light, dark or inverted
+    quality: str = DEFAULT_QUALITY # render quality tier (raster output): draft, standard or print
+    trim: bool = True              # crop raster output to its content, so it is usually smaller than size
+
+    @property
+    def encoded_profile(self) -> str:
+        """Profile recorded on the encoded output"""
+        if self.output_format == "svg":
+            return VECTOR_PROFILE
+        return quality_tier(self.quality).profile or self.profile
+
 
 class ProfessionalLogoGenerator:
     """Professional logo generator with genuine design diversity"""
 
-    def __init__(self):
+    def __init__(self, cache: Optional[Union[LogoCache, StripedLogoCache]] = None):
         """Initialize with professional design standards and multiple approaches"""
-        self.cache = {}
-        self.width = 1000
-        self.height = 1000
-        
-        # Professional logo categories - each fundamentally different
+        # Render threads share these caches, so they are striped to keep lock contention low
+        if cache is None:
+            cache = StripedLogoCache(
+                max_bytes=settings.logo_cache_max_bytes,
+                ttl_seconds=settings.logo_cache_ttl_seconds,
+                stripes=settings.logo_cache_stripes,
+                max_entry_bytes=settings.logo_cache_max_entry_bytes,
+            )
+        self.cache = cache
+        # Palette-independent role layers, so new palettes are a recolor instead of a re-render
+        self.layers = StripedLogoCache(
+            max_bytes=settings.role_layer_cache_max_bytes, stripes=settings.logo_cache_stripes,
+            max_entry_bytes=settings.logo_cache_max_entry_bytes,
+        )
+        # Industry icons are rasterized once per scale and tinted per request
+        self.icons = IconAtlas(max_entries=settings.icon_atlas_max_entries)
+        # Drawing helpers work in design units; the surface scales them to the output size
+        self.width = DESIGN_SIZE
+        self.height = DESIGN_SIZE
+        
+        # Professional logo categories - each fundamentally different (recipes live in the template registry)
         self.logo_categories = {
-            "wordmark": "Typography-focused design emphasizing the company name",
-            "lettermark": "Initials/monogram-based design with custom lettering",
-            "pictorial": "Icon-based design with symbolic imagery", 
-            "abstract": "Abstract geometric design with artistic elements",
-            "combination": "Text + icon combination in balanced composition",
-            "emblem": "Badge/crest style with enclosed design elements"
+            name: recipe.description for name, recipe in template_registry.categories.items()
         }
+        template_registry.validate(self)
         
         # Design principles for professional quality
         self.design_principles = {
@@ -50,77 +98,254 @@ class ProfessionalLogoGenerator:
         company_name: str,
         industry: str,
         colors: List[str],
-        num_variations: int = 3
+        num_variations: int = 3,
+        seed: Optional[str] = None
     ) -> List[str]:
         """
         Generate truly diverse professional logos using different design approaches
         Each variation uses a fundamentally different design category
+        Identical inputs (and seed) always produce identical logos
+        """
+        return [
+            base64.b64encode(logo.data).decode()
+            for logo in self.render_logo_set(company_name, industry, colors, num_variations, seed)
+        ]
+
+    def generate_logo_bundles(
+        self,
+        company_name: str,
+        industry: str,
+        colors: List[str],
+        num_variations: int = 3,
+        seed: Optional[str] = None,
+        sizes: Dict[str, int] = BUNDLE_SIZES,
+        profile: str = "balanced",
+        quality: str = DEFAULT_QUALITY
+    ) -> Iterator[BundleFile]:
+        """
+        Bundle mode of generate_diverse_professional_logos: every size of every
+        variation, each logo laid out once. Files are produced lazily, one at a time
+        """
+        if seed is None:
+            seed = self.derive_seed(company_name, industry, colors)
+        for i, category in enumerate(self.plan_categories(num_variations, seed)):
+            yield from self.render_logo_bundle(
+                company_name, industry, colors, category, i, seed, sizes, profile, quality,
+                prefix=f"logo_{i + 1}_{category}/",
+            )
+
+    def render_logo_bundle(
+        self, company_name: str, industry: str, colors: List[str], category: str, variation: int,
+        seed: str, sizes: Dict[str, int] = BUNDLE_SIZES, profile: str = "balanced",
+        quality: str = DEFAULT_QUALITY, prefix: str = ""
+    ) -> Iterator[BundleFile]:
+        """Lay a logo out once, then rasterize it at every size plus SVG and a multi-size .ico"""
+        tier = quality_tier(quality)
+        layout_start = time.perf_counter()
+        recording = self._draw_logo(
+            RecordingSurface, company_name, industry, self._create_professional_palette(colors, industry),
+            category, variation, seed,
+        )
+        # Frame every size on the content so icons fill their square instead of the blank canvas
+        viewport = recording.content_viewport()
+        logger.debug(
+            f"Laid out {category} logo for {company_name} in {(time.perf_counter() - layout_start) * 1000:.1f}ms"
+        )
+
+        ico_images = {}
+        for name, size in sizes.items():
+            render_start = time.perf_counter()
+            # Bundle sizes are explicit, so only the tier's supersampling applies
+            factor = tier.factor(size)
+            image = downsample(recording.replay(RasterSurface(size * factor, viewport)).image, factor)
+            render_ms = (time.perf_counter() - render_start) * 1000
+            encoded = encode_image(image, profile, trim=False)
+            encoder_stats.record(encoded)
+            if size in ICO_SIZES:
+                ico_images[size] = image
+            yield BundleFile(f"{prefix}{name}.{encoded.extension}", encoded.data, size, render_ms, encoded.encode_ms)
+
+        render_start = time.perf_counter()
+        svg = recording.replay(SvgSurface(DESIGN_SIZE, viewport))
+        render_ms = (time.perf_counter() - render_start) * 1000
+        encoded = svg.encode(VECTOR_PROFILE)
+        yield BundleFile(f"{prefix}logo.svg", encoded.data, 0, render_ms, encoded.encode_ms)
+
+        if ico_images:
+            encode_start = time.perf_counter()
+            ico = build_ico(ico_images)
+            yield BundleFile(
+                f"{prefix}favicon.ico", ico, max(ico_images), 0.0, (time.perf_counter() - encode_start) * 1000
+            )
+
+    def export_logo(
+        self, company_name: str, industry: str, colors: List[str], category: str, variation: int, seed: str,
+        size: int, quality: str = "print", variant: str = "light",
+        on_band: Optional[Callable[[BandStats], None]] = None,
+        on_done: Optional[Callable[[ExportSummary], None]] = None
+    ) -> Iterator[bytes]:
         """
+        High-resolution PNG of one logo, framed on its content like the bundle's
+        print master. Rendered in bands across the export workers and streamed as
+        PNG chunks, so memory stays bounded at any size
+        """
+        recording = self._draw_logo(
+            RecordingSurface, company_name, industry,
+            variant_palette(self._create_professional_palette(colors, industry), variant),
+            category, variation, seed,
+        )
+        factor = quality_tier(quality).factor(size, MAX_EXPORT_RENDER_SIDE)
+        yield from stream_png(
+            recording, size, recording.content_viewport(), factor,
+            workers=settings.export_workers, band_bytes=settings.export_band_bytes,
+            on_band=on_band, on_done=on_done,
+        )
+
+    def render_logo_set(
+        self,
+        company_name: str,
+        industry: str,
+        colors: List[str],
+        num_variations: int = 3,
+        seed: Optional[str] = None,
+        options: RenderOptions = RenderOptions()
+    ) -> List[EncodedImage]:
+        """Render (or fetch from cache) one encoded image per variation"""
         logos = []
+        if seed is None:
+            seed = self.derive_seed(company_name, industry, colors)
         
         # Ensure we have different categories for each variation
-        categories = list(self.logo_categories.keys())
-        random.shuffle(categories)
-        
-        # Parse colors
-        color_palette = self._create_professional_palette(colors, industry)
+        categories = self.plan_categories(num_variations, seed)
         
-        for i in range(num_variations):
-            # Use different category for each logo to ensure diversity
-            category = categories[i % len(categories)]
-            
+        for i, category in enumerate(categories):
             # Generate cache key with category to ensure different designs
-            cache_key = hashlib.md5(
-                f"{company_name}_{industry}_{category}_v{i}_{colors}".encode()
-            ).hexdigest()
+            cache_key = self.cache_key(company_name, industry, colors, category, i, seed, options)
             
-            if cache_key in self.cache:
-                logos.append(self.cache[cache_key])
-                continue
+            cached = self.cache.get(cache_key)
+            if cached is None:
+                logo = self.render_logo(company_name, industry, colors, category, i, seed, options)
+                encoder_stats.record(logo)
+                self.cache.put(cache_key, logo.data)
+            else:
+                logo = EncodedImage.from_cache(cached, options.encoded_profile)
             
-            try:
-                # Generate logo based on specific category
-                logo_b64 = self._generate_logo_by_category(
-                    company_name, industry, color_palette, category, i
-                )
-                
-                self.cache[cache_key] = logo_b64
-                logos.append(logo_b64)
-                
-                logger.info(f"Generated {category} logo for {company_name}")
-                
-            except Exception as e:
-                logger.error(f"Failed to generate {category} logo: {e}")
-                # Generate fallback
-                fallback = self._generate_category_fallback(company_name, category, color_palette)
-                logos.append(fallback)
+            logos.append(logo)
         
         return logos
 
-    def _generate_logo_by_category(
-        self, company_name: str, industry: str, colors: Dict, category: str, variation: int
+    def cache_key(
+        self, company_name: str, industry: str, colors: List[str], category: str, variation: int,
+        seed: str, options: RenderOptions
     ) -> str:
-        """Generate logo based on specific design category"""
+        """Cache key for one rendered logo"""
+        return make_cache_key(
+            RENDERER_VERSION, company_name, industry, category, variation, ",".join(colors), seed, *options
+        )
+
+    @staticmethod
+    def derive_seed(*parts) -> str:
+        """Stable seed derived from request inputs, used when the caller gives none"""
+        return hashlib.sha256("|".join(str(part) for part in parts).encode()).hexdigest()[:16]
+
+    def plan_categories(self, num_variations: int, seed: str) -> List[str]:
+        """Pick the design category for each variation, cycling through all categories"""
+        categories = list(self.logo_categories.keys())
+        random.Random(f"{seed}:categories").shuffle(categories)
+        return [categories[i % len(categories)] for i in range(num_variations)]
+
+    def render_logo(
+        self, company_name: str, industry: str, colors: List[str], category: str, variation: int,
+        seed: str, options: RenderOptions = RenderOptions()
+    ) -> EncodedImage:
+        """Render and encode a single logo, falling back to a simple design on failure"""
+        # Parse colors
+        color_palette = variant_palette(self._create_professional_palette(colors, industry), options.variant)
+        
+        if options.output_format == "svg":
+            draw = self._draw_logo(
+                lambda: new_surface(options.output_format, options.size),
+                company_name, industry, color_palette, category, variation, seed,
+            )
+            return draw.encode(options.encoded_profile)
+        
+        # Raster logos are drawn at the tier's supersampled size and reduced to the output size
+        tier = quality_tier(options.quality)
+        size = tier.output_size(options.size)
+        factor = tier.factor(size)
+        
+        # Recolor from a cached role layer when the tier gains from it and one can be built
+        if tier.recolor and self.layers.max_bytes > 0:
+            layer = self.role_layer(company_name, industry, category, variation, seed, size * factor)
+            if layer is not None:
+                return encode_image(
+                    downsample(layer.recolor(color_palette), factor), options.encoded_profile, options.trim
+                )
         
-        img = Image.new('RGBA', (self.width, self.height), (255, 255, 255, 0))
-        draw = ImageDraw.Draw(img)
+        draw = self._draw_logo(
+            lambda: RasterSurface(size * factor),
+            company_name, industry, color_palette, category, variation, seed,
+        )
+        return encode_image(downsample(draw.image, factor), options.encoded_profile, options.trim)
+
+    def role_layer(
+        self, company_name: str, industry: str, category: str, variation: int, seed: str,
+        size: int = DESIGN_SIZE
+    ) -> Optional[RoleLayer]:
+        """Palette-independent layer for one logo, or None if it has too many colors to label"""
+        key = make_cache_key(RENDERER_VERSION, "layer", company_name, industry, category, variation, seed, size)
+        layer = self.layers.get(key)
+        if layer is None:
+            try:
+                surface = self._draw_logo(
+                    lambda: LabelSurface(size), company_name, industry, PROBE_PALETTE, category, variation, seed
+                )
+                layer = surface.layer()
+                self.layers.put(key, layer, layer.nbytes)
+            except LabelOverflowError as e:
+                logger.info(f"Rendering {category} logo for {company_name} directly: {e}")
+                layer = False
+                # Remember the overflow so later palettes skip straight to direct rendering
+                self.layers.put(key, layer, 0)
+        return layer or None
+
+    def _draw_logo(
+        self, make_surface: Callable[[], DrawingSurface], company_name: str, industry: str,
+        color_palette: Dict, category: str, variation: int, seed: str
+    ) -> DrawingSurface:
+        """Draw a single logo onto a new surface, falling back to a simple design on failure"""
+        # Each render owns its RNG, so output is reproducible and independent of other renders
+        rng = random.Random(f"{seed}:{category}:{variation}")
         
-        if category == "wordmark":
-            return self._create_wordmark_logo(img, draw, company_name, colors, variation)
-        elif category == "lettermark":
-            return self._create_lettermark_logo(img, draw, company_name, colors, variation)
-        elif category == "pictorial":
-            return self._create_pictorial_logo(img, draw, company_name, industry, colors, variation)
-        elif category == "abstract":
-            return self._create_abstract_logo(img, draw, company_name, colors, variation)
-        elif category == "combination":
-            return self._create_combination_logo(img, draw, company_name, industry, colors, variation)
-        elif category == "emblem":
-            return self._create_emblem_logo(img, draw, company_name, colors, variation)
-        else:
-            return self._create_wordmark_logo(img, draw, company_name, colors, variation)
+        try:
+            # Generate logo based on specific category
+            draw = make_surface()
+            self._generate_logo_by_category(
+                draw, company_name, industry, color_palette, category, variation, rng
+            )
+            logger.info(f"Generated {category} logo for {company_name}")
+        except LabelOverflowError:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to generate {category} logo: {e}")
+            # Generate fallback on a clean surface
+            draw = make_surface()
+            self._generate_category_fallback(draw, company_name, category, color_palette)
+        
+        return draw
 
-    def _create_wordmark_logo(self, img, draw, company_name, colors, variation):
+    def _generate_logo_by_category(
+        self, draw: DrawingSurface, company_name: str, industry: str, colors: Dict, category: str,
+        variation: int, rng: random.Random
+    ):
+        """Draw logo onto the surface based on specific design category"""
+        recipe = template_registry.category(category)
+        inputs = {"template": template_registry.resolve(industry), "rng": rng}
+        getattr(self, recipe.builder)(
+            draw, company_name, colors, variation, **{name: inputs[name] for name in recipe.inputs}
+        )
+
+    def _create_wordmark_logo(self, draw, company_name, colors, variation):
         """Create typography-focused wordmark logo"""
         
         # Different typography styles for each variation
@@ -132,11 +357,12 @@ class ProfessionalLogoGenerator:
         
         style = font_styles[variation % len(font_styles)]
         
-        # Get font
-        font = self._get_best_font(style["size"])
+        # Get font, shrinking long names to fit the canvas
+        size = text_layout.fit_size(company_name, self.width * 0.8, self.height * 0.3, style["size"])
+        font = self._get_best_font(size)
         
         # Calculate text position
-        bbox = draw.textbbox((0, 0), company_name, font=font)
+        bbox = text_layout.bbox(company_name, font)
         text_width = bbox[2] - bbox[0]
         text_height = bbox[3] - bbox[1]
         
@@ -169,10 +395,8 @@ class ProfessionalLogoGenerator:
             ], fill=colors["secondary"])
             # Text on top
             draw.text((x, y), company_name, fill=colors["neutral"], font=font)
-        
-        return self._encode_image(img)
 
-    def _create_lettermark_logo(self, img, draw, company_name, colors, variation):
+    def _create_lettermark_logo(self, draw, company_name, colors, variation):
         """Create monogram/initials-based logo"""
         
         # Extract initials
@@ -193,63 +417,45 @@ class ProfessionalLogoGenerator:
         else:
             # Interlocked letters design
             self._draw_interlocked_letters(draw, initials, center_x, center_y, colors)
-        
-        return self._encode_image(img)
 
-    def _create_pictorial_logo(self, img, draw, company_name, industry, colors, variation):
+    def _create_pictorial_logo(self, draw, company_name, colors, variation, template: IndustryTemplate):
         """Create icon-based pictorial logo"""
         
         center_x, center_y = self.width // 2, self.height // 2
         
-        # Industry-specific icons with different styles
-        if "tech" in industry.lower() or "ai" in industry.lower():
-            if variation == 0:
-                self._draw_tech_circuit_icon(draw, center_x, center_y, colors)
-            elif variation == 1:
-                self._draw_digital_cube_icon(draw, center_x, center_y, colors)
-            else:
-                self._draw_network_nodes_icon(draw, center_x, center_y, colors)
-        elif "health" in industry.lower():
-            if variation == 0:
-                self._draw_medical_cross_icon(draw, center_x, center_y, colors)
-            elif variation == 1:
-                self._draw_heartbeat_icon(draw, center_x, center_y, colors)
-            else:
-                self._draw_wellness_leaf_icon(draw, center_x, center_y, colors)
-        elif "finance" in industry.lower() or "fin" in industry.lower():
-            if variation == 0:
-                self._draw_growth_chart_icon(draw, center_x, center_y, colors)
-            elif variation == 1:
-                self._draw_secure_vault_icon(draw, center_x, center_y, colors)
-            else:
-                self._draw_currency_flow_icon(draw, center_x, center_y, colors)
-        else:
-            # Generic professional icons
-            if variation == 0:
-                self._draw_professional_diamond(draw, center_x, center_y, colors)
-            elif variation == 1:
-                self._draw_building_icon(draw, center_x, center_y, colors)
-            else:
-                self._draw_arrow_growth_icon(draw, center_x, center_y, colors)
+        # Industry-specific icons with different styles, drawn from the icon atlas
+        icon_name = template.pictorial_icon(variation)
+        self.icons.draw(draw, icon_name, center_x, center_y, colors, getattr(self, icon_name))
         
         # Add company name below icon (smaller text)
-        font = self._get_best_font(60)
-        bbox = draw.textbbox((0, 0), company_name, font=font)
+        font = self._get_best_font(text_layout.fit_size(company_name, self.width * 0.9, 100, 60))
+        bbox = text_layout.bbox(company_name, font)
         text_width = bbox[2] - bbox[0]
         text_x = (self.width - text_width) // 2
         text_y = center_y + 200
         draw.text((text_x, text_y), company_name, fill=colors["primary"], font=font)
-        
-        return self._encode_image(img)
 
-    def _create_abstract_logo(self, img, draw, company_name, colors, variation):
+    def warm_icon_atlas(self, size: int = DESIGN_SIZE):
+        """Pre-render every industry icon at an output size so first requests skip the build"""
+        scale = size / DESIGN_SIZE
+        icons = {}
+        for template in template_registry.templates:
+            for name in template.pictorial_icons:
+                icons[name] = getattr(self, name)
+            icons[("simple_industry_icon", template.simple_icon)] = self._simple_industry_icon(template.simple_icon)
+            icons[("mini_icon", template.mini_icon)] = self._mini_icon(template.mini_icon)
+        for key, draw_icon in icons.items():
+            self.icons.get(key, scale, draw_icon)
+        logger.info(f"🧩 Icon atlas warmed with {len(icons)} icons at {size}px")
+
+    def _create_abstract_logo(self, draw, company_name, colors, variation, rng):
         """Create abstract artistic logo"""
         
         center_x, center_y = self.width // 2, self.height // 2
         
         if variation == 0:
             # Flowing wave abstract
-            self._draw_flowing_waves(draw, center_x, center_y, colors)
+            self._draw_flowing_waves(draw, center_x, center_y, colors, rng)
         elif variation == 1:
             # Geometric spiral
             self._draw_geometric_spiral(draw, center_x, center_y, colors)
@@ -258,16 +464,14 @@ class ProfessionalLogoGenerator:
             self._draw_crystal_structure(draw, center_x, center_y, colors)
         
         # Add minimalist company name
-        font = self._get_best_font(50)
-        bbox = draw.textbbox((0, 0), company_name, font=font)
+        font = self._get_best_font(text_layout.fit_size(company_name, self.width * 0.9, 100, 50))
+        bbox = text_layout.bbox(company_name, font)
         text_width = bbox[2] - bbox[0]
         text_x = (self.width - text_width) // 2
         text_y = center_y + 250
         draw.text((text_x, text_y), company_name, fill=colors["primary"], font=font)
-        
-        return self._encode_image(img)
 
-    def _create_combination_logo(self, img, draw, company_name, industry, colors, variation):
+    def _create_combination_logo(self, draw, company_name, colors, variation, template: IndustryTemplate):
         """Create combination of icon + text"""
         
         center_x, center_y = self.width // 2, self.height // 2
@@ -275,10 +479,10 @@ class ProfessionalLogoGenerator:
         if variation == 0:
             # Icon above text layout
             icon_y = center_y - 100
-            self._draw_simple_industry_icon(draw, center_x, icon_y, industry, colors)
+            self._draw_simple_industry_icon(draw, center_x, icon_y, template, colors)
             
-            font = self._get_best_font(80)
-            bbox = draw.textbbox((0, 0), company_name, font=font)
+            font = self._get_best_font(text_layout.fit_size(company_name, self.width * 0.9, 150, 80))
+            bbox = text_layout.bbox(company_name, font)
             text_width = bbox[2] - bbox[0]
             text_x = (self.width - text_width) // 2
             text_y = center_y + 50
@@ -287,19 +491,21 @@ class ProfessionalLogoGenerator:
         elif variation == 1:
             # Icon left, text right layout
             icon_x = center_x - 150
-            self._draw_simple_industry_icon(draw, icon_x, center_y, industry, colors)
+            self._draw_simple_industry_icon(draw, icon_x, center_y, template, colors)
             
-            font = self._get_best_font(90)
             text_x = center_x + 20
-            bbox = draw.textbbox((0, 0), company_name, font=font)
+            font = self._get_best_font(
+                text_layout.fit_size(company_name, self.width - text_x - 40, 200, 90)
+            )
+            bbox = text_layout.bbox(company_name, font)
             text_height = bbox[3] - bbox[1]
             text_y = center_y - text_height // 2
             draw.text((text_x, text_y), company_name, fill=colors["primary"], font=font)
             
         else:
             # Integrated icon within text
-            font = self._get_best_font(100)
-            bbox = draw.textbbox((0, 0), company_name, font=font)
+            font = self._get_best_font(text_layout.fit_size(company_name, self.width * 0.9, 200, 100))
+            bbox = text_layout.bbox(company_name, font)
             text_width = bbox[2] - bbox[0]
             text_height = bbox[3] - bbox[1]
             
@@ -311,33 +517,31 @@ class ProfessionalLogoGenerator:
             # Small icon integrated above first letter
             icon_x = text_x + 20
             icon_y = text_y - 40
-            self._draw_mini_icon(draw, icon_x, icon_y, industry, colors)
-        
-        return self._encode_image(img)
+            self._draw_mini_icon(draw, icon_x, icon_y, template, colors)
 
-    def _draw_mini_icon(self, draw, x, y, industry, colors):
+    def _draw_mini_icon(self, draw, x, y, template: IndustryTemplate, colors):
         """Draw small icon for combination logos"""
-        size = 30
-        if industry in ['tech', 'fintech', 'technology']:
-            # Mini circuit
-            draw.rectangle([x-size//2, y-size//2, x+size//2, y+size//2], outline=colors["accent"], width=2)
-            draw.line([x-10, y, x+10, y], fill=colors["secondary"], width=2)
-        elif industry in ['health', 'healthcare', 'medical']:
-            # Mini cross
-            draw.rectangle([x-15, y-5, x+15, y+5], fill=colors["accent"])
-            draw.rectangle([x-5, y-15, x+5, y+15], fill=colors["accent"])
-        else:
-            # Mini star
-            points = []
-            for i in range(10):
-                angle = (i * 36) * math.pi / 180
-                radius = size//2 if i % 2 == 0 else size//4
-                px = x + radius * math.cos(angle)
-                py = y + radius * math.sin(angle)
-                points.append((px, py))
-            draw.polygon(points, fill=colors["accent"])
-
-    def _create_emblem_logo(self, img, draw, company_name, colors, variation):
+        kind = template.mini_icon
+        self.icons.draw(draw, ("mini_icon", kind), x, y, colors, self._mini_icon(kind))
+
+    def _mini_icon(self, kind: str):
+        """Drawing function for one kind of mini icon"""
+        def draw_mini_icon(draw, x, y, colors):
+            size = 30
+            if kind == "tech":
+                # Mini circuit
+                draw.rectangle([x-size//2, y-size//2, x+size//2, y+size//2], outline=colors["accent"], width=2)
+                draw.line([x-10, y, x+10, y], fill=colors["secondary"], width=2)
+            elif kind == "health":
+                # Mini cross
+                draw.rectangle([x-15, y-5, x+15, y+5], fill=colors["accent"])
+                draw.rectangle([x-5, y-15, x+5, y+15], fill=colors["accent"])
+            else:
+                # Mini star
+                draw.polygon(geometry.at(geometry.star(5, size//2, size//4), x, y), fill=colors["accent"])
+        return draw_mini_icon
+
+    def _create_emblem_logo(self, draw, company_name, colors, variation):
         """Create badge/emblem style logo"""
         
         center_x, center_y = self.width // 2, self.height // 2
@@ -351,64 +555,32 @@ class ProfessionalLogoGenerator:
         else:
             # Hexagonal modern emblem
             self._draw_hexagonal_emblem(draw, center_x, center_y, company_name, colors)
-        
-        return self._encode_image(img)
 
     def _draw_hexagonal_emblem(self, draw, x, y, company_name, colors):
         """Draw hexagonal emblem with company name"""
         # Hexagon points
         radius = 150
-        hex_points = []
-        for i in range(6):
-            angle = math.radians(i * 60)
-            px = x + radius * math.cos(angle)
-            py = y + radius * math.sin(angle)
-            hex_points.append((px, py))
+        hex_points = geometry.at(geometry.regular_polygon(6, radius), x, y)
         
-        # Draw hexagon with gradient effect
-        draw.polygon(hex_points, fill=colors["primary"], outline=colors["secondary"], width=6)
+        # Draw hexagon with gradient effect, shading the primary color towards the bottom
+        hexagon = RecordingSurface()
+        hexagon.polygon(hex_points, fill=colors["primary"])
+        draw.composite(hexagon, LinearGradient(
+            (x, y - radius), (x, y + radius), colors["primary"], self._shade(colors["primary"], 0.75)
+        ))
+        draw.polygon(hex_points, outline=colors["secondary"], width=6)
         
         # Inner hexagon
         inner_radius = 120
-        inner_hex_points = []
-        for i in range(6):
-            angle = math.radians(i * 60)
-            px = x + inner_radius * math.cos(angle)
-            py = y + inner_radius * math.sin(angle)
-            inner_hex_points.append((px, py))
+        inner_hex_points = geometry.at(geometry.regular_polygon(6, inner_radius), x, y)
         
         draw.polygon(inner_hex_points, outline=colors["accent"], width=3)
         
-        # Company name in center
-        font = self._get_best_font(60)
-        if len(company_name) > 12:
-            # Split into lines for long names
-            words = company_name.split()
-            if len(words) > 1:
-                mid = len(words) // 2
-                line1 = " ".join(words[:mid])
-                line2 = " ".join(words[mid:])
-                
-                bbox1 = draw.textbbox((0, 0), line1, font=font)
-                bbox2 = draw.textbbox((0, 0), line2, font=font)
-                
-                line1_x = x - (bbox1[2] - bbox1[0]) // 2
-                line1_y = y - 20
-                line2_x = x - (bbox2[2] - bbox2[0]) // 2
-                line2_y = y + 20
-                
-                draw.text((line1_x, line1_y), line1, fill=colors["neutral"], font=font)
-                draw.text((line2_x, line2_y), line2, fill=colors["neutral"], font=font)
-            else:
-                bbox = draw.textbbox((0, 0), company_name, font=font)
-                text_x = x - (bbox[2] - bbox[0]) // 2
-                text_y = y - (bbox[3] - bbox[1]) // 2
-                draw.text((text_x, text_y), company_name, fill=colors["neutral"], font=font)
-        else:
-            bbox = draw.textbbox((0, 0), company_name, font=font)
-            text_x = x - (bbox[2] - bbox[0]) // 2
-            text_y = y - (bbox[3] - bbox[1]) // 2
-            draw.text((text_x, text_y), company_name, fill=colors["neutral"], font=font)
+        # Company name in center, wrapped and sized to fit the inner hexagon
+        block = text_layout.layout(
+            company_name, inner_radius * 1.6, inner_radius * 1.2, 60, max_lines=2
+        )
+        text_layout.draw_block(draw, block, x, y, colors["neutral"])
 
     def _draw_shield_emblem(self, draw, x, y, company_name, colors):
         """Draw shield-style emblem"""
@@ -439,7 +611,7 @@ class ProfessionalLogoGenerator:
         
         # Company name
         font = self._get_best_font(50)
-        bbox = draw.textbbox((0, 0), company_name, font=font)
+        bbox = text_layout.bbox(company_name, font)
         text_x = x - (bbox[2] - bbox[0]) // 2
         text_y = y - (bbox[3] - bbox[1]) // 2
         draw.text((text_x, text_y), company_name, fill=colors["neutral"], font=font)
@@ -457,12 +629,12 @@ class ProfessionalLogoGenerator:
         """Draw professional circular monogram"""
         radius = 180
         
-        # Outer circle with gradient effect
-        for i in range(20):
-            r = radius - i * 4
-            alpha = int(255 * (1 - i * 0.03))
-            color = (*colors["primary"][:3], alpha)
-            draw.ellipse([x-r, y-r, x+r, y+r], fill=color)
+        # Outer circle with gradient effect, fading towards the centre
+        circle = RecordingSurface()
+        circle.ellipse([x-radius, y-radius, x+radius, y+radius], fill=colors["primary"])
+        draw.composite(circle, RadialGradient(
+            (x, y), radius - 76, radius, (*colors["primary"][:3], 109), (*colors["primary"][:3], 255)
+        ))
         
         # Inner circle
         inner_radius = radius - 80
@@ -473,7 +645,7 @@ class ProfessionalLogoGenerator:
         
         # Initials
         font = self._get_best_font(120)
-        bbox = draw.textbbox((0, 0), initials, font=font)
+        bbox = text_layout.bbox(initials, font)
         text_width = bbox[2] - bbox[0]
         text_height = bbox[3] - bbox[1]
         text_x = x - text_width // 2
@@ -486,7 +658,7 @@ class ProfessionalLogoGenerator:
             font = self._get_best_font(200)
             
             # First letter
-            bbox1 = draw.textbbox((0, 0), initials[0], font=font)
+            bbox1 = text_layout.bbox(initials[0], font)
             w1, h1 = bbox1[2] - bbox1[0], bbox1[3] - bbox1[1]
             x1 = x - w1 // 2
             y1 = y - h1 - 20
@@ -494,7 +666,7 @@ class ProfessionalLogoGenerator:
             draw.text((x1, y1), initials[0], fill=colors["primary"], font=font)
             
             # Second letter
-            bbox2 = draw.textbbox((0, 0), initials[1], font=font)
+            bbox2 = text_layout.bbox(initials[1], font)
             w2, h2 = bbox2[2] - bbox2[0], bbox2[3] - bbox2[1]
             x2 = x - w2 // 2
             y2 = y + 20
@@ -513,13 +685,13 @@ class ProfessionalLogoGenerator:
             font = self._get_best_font(180)
             
             # First letter - left position
-            bbox1 = draw.textbbox((0, 0), initials[0], font=font)
+            bbox1 = text_layout.bbox(initials[0], font)
             w1, h1 = bbox1[2] - bbox1[0], bbox1[3] - bbox1[1]
             x1 = x - w1 // 3  # Overlap position
             y1 = y - h1 // 2
             
             # Second letter - right position  
-            bbox2 = draw.textbbox((0, 0), initials[1], font=font)
+            bbox2 = text_layout.bbox(initials[1], font)
             w2, h2 = bbox2[2] - bbox2[0], bbox2[3] - bbox2[1]
             x2 = x - w2 // 3  # Overlap position
             y2 = y - h2 // 2
@@ -595,29 +767,23 @@ class ProfessionalLogoGenerator:
         cross_size = 100
         cross_thickness = 30
         
-        # Shadow effect
-        shadow_offset = 6
-        draw.rectangle([
-            x - cross_size + shadow_offset, y - cross_thickness//2 + shadow_offset,
-            x + cross_size + shadow_offset, y + cross_thickness//2 + shadow_offset
-        ], fill=colors["shadow"])
-        draw.rectangle([
-            x - cross_thickness//2 + shadow_offset, y - cross_size + shadow_offset,
-            x + cross_thickness//2 + shadow_offset, y + cross_size + shadow_offset
-        ], fill=colors["shadow"])
-        
+        cross = RecordingSurface()
         # Main cross - horizontal
-        draw.rectangle([
+        cross.rectangle([
             x - cross_size, y - cross_thickness//2,
             x + cross_size, y + cross_thickness//2
         ], fill=colors["primary"])
         
         # Main cross - vertical
-        draw.rectangle([
+        cross.rectangle([
             x - cross_thickness//2, y - cross_size,
             x + cross_thickness//2, y + cross_size
         ], fill=colors["primary"])
         
+        # Soft shadow from the same shape, then the cross itself
+        draw.composite(cross, colors["shadow"], blur=3, offset=(6, 6))
+        cross.replay(draw)
+        
         # Center highlight
         center_size = 20
         draw.ellipse([
@@ -660,13 +826,11 @@ class ProfessionalLogoGenerator:
             bar_y = y + chart_height//2 - height//2
             
             # Gradient effect for bars
-            for layer in range(height//2):
-                color_intensity = 1 - (layer / (height//2))
-                bar_color = tuple(int(c * color_intensity) for c in colors["primary"][:3]) + (255,)
-                draw.rectangle([
-                    bar_x, bar_y + layer,
-                    bar_x + bar_width, bar_y + layer + 1
-                ], fill=bar_color)
+            bar = RecordingSurface()
+            bar.rectangle([bar_x, bar_y, bar_x + bar_width, bar_y + height//2], fill=colors["primary"])
+            draw.composite(bar, LinearGradient(
+                (bar_x, bar_y), (bar_x, bar_y + height//2), colors["primary"], self._shade(colors["primary"], 0)
+            ))
         
         # Trend line
         trend_points = []
@@ -749,70 +913,22 @@ class ProfessionalLogoGenerator:
             x + inner_radius, y + inner_radius
         ], fill=colors["neutral"])
         
-        # Company name in center
-        font = self._get_best_font(50)
-        
-        # Split long company names
-        if len(company_name) > 12:
-            words = company_name.split()
-            if len(words) >= 2:
-                line1 = words[0]
-                line2 = ' '.join(words[1:])
-                
-                bbox1 = draw.textbbox((0, 0), line1, font=font)
-                bbox2 = draw.textbbox((0, 0), line2, font=font)
-                
-                text1_width = bbox1[2] - bbox1[0]
-                text2_width = bbox2[2] - bbox2[0]
-                text_height = bbox1[3] - bbox1[1]
-                
-                text1_x = x - text1_width // 2
-                text1_y = y - text_height - 10
-                text2_x = x - text2_width // 2
-                text2_y = y + 10
-                
-                draw.text((text1_x, text1_y), line1, fill=colors["primary"], font=font)
-                draw.text((text2_x, text2_y), line2, fill=colors["primary"], font=font)
-            else:
-                # Single long word - use smaller font
-                small_font = self._get_best_font(35)
-                bbox = draw.textbbox((0, 0), company_name, font=small_font)
-                text_width = bbox[2] - bbox[0]
-                text_height = bbox[3] - bbox[1]
-                text_x = x - text_width // 2
-                text_y = y - text_height // 2
-                draw.text((text_x, text_y), company_name, fill=colors["primary"], font=small_font)
-        else:
-            # Regular single line
-            bbox = draw.textbbox((0, 0), company_name, font=font)
-            text_width = bbox[2] - bbox[0]
-            text_height = bbox[3] - bbox[1]
-            text_x = x - text_width // 2
-            text_y = y - text_height // 2
-            draw.text((text_x, text_y), company_name, fill=colors["primary"], font=font)
+        # Company name in center, wrapped and sized to fit the inner circle
+        block = text_layout.layout(
+            company_name, inner_radius * 1.6, inner_radius * 1.2, 50, max_lines=2
+        )
+        text_layout.draw_block(draw, block, x, y, colors["primary"])
         
         # Decorative stars around the badge
-        star_positions = []
-        for angle in range(0, 360, 45):
-            star_radius = radius + 30
-            star_x = x + star_radius * math.cos(math.radians(angle))
-            star_y = y + star_radius * math.sin(math.radians(angle))
-            star_positions.append((star_x, star_y))
+        star_positions = geometry.at(geometry.regular_polygon(8, radius + 30), x, y)
         
         for star_pos in star_positions:
             self._draw_decorative_star(draw, star_pos[0], star_pos[1], 12, colors["accent"])
 
     def _draw_decorative_star(self, draw, x, y, size, color):
         """Draw decorative star"""
-        points = []
-        for i in range(10):  # 5-pointed star with 10 points total
-            angle = (i * 36) * math.pi / 180  # 36 degrees per step
-            radius = size if i % 2 == 0 else size * 0.4
-            point_x = x + radius * math.cos(angle)
-            point_y = y + radius * math.sin(angle)
-            points.append((point_x, point_y))
-        
-        draw.polygon(points, fill=color)
+        # 5-pointed star with 10 points total
+        draw.polygon(geometry.at(geometry.star(5, size, size * 0.4), x, y), fill=color)
 
     def _draw_digital_cube_icon(self, draw, x, y, colors):
         """Draw 3D digital cube icon"""
@@ -859,7 +975,162 @@ class ProfessionalLogoGenerator:
         for node in nodes:
             draw.ellipse([node[0]-12, node[1]-12, node[0]+12, node[1]+12], fill=colors["primary"])
 
-    def _draw_flowing_waves(self, draw, x, y, colors):
+    def _draw_wellness_leaf_icon(self, draw, x, y, colors):
+        """Draw wellness leaf icon"""
+        # Leaf blade: two arcs meeting at the tip and the stem, tilted to the right
+        leaf_outline = (
+            (0, -130), (40, -105), (70, -65), (85, -20), (80, 30), (55, 75), (0, 110),
+            (-55, 75), (-80, 30), (-85, -20), (-70, -65), (-40, -105)
+        )
+        leaf_points = geometry.at(geometry.transformed(leaf_outline, 1.0, -25), x, y)
+        
+        # Soft shadow from the same shape, then the leaf itself
+        leaf = RecordingSurface()
+        leaf.polygon(leaf_points, fill=colors["primary"])
+        draw.composite(leaf, colors["shadow"], blur=3, offset=(6, 6))
+        leaf.replay(draw)
+        
+        # Midrib and veins
+        midrib = geometry.at(geometry.transformed(((0, 110), (0, -115)), 1.0, -25), x, y)
+        draw.line(midrib, fill=colors["neutral"], width=5)
+        for offset_y, length in [(-60, 45), (-15, 60), (35, 55)]:
+            for side in (-1, 1):
+                vein = ((0, offset_y + 25), (side * length, offset_y))
+                draw.line(geometry.at(geometry.transformed(vein, 1.0, -25), x, y), fill=colors["neutral"], width=3)
+        
+        # Stem below the leaf
+        stem = geometry.at(geometry.transformed(((0, 105), (-10, 160)), 1.0, -25), x, y)
+        draw.line(stem, fill=colors["secondary"], width=8)
+        
+        # Dew drop accent
+        draw.ellipse([x + 70, y - 120, x + 94, y - 96], fill=colors["accent"])
+
+    def _draw_secure_vault_icon(self, draw, x, y, colors):
+        """Draw secure vault icon"""
+        size = 130
+        
+        # Vault body with a darker frame
+        draw.rectangle([x - size, y - size, x + size, y + size], fill=colors["primary"])
+        draw.rectangle([
+            x - size + 15, y - size + 15,
+            x + size - 15, y + size - 15
+        ], fill=colors["secondary"])
+        
+        # Hinges on the left edge
+        for hinge_y in (y - size + 40, y + size - 60):
+            draw.rectangle([x - size - 10, hinge_y, x - size + 5, hinge_y + 20], fill=colors["accent"])
+        
+        # Door dial with spokes
+        dial_radius = 60
+        draw.ellipse([
+            x - dial_radius, y - dial_radius,
+            x + dial_radius, y + dial_radius
+        ], fill=colors["neutral"], outline=colors["primary"], width=6)
+        for spoke in geometry.at(geometry.regular_polygon(6, dial_radius - 12, 90), x, y):
+            draw.line([x, y, spoke[0], spoke[1]], fill=colors["primary"], width=5)
+        draw.ellipse([x - 14, y - 14, x + 14, y + 14], fill=colors["accent"])
+        
+        # Handle on the right
+        draw.rectangle([x + size - 45, y - 35, x + size - 30, y + 35], fill=colors["accent"])
+
+    def _draw_currency_flow_icon(self, draw, x, y, colors):
+        """Draw currency flow icon"""
+        radius = 110
+        
+        # Two curved arrows circling the coin, traced along a circle with a point every 10 degrees
+        circle = geometry.at(geometry.regular_polygon(36, radius), x, y)
+        for start, color in ((20, colors["secondary"]), (2, colors["accent"])):
+            arc = circle[start:start + 14] if start + 14 <= 36 else circle[start:] + circle[:start + 14 - 36]
+            for i in range(len(arc) - 1):
+                draw.line([arc[i], arc[i + 1]], fill=color, width=12)
+            # Arrowhead at the end of the arc, pointing along it
+            tip_angle = (start + 14) * 10
+            tip = circle[(start + 14) % 36]
+            head = geometry.at(geometry.transformed(((0, -22), (-20, 16), (20, 16)), 1.0, tip_angle + 180), *tip)
+            draw.polygon(head, fill=color)
+        
+        # Central coin
+        coin_radius = 70
+        draw.ellipse([
+            x - coin_radius, y - coin_radius,
+            x + coin_radius, y + coin_radius
+        ], fill=colors["primary"], outline=colors["accent"], width=5)
+        
+        # Currency mark: a vertical bar crossed by two strokes
+        draw.rectangle([x - 5, y - 45, x + 5, y + 45], fill=colors["neutral"])
+        draw.rectangle([x - 30, y - 22, x + 30, y - 12], fill=colors["neutral"])
+        draw.rectangle([x - 30, y + 12, x + 30, y + 22], fill=colors["neutral"])
+
+    def _draw_professional_diamond(self, draw, x, y, colors):
+        """Draw faceted diamond icon"""
+        width, crown, pavilion = 130, 50, 120
+        girdle = y - crown // 2
+        
+        # Crown (upper facets) and pavilion (lower point)
+        crown_points = [
+            (x - width, girdle), (x - width // 2, girdle - crown),
+            (x + width // 2, girdle - crown), (x + width, girdle)
+        ]
+        pavilion_points = [(x - width, girdle), (x + width, girdle), (x, girdle + pavilion)]
+        draw.polygon(crown_points, fill=colors["secondary"])
+        draw.polygon(pavilion_points, fill=colors["primary"])
+        
+        # Table facet on top of the crown
+        draw.polygon([
+            (x - width // 2, girdle - crown), (x + width // 2, girdle - crown),
+            (x + width // 4, girdle), (x - width // 4, girdle)
+        ], fill=colors["accent"])
+        
+        # Facet lines
+        for facet_x in (x - width // 2, x - width // 4, x + width // 4, x + width // 2):
+            draw.line([facet_x, girdle, x, girdle + pavilion], fill=colors["neutral"], width=3)
+        draw.line([x - width, girdle, x + width, girdle], fill=colors["neutral"], width=4)
+        
+        # Sparkle
+        self._draw_decorative_star(draw, x + width - 10, girdle - crown - 20, 18, colors["accent"])
+
+    def _draw_building_icon(self, draw, x, y, colors):
+        """Draw office building icon"""
+        # Towers: (left offset, width, height, color)
+        towers = [
+            (-130, 70, 160, colors["secondary"]),
+            (-50, 100, 260, colors["primary"]),
+            (60, 70, 200, colors["secondary"]),
+        ]
+        base_y = y + 130
+        
+        for offset, width, height, color in towers:
+            left = x + offset
+            draw.rectangle([left, base_y - height, left + width, base_y], fill=color)
+            
+            # Window grid
+            for row_y in range(base_y - height + 20, base_y - 30, 30):
+                for col_x in range(left + 12, left + width - 12, 22):
+                    draw.rectangle([col_x, row_y, col_x + 10, row_y + 14], fill=colors["neutral"])
+        
+        # Entrance and ground line
+        draw.rectangle([x - 15, base_y - 40, x + 15, base_y], fill=colors["accent"])
+        draw.rectangle([x - 150, base_y, x + 150, base_y + 8], fill=colors["primary"])
+
+    def _draw_arrow_growth_icon(self, draw, x, y, colors):
+        """Draw rising arrow icon"""
+        # Stepped bars beneath the arrow
+        bar_width = 40
+        for i, height in enumerate([50, 90, 130, 170]):
+            bar_x = x - 110 + i * 55
+            draw.rectangle([bar_x, y + 110 - height, bar_x + bar_width, y + 110], fill=colors["secondary"])
+        
+        # Rising arrow path
+        arrow_points = [(x - 130, y + 40), (x - 50, y - 10), (x + 10, y + 20), (x + 110, y - 90)]
+        for i in range(len(arrow_points) - 1):
+            draw.line([arrow_points[i], arrow_points[i + 1]], fill=colors["primary"], width=12)
+        for point in arrow_points[1:-1]:
+            draw.ellipse([point[0] - 6, point[1] - 6, point[0] + 6, point[1] + 6], fill=colors["primary"])
+        
+        # Arrowhead pointing along the last segment
+        draw.polygon([(x + 135, y - 115), (x + 75, y - 100), (x + 120, y - 55)], fill=colors["accent"])
+
+    def _draw_flowing_waves(self, draw, x, y, colors, rng):
         """Draw enhanced flowing wave pattern with more complexity"""
         # Create multiple wave layers with different frequencies
         wave_layers = [
@@ -869,12 +1140,10 @@ class ProfessionalLogoGenerator:
         ]
         
         for layer_idx, wave in enumerate(wave_layers):
-            wave_points = []
-            for i in range(-180, 181, 5):  # Wider range for more detail
-                angle = i * wave["frequency"]
-                wave_x = x + i * 1.2
-                wave_y = y + math.sin(angle) * wave["amplitude"] + wave["offset"]
-                wave_points.append((wave_x, wave_y))
+            # Wider range for more detail
+            wave_points = geometry.at(geometry.sine_wave(
+                -180, 181, 5, 1.2, wave["frequency"], wave["amplitude"], wave["offset"]
+            ), x, y)
             
             # Draw wave with gradient effect
             color = [colors["primary"], colors["secondary"], colors["accent"]][layer_idx]
@@ -884,19 +1153,22 @@ class ProfessionalLogoGenerator:
                 # Add baseline points to create filled shape
                 filled_points = wave_points + [(wave_points[-1][0], y + 100), (wave_points[0][0], y + 100)]
                 
-                # Draw with transparency
-                alpha_color = (*color[:3], 150)
-                draw.polygon(filled_points, fill=alpha_color)
+                # Blend over the layers below, fading out towards the baseline
+                wave_fill = RecordingSurface()
+                wave_fill.polygon(filled_points, fill=color)
+                crest = y + wave["offset"] - wave["amplitude"]
+                draw.composite(wave_fill, LinearGradient(
+                    (x, crest), (x, y + 100), (*color[:3], 150), (*color[:3], 0)
+                ))
                 
                 # Draw wave outline
-                for i in range(len(wave_points) - 1):
-                    draw.line([wave_points[i], wave_points[i+1]], fill=color, width=4)
+                draw.line(wave_points, fill=color, width=4)
         
         # Add decorative flow particles
         for i in range(15):
-            particle_x = x + random.randint(-200, 200)
-            particle_y = y + random.randint(-100, 100)
-            particle_size = random.randint(3, 8)
+            particle_x = x + rng.randint(-200, 200)
+            particle_y = y + rng.randint(-100, 100)
+            particle_size = rng.randint(3, 8)
             draw.ellipse([
                 particle_x - particle_size, particle_y - particle_size,
                 particle_x + particle_size, particle_y + particle_size
@@ -904,22 +1176,11 @@ class ProfessionalLogoGenerator:
 
     def _draw_geometric_spiral(self, draw, x, y, colors):
         """Draw enhanced geometric spiral with mathematical precision"""
-        angle = 0
-        radius = 5
-        points = []
-        
-        # Golden ratio spiral
-        golden_ratio = 1.618
+        # 12 degree steps for a smooth curve, growing 5% per step
+        points = geometry.at(geometry.spiral(5, 180, 1.05, 12), x, y)
         
-        while radius < 180:
-            spiral_x = x + radius * math.cos(math.radians(angle))
-            spiral_y = y + radius * math.sin(math.radians(angle))
-            points.append((spiral_x, spiral_y))
-            
-            angle += 12  # Finer steps for smoother curve
-            radius *= 1.05  # Growth factor
-        
-        # Draw spiral segments with varying properties
+        # Spiral segments with varying properties
+        segment_styles = []
         for i in range(len(points) - 1):
             # Varying thickness and color intensity
             progress = i / len(points)
@@ -932,16 +1193,20 @@ class ProfessionalLogoGenerator:
                 color = colors["secondary"] 
             else:
                 color = colors["accent"]
-            
-            draw.line([points[i], points[i+1]], fill=color, width=thickness)
+            segment_styles.append((color, thickness))
+        
+        # One polyline per run of segments sharing a style
+        for (color, thickness), first, last in geometry.runs(segment_styles):
+            draw.line(points[first:last + 2], fill=color, width=thickness)
         
         # Add geometric construction lines
         construction_points = points[::len(points)//6]  # Select key points
         for i, point in enumerate(construction_points):
             # Draw lines to center with decreasing opacity
             alpha = max(50, 200 - i * 30)
-            construction_color = (*colors["secondary"][:3], alpha)
-            draw.line([point, (x, y)], fill=construction_color, width=1)
+            construction_line = RecordingSurface()
+            construction_line.line([point, (x, y)], fill=colors["secondary"], width=1)
+            draw.composite(construction_line, colors["secondary"], opacity=alpha / 255)
             
             # Mark key points
             draw.ellipse([
@@ -961,41 +1226,26 @@ class ProfessionalLogoGenerator:
             {"scale": 0.4, "rotation": 60, "color": colors["accent"]}
         ]
         
-        base_points = [
+        base_points = (
             (0, -120), (100, -60), (80, 40), (0, 120), (-80, 40), (-100, -60)
-        ]
+        )
         
         for layer in crystal_layers:
-            # Apply transformations
-            layer_points = []
-            for px, py in base_points:
-                # Scale
-                px *= layer["scale"]
-                py *= layer["scale"]
-                
-                # Rotate
-                angle = math.radians(layer["rotation"])
-                rotated_x = px * math.cos(angle) - py * math.sin(angle)
-                rotated_y = px * math.sin(angle) + py * math.cos(angle)
-                
-                # Translate to position
-                layer_points.append((x + rotated_x, y + rotated_y))
+            # Scale and rotate, then translate to position
+            layer_points = geometry.at(
+                geometry.transformed(base_points, layer["scale"], layer["rotation"]), x, y
+            )
             
-            # Draw crystal outline with thickness
-            for i in range(len(layer_points)):
-                next_i = (i + 1) % len(layer_points)
-                draw.line([
-                    layer_points[i], 
-                    layer_points[next_i]
-                ], fill=layer["color"], width=6)
+            # Draw crystal outline with thickness as one closed polyline
+            draw.line(layer_points + layer_points[:1], fill=layer["color"], width=6)
             
-            # Fill alternate facets
+            # Fill alternate facets, translucent over the outline beneath
             center = (x, y)
+            facets = RecordingSurface()
             for i in range(0, len(layer_points), 2):
                 if i + 1 < len(layer_points):
-                    triangle = [layer_points[i], center, layer_points[i+1]]
-                    alpha_color = (*layer["color"][:3], 100)
-                    draw.polygon(triangle, fill=alpha_color)
+                    facets.polygon([layer_points[i], center, layer_points[i+1]], fill=layer["color"])
+            draw.composite(facets, layer["color"], opacity=100 / 255)
             
             # Add internal structure lines
             for point in layer_points:
@@ -1011,49 +1261,40 @@ class ProfessionalLogoGenerator:
                 point[0] + 6, point[1] + 6
             ], fill=colors["neutral"])
 
-    def _draw_simple_industry_icon(self, draw, x, y, industry, colors):
+    def _draw_simple_industry_icon(self, draw, x, y, template: IndustryTemplate, colors):
         """Draw simple industry-appropriate icon"""
-        size = 60
-        
-        if "tech" in industry.lower():
-            # Simple gear
-            self._draw_simple_gear(draw, x, y, size, colors["accent"])
-        elif "health" in industry.lower():
-            # Simple cross
-            draw.rectangle([x-size//4, y-size, x+size//4, y+size], fill=colors["accent"])
-            draw.rectangle([x-size, y-size//4, x+size, y+size//4], fill=colors["accent"])
-        elif "finance" in industry.lower():
-            # Simple arrow up
-            arrow_points = [(x, y-size), (x+size//2, y), (x-size//2, y)]
-            draw.polygon(arrow_points, fill=colors["accent"])
-        else:
-            # Generic diamond
-            diamond_points = [(x, y-size), (x+size, y), (x, y+size), (x-size, y)]
-            draw.polygon(diamond_points, fill=colors["accent"])
+        kind = template.simple_icon
+        self.icons.draw(draw, ("simple_industry_icon", kind), x, y, colors, self._simple_industry_icon(kind))
+
+    def _simple_industry_icon(self, kind: str):
+        """Drawing function for one kind of simple industry icon"""
+        def draw_simple_industry_icon(draw, x, y, colors):
+            size = 60
+            
+            if kind == "tech":
+                # Simple gear
+                self._draw_simple_gear(draw, x, y, size, colors["accent"])
+            elif kind == "health":
+                # Simple cross
+                draw.rectangle([x-size//4, y-size, x+size//4, y+size], fill=colors["accent"])
+                draw.rectangle([x-size, y-size//4, x+size, y+size//4], fill=colors["accent"])
+            elif kind == "finance":
+                # Simple arrow up
+                arrow_points = [(x, y-size), (x+size//2, y), (x-size//2, y)]
+                draw.polygon(arrow_points, fill=colors["accent"])
+            else:
+                # Generic diamond
+                diamond_points = [(x, y-size), (x+size, y), (x, y+size), (x-size, y)]
+                draw.polygon(diamond_points, fill=colors["accent"])
+        return draw_simple_industry_icon
 
     def _draw_simple_gear(self, draw, x, y, size, color):
         """Draw simple gear icon"""
-        # Outer gear teeth
+        # Outer gear teeth around a center hole, as one polygon so every surface leaves the hole open
         teeth = 8
-        outer_radius = size
-        inner_radius = size * 0.7
-        
-        points = []
-        for i in range(teeth * 2):
-            angle = (i * 180 / teeth) * math.pi / 180
-            radius = outer_radius if i % 2 == 0 else inner_radius
-            px = x + radius * math.cos(angle)
-            py = y + radius * math.sin(angle)
-            points.append((px, py))
-        
-        draw.polygon(points, fill=color)
-        
-        # Center hole
         center_radius = size * 0.3
-        draw.ellipse([
-            x - center_radius, y - center_radius,
-            x + center_radius, y + center_radius
-        ], fill=(255, 255, 255, 0))
+        gear = geometry.with_hole(geometry.star(teeth, size, size * 0.7), geometry.regular_polygon(32, center_radius))
+        draw.polygon(geometry.at(gear, x, y), fill=color)
 
     def _draw_shield_emblem(self, draw, x, y, company_name, colors):
         """Draw shield emblem with company name"""
@@ -1076,14 +1317,11 @@ class ProfessionalLogoGenerator:
         inner_points = [(px + (x-px)*0.15, py + (y-py)*0.15) for px, py in shield_points]
         draw.polygon(inner_points, fill=colors["secondary"])
         
-        # Company name in center
-        font = self._get_best_font(40)
-        bbox = draw.textbbox((0, 0), company_name, font=font)
-        text_width = bbox[2] - bbox[0]
-        text_height = bbox[3] - bbox[1]
-        text_x = x - text_width // 2
-        text_y = y - text_height // 2
-        draw.text((text_x, text_y), company_name, fill=colors["neutral"], font=font)
+        # Company name in center, wrapped and sized to fit the inner shield
+        block = text_layout.layout(
+            company_name, shield_width * 0.75, shield_height * 0.4, 40, max_lines=2
+        )
+        text_layout.draw_block(draw, block, x, y, colors["neutral"])
 
     def _create_professional_palette(self, input_colors: List[str], industry: str) -> Dict:
         """Create professional color palette with proper contrast"""
@@ -1125,52 +1363,40 @@ class ProfessionalLogoGenerator:
             return (37, 99, 235, 255)  # Default blue
 
     def _get_best_font(self, size: int) -> ImageFont.FreeTypeFont:
-        """Get best available font"""
-        font_names = ["arial.ttf", "calibri.ttf", "tahoma.ttf"]
-        
-        for font_name in font_names:
-            try:
-                return ImageFont.truetype(font_name, size)
-            except:
-                continue
-        
-        return ImageFont.load_default()
+        """Get best available font (memoized by the font registry)"""
+        return font_registry.get(size)
 
     def _draw_text_with_shadow(self, draw, text, x, y, font, text_color, shadow_color):
         """Draw text with professional shadow effect"""
-        # Shadow
-        for offset in range(6, 0, -1):
-            alpha = int(shadow_color[3] * (offset / 6))
-            shadow = (*shadow_color[:3], alpha)
-            draw.text((x + offset, y + offset), text, fill=shadow, font=font)
+        text_shape = RecordingSurface()
+        text_shape.text((x, y), text, fill=text_color, font=font)
+        # Shadow: the same glyphs, offset and blurred
+        draw.composite(text_shape, shadow_color, blur=2, offset=(4, 4))
         
         # Main text
-        draw.text((x, y), text, fill=text_color, font=font)
+        text_shape.replay(draw)
 
-    def _encode_image(self, img: Image.Image) -> str:
-        """Encode image to base64"""
-        buffered = BytesIO()
-        img.save(buffered, format="PNG", optimize=True)
-        return base64.b64encode(buffered.getvalue()).decode()
+    @staticmethod
+    def _shade(color: Tuple[int, int, int, int], factor: float) -> Tuple[int, int, int, int]:
+        """Color darkened to factor of its brightness, alpha kept"""
+        return tuple(int(c * factor) for c in color[:3]) + (color[3],)
 
-    def _generate_category_fallback(self, company_name: str, category: str, colors: Dict) -> str:
-        """Generate fallback for specific category"""
-        img = Image.new('RGBA', (self.width, self.height), (255, 255, 255, 0))
-        draw = ImageDraw.Draw(img)
-        
+    def _generate_category_fallback(
+        self, draw: DrawingSurface, company_name: str, category: str, colors: Dict
+    ):
+        """Draw fallback for specific category"""
         # Simple fallback based on category
         if category == "wordmark":
-            return self._create_wordmark_logo(img, draw, company_name, colors, 0)
+            self._create_wordmark_logo(draw, company_name, colors, 0)
         else:
             # Simple text fallback
-            font = self._get_best_font(80)
-            bbox = draw.textbbox((0, 0), company_name, font=font)
+            font = self._get_best_font(text_layout.fit_size(company_name, self.width * 0.9, 200, 80))
+            bbox = text_layout.bbox(company_name, font)
             text_width = bbox[2] - bbox[0]
             text_height = bbox[3] - bbox[1]
             x = (self.width - text_width) // 2
             y = (self.height - text_height) // 2
             draw.text((x, y), company_name, fill=colors["primary"], font=font)
-            return self._encode_image(img)
 
 
 # Global professional generator instance
@@ -0,0 +1,60 @@
+"""
+Render Quality - Draft, standard and print tiers for raster logos
+Pillow draws shape edges aliased, so smooth curves come from drawing at a
+multiple of the output size and box-reducing the result. Each tier fixes that
+factor, an optional encoder profile and a latency target that
+`python benchmark.py quality` checks.
+"""
+from typing import Dict, NamedTuple, Optional
+
+from PIL import Image
+
+DEFAULT_QUALITY = "standard"
+
+# Largest canvas side drawn in one piece; supersample factors are lowered to fit
+MAX_RENDER_SIDE = 4096
+
+# Largest supersampled side of a banded export; bands bound the canvas, but text runs
+# are rasterized whole and grow with the square of this
+MAX_EXPORT_RENDER_SIDE = 16384
+
+
+class QualityTier(NamedTuple):
+    """How a raster logo is drawn and encoded"""
+    name: str
+    supersample: int          # drawn at this multiple of the output side, then reduced
+    max_size: int             # output side cap in pixels (0 keeps the requested size)
+    profile: Optional[str]    # encoder profile override (None keeps the requested one)
+    target_ms: float          # p95 budget for an uncached 1000px request, encode included
+    recolor: bool             # new palettes reuse a cached role layer instead of redrawing
+
+    def output_size(self, size: int) -> int:
+        """Side of the image the tier returns for a requested side"""
+        return min(size, self.max_size) if self.max_size else size
+
+    def factor(self, size: int, max_side: int = MAX_RENDER_SIDE) -> int:
+        """Supersample factor for an output side, capped so the supersampled side fits max_side"""
+        return max(1, min(self.supersample, max_side // max(1, size)))
+
+
+QUALITY_TIERS: Dict[str, QualityTier] = {
+    # Live previews: small, aliased, fastest encoder
+    "draft": QualityTier("draft", 1, 512, "fast", 30.0, True),
+    # Default: 2x supersampled edges at a few times the draft cost. Recoloring a supersampled
+    # layer (lookup, overlay pastes, reduce) measures slower than drawing, so it redraws
+    "standard": QualityTier("standard", 2, 0, None, 150.0, False),
+    # Exports: 4x supersampled; never use this on an interactive path
+    "print": QualityTier("print", 4, 0, None, 600.0, False),
+}
+
+
+def quality_tier(name: str) -> QualityTier:
+    """Tier by name (unknown names raise ValueError)"""
+    if name not in QUALITY_TIERS:
+        raise ValueError(f"Unknown render quality '{name}' (choose from {', '.join(QUALITY_TIERS)})")
+    return QUALITY_TIERS[name]
+
+
+def downsample(image: Image.Image, factor: int) -> Image.Image:
+    """Box-reduce a supersampled image (Pillow premultiplies alpha, so edges do not fringe)"""
+    return image if factor == 1 else image.reduce(factor)
@@ -0,0 +1,252 @@
+"""
+Role Layer - Palette-independent rasterization and lookup-table recoloring
+Drawing with probe colors records, per pixel, which palette role (primary,
+secondary, accent, neutral, shadow, text) painted it. The resulting label
+maps can be resolved against any palette with a single lookup table, so new
+palettes and dark or inverted variants never re-run the drawing code.
+"""
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from PIL import Image, ImageDraw
+
+from drawing_surface import DrawingSurface, RasterCanvas, Viewport
+from font_registry import font_registry
+
+# Probe colors: each role paints along its own channel pattern, so any color a helper
+# derives from a role (scaled brightness, replaced alpha) can be traced back to it
+PROBE_LEVEL = 250
+ROLE_PATTERNS = {
+    "primary": (1, 0, 0),
+    "secondary": (0, 1, 0),
+    "accent": (0, 0, 1),
+    "neutral": (1, 1, 0),
+    "shadow": (1, 0, 1),
+    "text": (0, 1, 1),
+}
+# Role alphas are the same in every palette, so probes carry them and any alpha a
+# helper derives from a role (a fading shadow) is already the final one
+ROLE_ALPHAS = {"shadow": 180}
+PROBE_PALETTE = {
+    role: tuple(PROBE_LEVEL * channel for channel in pattern) + (ROLE_ALPHAS.get(role, 255),)
+    for role, pattern in ROLE_PATTERNS.items()
+}
+_PATTERN_ROLES = {pattern: role for role, pattern in ROLE_PATTERNS.items()}
+
+# Label 0 is never painted and resolves to the transparent canvas color
+BACKGROUND = (255, 255, 255, 0)
+
+# Drawings with more distinct colors than an 8-bit label map holds are drawn directly
+MAX_LABELS = 255
+
+# Palette variants derived from a resolved palette
+DARK_NEUTRAL = (15, 23, 42, 255)
+DARK_TEXT = (248, 250, 252, 255)
+VARIANTS = ("light", "dark", "inverted")
+
+
+class LabelOverflowError(ValueError):
+    """The drawing uses more colors than fit in a label map"""
+
+
+class ColorLabel(NamedTuple):
+    """How to resolve one label: a role scaled by factor, or a literal color"""
+    role: Optional[str]
+    factor: float
+    alpha: int
+    literal: Optional[Tuple[int, int, int, int]]
+
+
+class MaskOverlay(NamedTuple):
+    """Text or a composited effect kept apart from the label map, since it blends with what is beneath"""
+    label: int
+    offset: Tuple[int, int]       # top-left of the mask on the canvas, in pixels
+    mask: Image.Image             # "L" coverage the label's color is pasted through
+
+
+class RoleLayer(NamedTuple):
+    """A drawing captured as role labels, ready to be recolored"""
+    labels: Image.Image           # "L" label of the shape painted last per pixel; 0 is untouched
+    overlays: List[MaskOverlay]   # text and effects in drawing order, pasted over the labels
+    palette: List[ColorLabel]     # palette[label - 1]
+
+    @property
+    def nbytes(self) -> int:
+        width, height = self.labels.size
+        return width * height + sum(w * h for w, h in (overlay.mask.size for overlay in self.overlays))
+
+    def recolor(self, colors: Dict) -> Image.Image:
+        """Resolve the layer against a palette into an RGBA image"""
+        lut = palette_bytes(self.palette, colors)
+        image = _apply_lut(self.labels, lut)
+        paste_overlays(image, self.overlays, lut)
+        return image
+
+
+def classify_color(color) -> ColorLabel:
+    """Trace a color drawn with the probe palette back to its role"""
+    if len(color) == 3:
+        color = (*color, 255)
+    r, g, b, a = color
+    pattern = tuple(1 if channel else 0 for channel in (r, g, b))
+    role = _PATTERN_ROLES.get(pattern)
+    level = max(r, g, b)
+    # Role colors keep equal values on their channels; anything else is a fixed color
+    if role and all(channel == level for channel, on in zip((r, g, b), pattern) if on):
+        return ColorLabel(role, level / PROBE_LEVEL, a, None)
+    return ColorLabel(None, 1.0, a, tuple(color))
+
+
+def palette_bytes(palette: List[ColorLabel], colors: Dict) -> bytes:
+    """RGBA lookup table resolving each label against the requested colors"""
+    lut = [BACKGROUND]
+    for label in palette:
+        if label.literal is not None:
+            lut.append(label.literal)
+            continue
+        base = colors[label.role]
+        rgb = tuple(int(channel * label.factor) for channel in base[:3])
+        lut.append(rgb + (label.alpha,))
+    return bytes(value for color in lut for value in color)
+
+
+def variant_palette(colors: Dict, variant: str = "light") -> Dict:
+    """Palette for a display variant: light (as given), dark or inverted"""
+    if variant == "dark":
+        # Lift brand colors a quarter of the way to white so they hold up on a dark ground
+        dark = {
+            role: tuple(int(c + (255 - c) * 0.25) for c in color[:3]) + (color[3],)
+            for role, color in colors.items()
+        }
+        dark.update(neutral=DARK_NEUTRAL, text=DARK_TEXT, shadow=(0, 0, 0, colors["shadow"][3]))
+        return dark
+    if variant == "inverted":
+        return {role: tuple(255 - c for c in color[:3]) + (color[3],) for role, color in colors.items()}
+    return colors
+
+
+def paste_overlays(
+    image: Image.Image, overlays: List[MaskOverlay], lut: bytes, origin: Tuple[int, int] = (0, 0)
+):
+    """Paste each overlay's resolved color through its mask, in drawing order"""
+    for overlay in overlays:
+        # Pasting a color through a mask blends exactly like ImageDraw.text and composite() do
+        image.paste(
+            tuple(lut[overlay.label * 4:overlay.label * 4 + 4]),
+            (origin[0] + overlay.offset[0], origin[1] + overlay.offset[1]),
+            overlay.mask,
+        )
+
+
+def _apply_lut(labels: Image.Image, lut: bytes) -> Image.Image:
+    image = labels.copy()
+    image.putpalette(lut, "RGBA")
+    return image.convert("RGBA")
+
+
+class _LabelDraw:
+    """ImageDraw stand-in that paints labels for shapes (text is recorded as overlays by LabelSurface)"""
+
+    def __init__(self, surface: "LabelSurface"):
+        self._surface = surface
+        self._labels = ImageDraw.Draw(surface.image)
+
+    def rectangle(self, xy, fill=None, outline=None, width=1):
+        self._shape("rectangle", xy, fill, outline, width)
+
+    def ellipse(self, xy, fill=None, outline=None, width=1):
+        self._shape("ellipse", xy, fill, outline, width)
+
+    def polygon(self, xy, fill=None, outline=None, width=1):
+        self._shape("polygon", xy, fill, outline, width)
+
+    def line(self, xy, fill=None, width=0):
+        self._labels.line(xy, fill=self._surface.label(fill), width=width)
+        for overlay in self._surface.overlays:
+            ImageDraw.Draw(overlay.mask).line(_translate(xy, overlay.offset), fill=0, width=width)
+
+    def _shape(self, method: str, xy, fill, outline, width):
+        surface = self._surface
+        getattr(self._labels, method)(xy, fill=surface.label(fill), outline=surface.label(outline), width=width)
+        # Shapes replace pixels outright, so they cut through any text drawn before them
+        for overlay in surface.overlays:
+            getattr(ImageDraw.Draw(overlay.mask), method)(
+                _translate(xy, overlay.offset),
+                fill=None if fill is None else 0,
+                outline=None if outline is None else 0,
+                width=width,
+            )
+
+
+def _translate(xy, offset: Tuple[int, int]) -> list:
+    """
+    Shift pixel coordinates (a flat box or a point list) by -offset. Pillow truncates
+    coordinates to whole pixels, so they are truncated before the shift to cut the same
+    pixels the shape paints on the canvas
+    """
+    dx, dy = offset
+    if xy and isinstance(xy[0], (tuple, list)):
+        return [(int(x) - dx, int(y) - dy) for x, y in xy]
+    return [int(value) - (dx if i % 2 == 0 else dy) for i, value in enumerate(xy)]
+
+
+class LabelSurface(RasterCanvas):
+    """Raster surface that paints role labels instead of colors"""
+
+    def __init__(self, size: int, viewport: Viewport = Viewport()):
+        DrawingSurface.__init__(self, size, viewport)
+        self.image = Image.new("L", (size, size), 0)
+        self.text_masks = {}
+        self.overlays: List[MaskOverlay] = []
+        self._labels: Dict[Tuple, int] = {}
+        self._draw = _LabelDraw(self)
+
+    @property
+    def palette(self) -> List[ColorLabel]:
+        return [classify_color(color) for color in self._labels]
+
+    def label(self, color) -> Optional[int]:
+        """Label index for a drawn color, allocating a new one on first use"""
+        if color is None:
+            return None
+        color = tuple(color)
+        label = self._labels.get(color)
+        if label is None:
+            if len(self._labels) >= MAX_LABELS:
+                raise LabelOverflowError(f"More than {MAX_LABELS} colors in one drawing")
+            label = self._labels[color] = len(self._labels) + 1
+        return label
+
+    def layer(self) -> RoleLayer:
+        """Everything drawn so far as a recolorable layer"""
+        return RoleLayer(self.image, self.overlays, self.palette)
+
+    def text(self, xy, text, fill=None, font=None):
+        # Rasterized like text on a windowed canvas, whose masks match ImageDraw.text exactly;
+        # a box from textbbox clips antialiased rows at fractional positions
+        font = font_registry.scaled(font, self.scale) if font else None
+        mask, offset = self._text_mask(xy, text, font)
+        # Later shapes cut into overlay masks, so each overlay owns its copy
+        self._paste_mask(fill, offset, mask.copy())
+
+    def paste_labels(
+        self, labels: Image.Image, colors: List[tuple], origin: Tuple[int, int], mask: Image.Image,
+        overlays: List[MaskOverlay]
+    ):
+        """
+        Paste a label map rasterized elsewhere (an atlas icon) whose label i was drawn in
+        colors[i - 1], so the layer holds the same pixels a direct render pastes
+        """
+        mapping = [0] + [self.label(color) for color in colors]
+        relabelled = labels.point(mapping + [0] * (256 - len(mapping)))
+        # Like a shape, the pasted labels replace any text beneath them
+        for overlay in self.overlays:
+            overlay.mask.paste(0, (origin[0] - overlay.offset[0], origin[1] - overlay.offset[1]), mask)
+        self.image.paste(relabelled, origin, mask)
+        for overlay in overlays:
+            self.overlays.append(MaskOverlay(
+                mapping[overlay.label], (origin[0] + overlay.offset[0], origin[1] + overlay.offset[1]),
+                overlay.mask.copy(),
+            ))
+
+    def _paste_mask(self, color, origin: Tuple[int, int], mask: Image.Image):
+        self.overlays.append(MaskOverlay(self.label(color), origin, mask))
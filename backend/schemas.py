@@ -72,6 +72,17 @@ class BrandingRequest(BaseModel):
         pattern="^(logo|tagline|palette|typography|all)$"
     )
     god_mode: Optional[GodModeOptions] = None
+    inline_images: bool = True  # base64 data URLs; False returns /api/v1/assets URLs (durable only with ASSET_STORE_DIR)
+    image_profile: Optional[str] = Field(
+        default=None,
+        pattern="^(fast|balanced|small|webp)$"
+    )  # encoder profile; defaults to IMAGE_ENCODER_PROFILE
+    image_size: int = Field(default=1000, ge=16, le=2048)  # logo canvas side in pixels
+    image_trim: bool = True  # crop raster logos to their content plus a small margin, so they come back smaller than image_size; False keeps the full square
+    image_format: str = Field(default="raster", pattern="^(raster|svg)$")  # raster uses image_profile; svg is resolution-independent
+    image_variant: str = Field(default="light", pattern="^(light|dark|inverted)$")  # palette variant applied to logos
+    image_quality: str = Field(default="standard", pattern="^(draft|standard|print)$")  # raster tier: draft previews, standard 2x, print 4x supersampled
+    llm_mode: str = Field(default="split", pattern="^(split|fused)$")  # fused asks for taglines, palette and typography in one JSON prompt (focus "all")
 
     class Config:
         json_schema_extra = {
@@ -92,6 +103,23 @@ class BrandingRequest(BaseModel):
         }
 
 
+class LogoBundleRequest(BrandingRequest):
+    """Request a multi-size logo bundle (zip) for each logo variation"""
+    targets: Optional[List[str]] = None  # bundle target names (favicon-16 ... print-master); all when omitted
+
+
+class LogoRecolorRequest(BrandingRequest):
+    """Re-render one generated logo with new colors (same geometry)"""
+    logo_index: int = Field(default=1, ge=1, le=10)  # 1-based, as in logo_<n> ids
+    colors: Optional[List[str]] = None                # up to 3 hex colors; defaults to the generated scheme
+
+
+class LogoExportRequest(BrandingRequest):
+    """Export one generated logo as a high-resolution PNG"""
+    logo_index: int = Field(default=1, ge=1, le=10)           # 1-based, as in logo_<n> ids
+    export_size: int = Field(default=4096, ge=256, le=16384)  # PNG side in pixels, up to EXPORT_MAX_SIZE
+
+
 class LogoVariation(BaseModel):
     """Single logo variation"""
     id: str
@@ -0,0 +1,151 @@
+"""
+Template Registry - Data-driven logo recipes and industry matching
+Category recipes and per-industry icon choices are declared in a JSON file
+(logo_templates.json by default) and loaded once. Free-text industries and
+company types resolve to ranked templates through a precompiled token index.
+"""
+import json
+import logging
+import os
+import re
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TEMPLATES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "logo_templates.json")
+
+# Distinct industry strings seen by one process; each resolves once
+MATCH_CACHE_SIZE = 4096
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+class CategoryRecipe(NamedTuple):
+    """How to draw one logo category"""
+    name: str
+    description: str
+    builder: str                  # generator method drawing the category
+    inputs: Tuple[str, ...]       # extra builder arguments ("template", "rng")
+
+
+class IndustryTemplate(NamedTuple):
+    """Icon choices for one industry"""
+    name: str
+    pictorial_icons: Tuple[str, ...]  # generator methods, one per variation
+    simple_icon: str                  # combination icon kind
+    mini_icon: str                    # inline mini icon kind
+
+    def pictorial_icon(self, variation: int) -> str:
+        return self.pictorial_icons[min(variation, len(self.pictorial_icons) - 1)]
+
+
+class TemplateMatch(NamedTuple):
+    """A template and how strongly an industry string matched it"""
+    template: IndustryTemplate
+    score: float
+
+
+class TemplateRegistry:
+    """Logo category recipes and industry templates with an indexed matcher"""
+
+    def __init__(self, data: Dict):
+        self.version = data.get("version", 1)
+        self.categories: Dict[str, CategoryRecipe] = {
+            name: CategoryRecipe(name, recipe["description"], recipe["builder"], tuple(recipe.get("inputs", ())))
+            for name, recipe in data["categories"].items()
+        }
+        self.templates: List[IndustryTemplate] = []
+        self.default: Optional[IndustryTemplate] = None
+        self._synonyms: Dict[str, str] = {
+            word.lower(): canonical.lower() for word, canonical in data.get("synonyms", {}).items()
+        }
+
+        # keyword (single token or phrase of tokens) -> [(template index, weight)]
+        self._index: Dict[Tuple[str, ...], List[Tuple[int, float]]] = defaultdict(list)
+        self._max_phrase = 1
+        for entry in data["industries"]:
+            template = IndustryTemplate(
+                entry["name"], tuple(entry["pictorial_icons"]), entry["simple_icon"], entry["mini_icon"]
+            )
+            if entry.get("default"):
+                self.default = template
+            for keyword, weight in entry.get("keywords", {}).items():
+                phrase = self._tokens(keyword)
+                if phrase:
+                    self._index[phrase].append((len(self.templates), float(weight)))
+                    self._max_phrase = max(self._max_phrase, len(phrase))
+            self.templates.append(template)
+        if self.default is None:
+            self.default = self.templates[-1]
+        self._index = dict(self._index)
+
+        # Memoized per token sequence; lru_cache is safe to share between threads
+        self._ranked = lru_cache(maxsize=MATCH_CACHE_SIZE)(self._rank)
+
+    @classmethod
+    def load(cls, path: str) -> "TemplateRegistry":
+        """Load a registry from a JSON template file"""
+        with open(path, encoding="utf-8") as f:
+            registry = cls(json.load(f))
+        logger.info(
+            f"🗂️ Loaded {len(registry.templates)} industry templates and "
+            f"{len(registry.categories)} category recipes from {path}"
+        )
+        return registry
+
+    def validate(self, generator) -> None:
+        """Fail fast if a recipe builder or pictorial icon names a method the generator lacks"""
+        names = {recipe.builder for recipe in self.categories.values()}
+        names.update(icon for template in self.templates for icon in template.pictorial_icons)
+        missing = sorted(name for name in names if not callable(getattr(generator, name, None)))
+        if missing:
+            raise ValueError(f"Logo templates reference missing generator methods: {', '.join(missing)}")
+
+    def match(self, *texts) -> Tuple[TemplateMatch, ...]:
+        """Templates ranked by how well the industry text (and company type) matches, best first"""
+        query = " ".join(str(getattr(text, "value", text)) for text in texts if text)
+        return self._ranked(self._tokens(query))
+
+    def resolve(self, *texts) -> IndustryTemplate:
+        """Best template for an industry, or the default when nothing matches"""
+        matches = self.match(*texts)
+        return matches[0].template if matches else self.default
+
+    def category(self, name: str) -> CategoryRecipe:
+        """Recipe for a category, falling back to the first one (wordmark)"""
+        return self.categories.get(name) or next(iter(self.categories.values()))
+
+    def stats(self) -> Dict:
+        """Template counts and match cache usage"""
+        info = self._ranked.cache_info()
+        return {
+            "templates": len(self.templates),
+            "categories": len(self.categories),
+            "keywords": len(self._index),
+            "cached_matches": info.currsize,
+            "hits": info.hits,
+            "misses": info.misses,
+        }
+
+    def _tokens(self, text: str) -> Tuple[str, ...]:
+        """Lowercase alphanumeric tokens with synonyms mapped to their canonical word"""
+        return tuple(self._synonyms.get(token, token) for token in _TOKEN_PATTERN.findall(text.lower()))
+
+    def _rank(self, tokens: Tuple[str, ...]) -> Tuple[TemplateMatch, ...]:
+        # One index lookup per token and per phrase length, so cost grows with the text, not the templates
+        scores: Dict[int, float] = defaultdict(float)
+        for start in range(len(tokens)):
+            for length in range(1, min(self._max_phrase, len(tokens) - start) + 1):
+                for template_index, weight in self._index.get(tokens[start:start + length], ()):
+                    scores[template_index] += weight
+        # Ties go to the template declared first
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return tuple(TemplateMatch(self.templates[index], score) for index, score in ranked)
+
+
+# Global template registry instance
+template_registry = TemplateRegistry.load(settings.logo_templates_path or DEFAULT_TEMPLATES_PATH)
@@ -0,0 +1,46 @@
+"""Renders from a thread pool must be byte-identical to serial renders"""
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+
+from logo_cache import StripedLogoCache
+from professional_logo_generator import ProfessionalLogoGenerator, RenderOptions
+
+COMPANIES = (
+    ("Nimbus Labs", "Software", ["#2563EB", "#0F172A", "#38BDF8"]),
+    ("Harbor Health", "Healthcare clinic", ["#059669", "#064E3B", "#A7F3D0"]),
+    ("Ledgerly", "Fintech payments", ["#7C3AED", "#1E1B4B", "#F59E0B"]),
+)
+OPTIONS = (
+    RenderOptions(size=256, quality="draft"),
+    RenderOptions(size=256, quality="draft", variant="dark"),
+    RenderOptions(size=256, variant="inverted"),
+    RenderOptions(size=256, output_format="svg"),
+)
+
+
+def _render_set(generator, job):
+    (company, industry, colors), options = job
+    return [logo.data for logo in generator.render_logo_set(company, industry, colors, 3, "stress", options)]
+
+
+def test_thread_pool_renders_match_serial():
+    jobs = list(itertools.product(COMPANIES, OPTIONS))
+    reference = [_render_set(ProfessionalLogoGenerator(), job) for job in jobs]
+
+    # One generator shared by every thread, so they race on its render, layer and atlas caches
+    generator = ProfessionalLogoGenerator()
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        for _ in ("cold", "warm"):
+            assert list(executor.map(lambda job: _render_set(generator, job), jobs)) == reference
+    assert generator.cache.stats()["hits"] > 0
+
+
+def test_stripes_hold_the_largest_entry():
+    cache = StripedLogoCache(max_bytes=1000, stripes=8, max_entry_bytes=400)
+    cache.put("large", b"x" * 400)
+    assert cache.get("large") == b"x" * 400
+    assert cache.stats()["stripes"] == 2
+
+    cache.put("oversized", b"x" * 600)
+    assert cache.get("oversized") is None
+    assert cache.stats()["rejected"] == 1
@@ -0,0 +1,51 @@
+"""Shapes with holes must come out open on every drawing surface"""
+import re
+
+import pytest
+
+from drawing_surface import RasterSurface, RecordingSurface, SvgSurface
+from professional_logo_generator import professional_logo_generator as generator
+from template_registry import template_registry
+
+BACKGROUND = (10, 20, 30, 255)
+ACCENT = (200, 100, 0, 255)
+X, Y = 500, 500
+
+
+def _gear_over_background() -> RecordingSurface:
+    recording = RecordingSurface()
+    recording.rectangle([0, 0, 999, 999], fill=BACKGROUND)
+    generator._simple_industry_icon("tech")(recording, X, Y, {"accent": ACCENT})
+    return recording
+
+
+def _inside(points, x, y) -> bool:
+    """Even-odd point-in-polygon test"""
+    inside = False
+    for (x0, y0), (x1, y1) in zip(points, points[1:] + points[:1]):
+        if (y0 > y) != (y1 > y) and x < x0 + (y - y0) * (x1 - x0) / (y1 - y0):
+            inside = not inside
+    return inside
+
+
+@pytest.mark.parametrize("via_atlas", [False, True])
+def test_raster_gear_shows_background_through_its_hole(via_atlas):
+    surface = RasterSurface(1000)
+    if via_atlas:
+        surface.rectangle([0, 0, 999, 999], fill=BACKGROUND)
+        generator._draw_simple_industry_icon(surface, X, Y, template_registry.resolve("tech"), {"accent": ACCENT})
+    else:
+        _gear_over_background().replay(surface)
+    assert surface.image.getpixel((X, Y)) == BACKGROUND
+    assert surface.image.getpixel((X + 50, Y)) == ACCENT
+
+
+def test_svg_gear_leaves_its_hole_open():
+    svg = _gear_over_background().replay(SvgSurface(1000)).to_svg()
+    # No transparent paint standing in for the hole
+    assert 'fill-opacity="0"' not in svg
+    (points,) = re.findall(r'<polygon points="([^"]+)"', svg)
+    gear = [tuple(map(float, point.split(","))) for point in points.split()]
+    # The hole is open under the even-odd rule Pillow fills with
+    assert not _inside(gear, X, Y)
+    assert _inside(gear, X + 50, Y)
@@ -0,0 +1,32 @@
+"""The batcher is a pass-through by default and never holds more calls than the client runs at once"""
+import asyncio
+
+from config import settings
+from llm_batcher import LLMBatcher, llm_batcher
+
+
+class _Client:
+    def __init__(self):
+        self.prompts = []
+
+    async def generate(self, prompt, **kwargs):
+        self.prompts.append(prompt)
+        return prompt.upper()
+
+
+def test_disabled_by_default():
+    assert not llm_batcher.enabled
+    assert llm_batcher.max_batch <= settings.llm_max_in_flight
+
+
+def test_window_groups_concurrent_calls():
+    client = _Client()
+    batcher = LLMBatcher(client, window_ms=50, max_batch=2)
+
+    async def run():
+        results = await asyncio.gather(*(batcher.generate(prompt) for prompt in ("a", "b", "c")))
+        await batcher.close()
+        return results
+
+    assert asyncio.run(run()) == ["A", "B", "C"]
+    assert batcher.stats()["batch_sizes"] == {1: 1, 2: 1}
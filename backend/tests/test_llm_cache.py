@@ -0,0 +1,18 @@
+"""Results from different prompts must never share a cache entry"""
+from brand_prompts import FUSED_SOURCE, GUIDELINES_SOURCE
+from llm_cache import SERVICE_SOURCE, LLMResultCache
+
+PROFILE = {"name": "Acme", "industry": "Software", "brand_values": ["Trust", "Speed"]}
+
+
+def test_prompt_sources_have_separate_keys():
+    cache = LLMResultCache(None, 0)
+    keys = {cache.key("taglines", PROFILE, source) for source in (SERVICE_SOURCE, FUSED_SOURCE, GUIDELINES_SOURCE)}
+    assert len(keys) == 3
+    assert cache.key("taglines", PROFILE) == cache.key("taglines", PROFILE, SERVICE_SOURCE)
+
+
+def test_equivalent_profiles_share_a_key():
+    cache = LLMResultCache(None, 0)
+    reordered = {"name": " acme ", "industry": "software", "brand_values": ["Speed", "Trust"], "description": ""}
+    assert cache.key("taglines", PROFILE, FUSED_SOURCE) == cache.key("taglines", reordered, FUSED_SOURCE)
@@ -0,0 +1,58 @@
+"""Streams that report an error or stop early must raise instead of looking complete"""
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from llm_client import LLMProviderClient, ProviderError
+
+
+def _stream(provider: str, lines):
+    client = LLMProviderClient(provider, "model", 64, 0.5, 1.0, 1.0, 2, 2)
+    client._client(provider)
+    body = "".join(line + "\n" for line in lines)
+    client._clients[provider] = httpx.AsyncClient(
+        base_url="http://provider", transport=httpx.MockTransport(lambda request: httpx.Response(200, text=body))
+    )
+
+    async def collect():
+        try:
+            return [chunk async for chunk in client.stream("prompt")]
+        finally:
+            await client.close()
+    return asyncio.run(collect())
+
+
+def test_complete_streams_yield_every_token():
+    assert _stream("ollama", [
+        json.dumps({"response": "Hello", "done": False}), json.dumps({"response": " world", "done": True}),
+    ]) == ["Hello", " world"]
+    assert _stream("together", [
+        "data: " + json.dumps({"choices": [{"delta": {"content": "Hi"}}]}), "data: [DONE]",
+    ]) == ["Hi"]
+    assert _stream("cohere", [
+        json.dumps({"event_type": "text-generation", "text": "Hey"}),
+        json.dumps({"event_type": "stream-end", "finish_reason": "COMPLETE"}),
+    ]) == ["Hey"]
+
+
+@pytest.mark.parametrize("provider, lines", [
+    ("ollama", [json.dumps({"response": "Hel", "done": False}), json.dumps({"error": "model crashed"})]),
+    ("together", ["data: " + json.dumps({"error": {"message": "overloaded"}})]),
+    ("cohere", [json.dumps({"event_type": "stream-end", "finish_reason": "ERROR_LIMIT"})]),
+])
+def test_error_lines_raise(provider, lines):
+    with pytest.raises(ProviderError, match="error"):
+        _stream(provider, lines)
+
+
+@pytest.mark.parametrize("provider, lines", [
+    ("ollama", [json.dumps({"response": "Hel", "done": False})]),
+    ("together", ["data: " + json.dumps({"choices": [{"delta": {"content": "Hi"}}]})]),
+    ("cohere", [json.dumps({"event_type": "text-generation", "text": "Hey"})]),
+    ("ollama", []),
+])
+def test_truncated_streams_raise(provider, lines):
+    with pytest.raises(ProviderError, match="before completion"):
+        _stream(provider, lines)
@@ -0,0 +1,89 @@
+"""Logo bundles: native-size .ico frames, streamed zip layout and one layout per logo"""
+import io
+import json
+import zipfile
+
+import numpy as np
+from PIL import Image
+
+import professional_logo_generator as plg
+from logo_bundle import ICO_SIZES, BundleFile, build_ico, stream_zip
+from professional_logo_generator import professional_logo_generator as generator
+
+SIZES = {"favicon-16": 16, "favicon-32": 32, "favicon-48": 48, "avatar-64": 64}
+
+
+def _pixels(data: bytes, size: int = None) -> np.ndarray:
+    image = Image.open(io.BytesIO(data))
+    if size is not None:
+        image.size = (size, size)
+    return np.asarray(image.convert("RGBA"))
+
+
+def test_ico_frames_are_the_native_renders():
+    files = {
+        file.path: file
+        for file in generator.render_logo_bundle("Ledgerly", "tech", ["#2563EB"], "combination", 0, "seed", SIZES)
+    }
+    ico = files["favicon.ico"].data
+    assert Image.open(io.BytesIO(ico)).info["sizes"] == {(size, size) for size in ICO_SIZES}
+    for size in ICO_SIZES:
+        native = _pixels(files[f"favicon-{size}.png"].data)
+        assert native.shape == (size, size, 4)
+        # Each frame is the image rendered at that size, not the largest one downscaled
+        assert np.array_equal(_pixels(ico, size), native)
+
+
+def test_build_ico_keeps_each_image_untouched():
+    images = {size: Image.new("RGBA", (size, size), (size, 0, 0, 255)) for size in ICO_SIZES}
+    ico = build_ico(images)
+    for size in ICO_SIZES:
+        assert tuple(_pixels(ico, size)[0, 0]) == (size, 0, 0, 255)
+
+
+def test_stream_zip_round_trips_with_manifest_last():
+    files = [
+        BundleFile("logo_1/favicon-16.png", b"png-bytes", 16, 1.5, 0.25),
+        BundleFile("logo_1/logo.svg", b"<svg/>" * 50, 0, 2.0, 0.5),
+    ]
+    chunks = list(stream_zip(iter(files)))
+    # One chunk per file plus the manifest and central directory
+    assert len(chunks) == len(files) + 1
+
+    with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as archive:
+        assert archive.testzip() is None
+        infos = archive.infolist()
+        assert [info.filename for info in infos] == [file.path for file in files] + ["manifest.json"]
+        assert infos[0].compress_type == zipfile.ZIP_STORED
+        assert infos[1].compress_type == zipfile.ZIP_DEFLATED
+        for file in files:
+            assert archive.read(file.path) == file.data
+        manifest = json.loads(archive.read("manifest.json"))
+
+    assert [entry["path"] for entry in manifest["files"]] == [file.path for file in files]
+    assert manifest["files"][1]["bytes"] == len(files[1].data)
+    assert manifest["total_render_ms"] == 3.5
+    assert manifest["total_encode_ms"] == 0.75
+
+
+def test_bundles_lay_each_logo_out_once_and_render_every_size(monkeypatch):
+    layouts = []
+    draw_logo = generator._draw_logo
+
+    def counting_draw_logo(surface_type, *args):
+        layouts.append(surface_type)
+        return draw_logo(surface_type, *args)
+
+    monkeypatch.setattr(generator, "_draw_logo", counting_draw_logo)
+    files = list(generator.generate_logo_bundles("Quantum Horizon", "tech", ["#2563EB"], 2, "seed", SIZES))
+
+    assert layouts == [plg.RecordingSurface] * 2
+    categories = generator.plan_categories(2, "seed")
+    expected = []
+    for i, category in enumerate(categories):
+        prefix = f"logo_{i + 1}_{category}/"
+        expected += [f"{prefix}{name}.png" for name in SIZES] + [f"{prefix}logo.svg", f"{prefix}favicon.ico"]
+    assert [file.path for file in files] == expected
+    for file in files:
+        if file.path.endswith(".png"):
+            assert _pixels(file.data).shape == (file.size, file.size, 4)
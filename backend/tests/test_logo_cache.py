@@ -0,0 +1,57 @@
+"""LogoCache byte accounting, LRU eviction, TTL expiry and rejected puts"""
+import time
+
+from logo_cache import LogoCache, make_cache_key
+
+
+def test_evicts_least_recently_used_by_bytes():
+    cache = LogoCache(max_bytes=10)
+    cache.put("a", b"aaaa")
+    cache.put("b", b"bbbb")
+    assert cache.get("a") == b"aaaa"   # "b" is now least recently used
+    cache.put("c", b"cccc")
+    assert "b" not in cache
+    assert cache.get("a") == b"aaaa" and cache.get("c") == b"cccc"
+    assert cache.current_bytes == 8
+    assert cache.stats()["evictions"] == 1
+
+
+def test_replacing_a_key_keeps_byte_count_exact():
+    cache = LogoCache(max_bytes=100)
+    cache.put("a", b"x" * 30)
+    cache.put("a", b"x" * 10)
+    cache.put("b", object(), size=25)
+    assert len(cache) == 2
+    assert cache.current_bytes == 35
+    cache.clear()
+    assert cache.current_bytes == 0 and len(cache) == 0
+
+
+def test_oversized_puts_are_rejected_and_counted():
+    cache = LogoCache(max_bytes=5)
+    cache.put("small", b"12345")
+    cache.put("large", b"123456")
+    assert cache.get("large") is None
+    assert cache.get("small") == b"12345"
+    stats = cache.stats()
+    assert stats["rejected"] == 1
+    assert stats["evictions"] == 0
+
+
+def test_expired_entries_miss_and_count_as_evictions():
+    cache = LogoCache(max_bytes=100, ttl_seconds=0.05)
+    cache.put("a", b"data")
+    assert cache.get("a") == b"data"
+    time.sleep(0.1)
+    assert "a" not in cache
+    assert cache.get("a") is None
+    assert cache.current_bytes == 0
+    assert cache.stats() == {
+        "entries": 0, "bytes": 0, "max_bytes": 100, "hits": 1, "misses": 1, "evictions": 1, "rejected": 0,
+        "hit_rate": 0.5,
+    }
+
+
+def test_cache_key_changes_with_renderer_version():
+    assert make_cache_key("1", "logo", 3) == make_cache_key("1", "logo", 3)
+    assert make_cache_key("1", "logo", 3) != make_cache_key("2", "logo", 3)
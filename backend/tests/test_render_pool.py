@@ -0,0 +1,93 @@
+"""Render pool queue limit, per-job timeout and in-order fan-out, in thread mode with a stub job"""
+import asyncio
+import threading
+import time
+
+import pytest
+
+import render_pool
+from image_encoder import EncodedImage
+from professional_logo_generator import RenderOptions, professional_logo_generator
+from render_pool import RenderJob, RenderPool, RenderQueueFullError
+
+JOB = RenderJob("Stub Co", "Software", ["#2563EB"], "wordmark", 0, "stub", RenderOptions())
+
+
+def _stub_logo(job: RenderJob) -> EncodedImage:
+    return EncodedImage(f"{job.company_name}:{job.variation}".encode(), "image/png", "png", "fast", 0.0)
+
+
+@pytest.fixture
+def pool():
+    pool = RenderPool(max_workers=2, max_queue_depth=2, job_timeout=5, mode="thread")
+    pool.start()
+    yield pool
+    pool.shutdown()
+
+
+def _wait_idle(pool: RenderPool):
+    deadline = time.monotonic() + 5
+    while pool.in_flight and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert pool.in_flight == 0
+
+
+def test_queue_full_rejects_without_running_jobs(pool, monkeypatch):
+    release = threading.Event()
+    started = []
+
+    def slow_job(job):
+        started.append(job)
+        release.wait(5)
+        return _stub_logo(job)
+
+    monkeypatch.setattr(render_pool, "_render_job", slow_job)
+
+    async def run():
+        busy = [asyncio.ensure_future(pool.render(JOB)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        with pytest.raises(RenderQueueFullError):
+            await pool.render(JOB)
+        # A request needing more slots than are free is rejected whole
+        with pytest.raises(RenderQueueFullError):
+            await pool.render_logos("Queue Full Co", "Software", ["#2563EB"], 3)
+        release.set()
+        await asyncio.gather(*busy)
+
+    asyncio.run(run())
+    assert len(started) == 2
+    _wait_idle(pool)
+
+
+def test_timeout_raises_and_frees_the_slot(pool, monkeypatch):
+    monkeypatch.setattr(render_pool, "_render_job", lambda job: time.sleep(0.3) or _stub_logo(job))
+    pool.job_timeout = 0.05
+    with pytest.raises(TimeoutError):
+        asyncio.run(pool.render(JOB))
+    _wait_idle(pool)
+
+
+def test_fan_out_returns_logos_in_variation_order(pool, monkeypatch):
+    # Later variations finish first
+    monkeypatch.setattr(render_pool, "_render_job", lambda job: time.sleep(0.1 / (job.variation + 1)) or _stub_logo(job))
+    pool.max_queue_depth = 3
+    seen = []
+    logos = asyncio.run(pool.render_logos(
+        "Fan Out Co", "Software", ["#2563EB"], 3, on_rendered=lambda idx, logo: seen.append(idx)
+    ))
+    assert [logo.data for logo in logos] == [b"Fan Out Co:0", b"Fan Out Co:1", b"Fan Out Co:2"]
+    assert sorted(seen) == [0, 1, 2]
+    _wait_idle(pool)
+
+
+def test_disabled_pool_renders_off_the_event_loop(monkeypatch):
+    threads = []
+
+    def render_logo_set(*args):
+        threads.append(threading.current_thread())
+        return [_stub_logo(JOB)]
+
+    monkeypatch.setattr(professional_logo_generator, "render_logo_set", render_logo_set)
+    logos = asyncio.run(RenderPool(0, 2, 5).render_logos("Inline Co", "Software", ["#2563EB"], 1))
+    assert logos == [_stub_logo(JOB)]
+    assert threads and threads[0] is not threading.main_thread()
@@ -0,0 +1,26 @@
+"""Recoloring a cached role layer must match drawing the palette directly"""
+import pytest
+from PIL import ImageChops
+
+from drawing_surface import RasterSurface
+from professional_logo_generator import professional_logo_generator as generator
+from render_quality import QUALITY_TIERS, downsample
+from role_layer import VARIANTS, variant_palette
+
+
+@pytest.mark.parametrize("tier", QUALITY_TIERS.values(), ids=lambda tier: tier.name)
+@pytest.mark.parametrize("category", sorted(generator.logo_categories))
+def test_recolor_matches_direct_render(tier, category):
+    size = tier.output_size(256)
+    factor = tier.factor(size)
+    for variation in range(3):
+        layer = generator.role_layer("Acme", "tech", category, variation, "seed", size * factor)
+        assert layer is not None
+        for variant in VARIANTS:
+            colors = variant_palette(generator._create_professional_palette(["#2255AA", "#EE7711"], "tech"), variant)
+            direct = generator._draw_logo(
+                lambda: RasterSurface(size * factor), "Acme", "tech", colors, category, variation, "seed"
+            )
+            expected = downsample(direct.image, factor)
+            recolored = downsample(layer.recolor(colors), factor)
+            assert ImageChops.difference(expected, recolored).getbbox() is None, (variation, variant)
@@ -0,0 +1,32 @@
+"""Every template in logo_templates.json must draw with the generator's own methods"""
+import random
+
+import pytest
+
+from drawing_surface import RasterSurface, SvgSurface
+from professional_logo_generator import professional_logo_generator as generator
+from template_registry import TemplateRegistry, template_registry
+
+
+@pytest.mark.parametrize("template", template_registry.templates, ids=lambda template: template.name)
+@pytest.mark.parametrize("category", sorted(template_registry.categories))
+@pytest.mark.parametrize("surface", [RasterSurface, SvgSurface], ids=["raster", "svg"])
+def test_every_template_variation_draws(template, category, surface):
+    colors = generator._create_professional_palette(["#2255AA", "#EE7711"], template.name)
+    for variation in range(3):
+        draw = surface(256)
+        # Called below _draw_logo, which would hide a failure behind the fallback design
+        generator._generate_logo_by_category(
+            draw, "Acme", template.name, colors, category, variation, random.Random(variation)
+        )
+
+
+def test_validate_names_missing_methods():
+    registry = TemplateRegistry({
+        "categories": {"wordmark": {"description": "", "builder": "_create_wordmark_logo"}},
+        "industries": [{
+            "name": "broken", "pictorial_icons": ["_draw_missing_icon"], "simple_icon": "other", "mini_icon": "other",
+        }],
+    })
+    with pytest.raises(ValueError, match="_draw_missing_icon"):
+        registry.validate(generator)
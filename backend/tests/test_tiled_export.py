@@ -0,0 +1,80 @@
+"""Banded exports must be pixel-identical to rendering the whole canvas at once"""
+import asyncio
+import gc
+import io
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from drawing_surface import RasterSurface, RecordingSurface
+from professional_logo_generator import professional_logo_generator as generator
+from render_quality import downsample
+from role_layer import variant_palette
+from tiled_export import ExportLimiter, stream_png
+
+SIZE, FACTOR = 300, 2
+
+
+def _recording(company, category, variation):
+    colors = variant_palette(generator._create_professional_palette(["#2563EB"], "tech"), "light")
+    return generator._draw_logo(RecordingSurface, company, "tech", colors, category, variation, "seed")
+
+
+# "AJ" lettermark 1 and 2 frame text that starts above the viewport, at a negative position
+@pytest.mark.parametrize("company, category, variation", [
+    ("AJ", "lettermark", 1),
+    ("AJ", "lettermark", 2),
+    ("Quantum Horizon", "emblem", 0),
+    ("Quantum Horizon", "abstract", 1),
+    ("Ledgerly", "combination", 2),
+])
+@pytest.mark.parametrize("rows", [1, 7, 13, 64])
+def test_bands_match_full_render(company, category, variation, rows):
+    recording = _recording(company, category, variation)
+    viewport = recording.content_viewport()
+    full = downsample(recording.replay(RasterSurface(SIZE * FACTOR, viewport)).image, FACTOR)
+    png = b"".join(stream_png(
+        recording, SIZE, viewport, FACTOR, workers=3, band_bytes=SIZE * FACTOR * FACTOR * 4 * rows
+    ))
+    banded = Image.open(io.BytesIO(png)).convert("RGBA")
+    assert np.array_equal(np.asarray(full), np.asarray(banded))
+
+
+def _export_chunks(log):
+    try:
+        for chunk in (b"first", b"second"):
+            yield chunk
+    finally:
+        log.append("closed")
+
+
+def test_unread_export_stream_frees_its_slot():
+    limiter = ExportLimiter(1)
+    log = []
+    assert limiter.try_acquire()
+    stream = asyncio.run(limiter.stream(_export_chunks(log)))
+    assert not limiter.try_acquire()
+    # A client gone before the body starts: the response is dropped without being read
+    del stream
+    gc.collect()
+    assert log == ["closed"]
+    assert limiter.in_use == 0
+    assert limiter.try_acquire()
+
+
+def test_export_stream_frees_its_slot_when_read_or_failing():
+    limiter = ExportLimiter(1)
+    assert limiter.try_acquire()
+    assert list(asyncio.run(limiter.stream(_export_chunks([])))) == [b"first", b"second"]
+    assert limiter.in_use == 0
+
+    def failing():
+        raise ValueError("render failed")
+        yield b""
+
+    assert limiter.try_acquire()
+    with pytest.raises(ValueError):
+        asyncio.run(limiter.stream(failing()))
+    assert limiter.in_use == 0
+    assert limiter.stats() == {"max_concurrent": 1, "in_use": 0, "rejected": 0}
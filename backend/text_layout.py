@@ -0,0 +1,157 @@
+"""
+Text Layout Engine - Cached text measurement, fit-to-box sizing and wrapping
+Shared by every logo category so the same string is never measured twice
+"""
+import threading
+from typing import Dict, List, NamedTuple, Tuple
+
+from PIL import ImageFont
+
+from font_registry import FontRegistry, font_registry
+
+
+class TextBlock(NamedTuple):
+    """Laid-out text: one or more lines at a single font size"""
+    lines: List[str]
+    font: ImageFont.ImageFont
+    size: int
+    line_sizes: List[Tuple[int, int]]
+    line_gap: int
+    width: int
+    height: int
+
+
+class TextLayoutEngine:
+    """Measures, fits and wraps text with memoized glyph-run metrics"""
+
+    def __init__(self, fonts: FontRegistry, max_entries: int = 8192):
+        self.fonts = fonts
+        self.max_entries = max_entries
+        self._bboxes: Dict[Tuple[ImageFont.ImageFont, str], Tuple[int, int, int, int]] = {}
+        self._blocks: Dict[Tuple, TextBlock] = {}
+        self._lock = threading.Lock()
+        self.measurements = 0
+        self.lookups = 0
+
+    def bbox(self, text: str, font: ImageFont.ImageFont) -> Tuple[int, int, int, int]:
+        """Bounding box of text drawn at the origin (same as ImageDraw.textbbox)"""
+        key = (font, text)
+        self.lookups += 1
+        box = self._bboxes.get(key)
+        if box is None:
+            box = font.getbbox(text)
+            with self._lock:
+                if len(self._bboxes) >= self.max_entries:
+                    self._bboxes.clear()
+                self._bboxes[key] = box
+            self.measurements += 1
+        return box
+
+    def text_size(self, text: str, font: ImageFont.ImageFont) -> Tuple[int, int]:
+        """Width and height of text"""
+        box = self.bbox(text, font)
+        return box[2] - box[0], box[3] - box[1]
+
+    def fit_size(
+        self, text: str, max_width: float, max_height: float, max_size: int, min_size: int = 8
+    ) -> int:
+        """Largest font size in [min_size, max_size] at which text fits the box on one line"""
+        return self._search_size(
+            lambda size: self._fits(self.text_size(text, self.fonts.get(size)), max_width, max_height),
+            max_size, min_size,
+        )
+
+    def wrap(self, text: str, font: ImageFont.ImageFont, max_width: float) -> List[str]:
+        """Greedy word wrap; a single word wider than max_width stays on its own line"""
+        words = text.split()
+        if not words:
+            return [text]
+        lines = [words[0]]
+        for word in words[1:]:
+            candidate = f"{lines[-1]} {word}"
+            if self.text_size(candidate, font)[0] <= max_width:
+                lines[-1] = candidate
+            else:
+                lines.append(word)
+        return lines
+
+    def layout(
+        self,
+        text: str,
+        max_width: float,
+        max_height: float,
+        max_size: int,
+        min_size: int = 8,
+        max_lines: int = 1,
+        line_spacing: float = 0.25,
+    ) -> TextBlock:
+        """Wrap text into at most max_lines lines at the largest size that fits the box"""
+        key = (text, int(max_width), int(max_height), max_size, min_size, max_lines, line_spacing)
+        block = self._blocks.get(key)
+        if block is not None:
+            return block
+
+        def build(size: int) -> TextBlock:
+            font = self.fonts.get(size)
+            lines = self.wrap(text, font, max_width) if max_lines > 1 else [text]
+            if len(lines) > max_lines:
+                lines = lines[:max_lines - 1] + [" ".join(lines[max_lines - 1:])]
+            line_sizes = [self.text_size(line, font) for line in lines]
+            line_gap = int(size * line_spacing)
+            width = max(w for w, _ in line_sizes)
+            height = sum(h for _, h in line_sizes) + line_gap * (len(lines) - 1)
+            return TextBlock(lines, font, size, line_sizes, line_gap, width, height)
+
+        candidates = {}
+
+        def fits(size: int) -> bool:
+            candidates[size] = build(size)
+            return self._fits((candidates[size].width, candidates[size].height), max_width, max_height)
+
+        size = self._search_size(fits, max_size, min_size)
+        block = candidates.get(size) or build(size)
+        with self._lock:
+            if len(self._blocks) >= self.max_entries:
+                self._blocks.clear()
+            self._blocks[key] = block
+        return block
+
+    def draw_block(self, draw, block: TextBlock, center_x: float, center_y: float, fill):
+        """Draw a laid-out block with each line centered on (center_x, center_y)"""
+        y = center_y - block.height / 2
+        for line, (width, height) in zip(block.lines, block.line_sizes):
+            draw.text((center_x - width // 2, y), line, fill=fill, font=block.font)
+            y += height + block.line_gap
+
+    def stats(self) -> Dict:
+        """Measurement cache counters"""
+        return {
+            "lookups": self.lookups,
+            "measurements": self.measurements,
+            "cached_runs": len(self._bboxes),
+            "cached_blocks": len(self._blocks),
+        }
+
+    @staticmethod
+    def _fits(size: Tuple[int, int], max_width: float, max_height: float) -> bool:
+        return size[0] <= max_width and size[1] <= max_height
+
+    @staticmethod
+    def _search_size(fits, max_size: int, min_size: int) -> int:
+        """Binary search for the largest size that fits (min_size if nothing does)"""
+        if fits(max_size):
+            return max_size
+        low, high = min_size, max_size - 1
+        best = min_size
+        while low <= high:
+            mid = (low + high) // 2
+            if fits(mid):
+                best = mid
+                low = mid + 1
+            else:
+                high = mid - 1
+        return best
+
+
+# Global text layout engine instance
+text_layout = TextLayoutEngine(font_registry)
@@ -0,0 +1,231 @@
+"""
+Tiled Export - High-resolution PNG export in horizontal bands
+A recorded logo is replayed band by band across a thread pool; each band is
+drawn at the supersampled size, reduced, PNG-filtered and handed to a single
+deflate stream in order, so peak memory is a few bands rather than the full
+canvas and the PNG streams out while later bands are still rendering.
+"""
+import asyncio
+import logging
+import struct
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, NamedTuple, Optional
+
+import numpy as np
+
+from drawing_surface import RasterSurface, RecordingSurface, Viewport
+from render_quality import downsample
+
+logger = logging.getLogger(__name__)
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# PNG "Sub" filter: each byte minus the same channel of the pixel to its left
+PNG_FILTER_SUB = 1
+
+
+class BandStats(NamedTuple):
+    """Timing and memory of one rendered band"""
+    index: int
+    top: int              # first output row
+    rows: int             # output rows
+    canvas_bytes: int     # supersampled RGBA canvas drawn for the band
+    render_ms: float      # replay + reduce + filter, on a worker
+    encode_ms: float      # deflate, on the streaming thread
+    output_bytes: int     # compressed bytes written
+
+
+class ExportSummary(NamedTuple):
+    """Totals for one export"""
+    size: int
+    factor: int
+    bands: int
+    rows_per_band: int
+    peak_canvas_bytes: int   # most supersampled band canvases alive at once, in bytes
+    output_bytes: int
+    total_ms: float
+
+
+def band_rows(size: int, factor: int, band_bytes: int) -> int:
+    """Output rows per band so one supersampled RGBA band canvas fits band_bytes"""
+    return max(1, min(size, band_bytes // (size * factor * factor * 4)))
+
+
+def stream_png(
+    recording: RecordingSurface,
+    size: int,
+    viewport: Viewport = Viewport(),
+    factor: int = 1,
+    workers: int = 2,
+    band_bytes: int = 16 * 1024 * 1024,
+    compress_level: int = 6,
+    on_band: Optional[Callable[[BandStats], None]] = None,
+    on_done: Optional[Callable[[ExportSummary], None]] = None,
+) -> Iterator[bytes]:
+    """
+    PNG of a recording at size x size (supersampled by factor), as a stream of chunks.
+    At most workers + 1 bands are held at once.
+    """
+    start = time.perf_counter()
+    rows = band_rows(size, factor, band_bytes)
+    tops = list(range(0, size, rows))
+    ss_size = size * factor
+    # Text is rasterized once per export and shared by every band it crosses
+    text_masks = {}
+    in_flight = [0, 0]  # bytes of band canvases alive, peak
+    lock = threading.Lock()
+
+    def render(top: int):
+        render_start = time.perf_counter()
+        height = min(rows, size - top)
+        canvas_bytes = ss_size * height * factor * 4
+        with lock:
+            in_flight[0] += canvas_bytes
+            in_flight[1] = max(in_flight[1], in_flight[0])
+        try:
+            scale = size / viewport.side
+            clip = (
+                viewport.x, viewport.y + top / scale, viewport.x + viewport.side, viewport.y + (top + height) / scale
+            )
+            surface = RasterSurface(ss_size, viewport, (0, top * factor), (ss_size, height * factor), text_masks)
+            image = downsample(recording.replay(surface, clip).image, factor)
+        finally:
+            with lock:
+                in_flight[0] -= canvas_bytes
+        pixels = np.asarray(image, dtype=np.uint8).reshape(height, size * 4)
+        filtered = np.empty((height, size * 4 + 1), dtype=np.uint8)
+        filtered[:, 0] = PNG_FILTER_SUB
+        filtered[:, 1:5] = pixels[:, :4]
+        np.subtract(pixels[:, 4:], pixels[:, :-4], out=filtered[:, 5:])
+        return filtered.tobytes(), height, canvas_bytes, (time.perf_counter() - render_start) * 1000
+
+    yield PNG_SIGNATURE + _chunk(b"IHDR", struct.pack(">IIBBBBB", size, size, 8, 6, 0, 0, 0))
+
+    compressor = zlib.compressobj(compress_level)
+    output_bytes = 0
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="export") as executor:
+        pending = [executor.submit(render, top) for top in tops[:workers + 1]]
+        for index, top in enumerate(tops):
+            data, height, canvas_bytes, render_ms = pending.pop(0).result()
+            if index + workers + 1 < len(tops):
+                pending.append(executor.submit(render, tops[index + workers + 1]))
+
+            encode_start = time.perf_counter()
+            compressed = compressor.compress(data)
+            if index == len(tops) - 1:
+                compressed += compressor.flush()
+            del data
+            encode_ms = (time.perf_counter() - encode_start) * 1000
+
+            stats = BandStats(index, top, height, canvas_bytes, render_ms, encode_ms, len(compressed))
+            logger.debug(
+                f"Band {index + 1}/{len(tops)} rows {top}-{top + height}: {canvas_bytes / 2**20:.1f}MB canvas, "
+                f"render {render_ms:.1f}ms, deflate {encode_ms:.1f}ms"
+            )
+            if on_band:
+                on_band(stats)
+            if compressed:
+                output_bytes += len(compressed)
+                yield _chunk(b"IDAT", compressed)
+
+    yield _chunk(b"IEND", b"")
+    summary = ExportSummary(
+        size, factor, len(tops), rows, in_flight[1], output_bytes, (time.perf_counter() - start) * 1000
+    )
+    logger.info(
+        f"🖨️ Exported {size}px logo (x{factor}) in {len(tops)} bands of {rows} rows: "
+        f"peak {summary.peak_canvas_bytes / 2**20:.1f}MB of band canvases, "
+        f"{output_bytes / 2**20:.1f}MB PNG in {summary.total_ms:.0f}ms"
+    )
+    if on_done:
+        on_done(summary)
+
+
+class _SlotStream:
+    """Chunks of one export that hand its slot back once, however the stream ends"""
+
+    def __init__(self, first: Optional[bytes], chunks: Iterator[bytes], release: Callable[[], None]):
+        self._first = first
+        self._chunks = chunks
+        self._release = release
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> bytes:
+        if self._first is not None:
+            first, self._first = self._first, None
+            return first
+        try:
+            return next(self._chunks)
+        except BaseException:
+            self.close()
+            raise
+
+    def close(self):
+        """Stop the export and free its slot (safe to call more than once)"""
+        release, self._release = self._release, None
+        if release is None:
+            return
+        try:
+            close = getattr(self._chunks, "close", None)
+            if close:
+                close()
+        finally:
+            release()
+
+    # A response dropped before its body was sent is never iterated or closed; freeing the
+    # slot when the stream is collected keeps it from leaking
+    __del__ = close
+
+
+class ExportLimiter:
+    """Caps how many exports stream at once; each holds workers + 1 band canvases"""
+
+    def __init__(self, max_concurrent: int):
+        self.max_concurrent = max(1, max_concurrent)
+        self._slots = threading.BoundedSemaphore(self.max_concurrent)
+        self._lock = threading.Lock()
+        self.in_use = 0
+        self.rejected = 0
+
+    def try_acquire(self) -> bool:
+        """Take a slot if one is free"""
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            return False
+        with self._lock:
+            self.in_use += 1
+        return True
+
+    def release(self):
+        with self._lock:
+            self.in_use -= 1
+        self._slots.release()
+
+    async def stream(self, chunks: Iterator[bytes]) -> Iterator[bytes]:
+        """
+        Chunks of an export holding an acquired slot. The first chunk is produced here, so a
+        failing export raises before the response starts, and the returned stream frees the
+        slot when it is exhausted, fails, is closed or is dropped without being read
+        """
+        try:
+            first = await asyncio.to_thread(next, chunks, None)
+        except BaseException:
+            self.release()
+            raise
+        if first is None:
+            self.release()
+            return iter(())
+        return _SlotStream(first, chunks, self.release)
+
+    def stats(self) -> Dict:
+        return {"max_concurrent": self.max_concurrent, "in_use": self.in_use, "rejected": self.rejected}
+
+
+def _chunk(kind: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))